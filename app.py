@@ -23,12 +23,19 @@ from elevenlabs.types import VoiceSettings
 from function_tools import (
     execute_cypher_query,
     create_node,
+    create_nodes,
     create_edge,
     find_node,
     scan_ideas,
     scan_trends,
     dfs,
     GraphOpsCtx,
+    GraphOpsLock,
+    NEO4J_DRIVER_SETTINGS,
+    close_graph_sessions,
+    start_cypher_validation_pool,
+    warm_name_label_index,
+    warm_vector_mirror,
     plan_tasks,
     get_tasks,
     mark_task_as_running,
@@ -43,7 +50,7 @@ from function_tools import (
 )
 from chainlit_xai_util import generate_response
 from utils import Neo4jDateEncoder
-from config import OPENAI_API_KEY, GROQ_API_KEY, XAI_API_KEY, ELEVENLABS_API_KEY, ELEVENLABS_VOICE_ID, NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, USER_PARTY_NAME
+from config import OPENAI_API_KEY, GROQ_API_KEY, XAI_API_KEY, ELEVENLABS_API_KEY, ELEVENLABS_VOICE_ID, NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, USER_PARTY_NAME, VECTOR_MIRROR_ENABLED, VECTOR_MIRROR_QUANTIZATION
 
 with open("knowledge_graph/schema.md", "r") as f:
     schema = f.read()
@@ -137,6 +144,7 @@ TOOLS_STEP2_CAPTURE = [
     TOOLS_DEFINITIONS["visualize_oom"],
     TOOLS_DEFINITIONS["x_search"],
     TOOLS_DEFINITIONS["create_node"],
+    TOOLS_DEFINITIONS["create_nodes"],
     TOOLS_DEFINITIONS["create_edge"],
 ]
 
@@ -150,6 +158,7 @@ AVAILABLE_FUNCTIONS_STEP2_CAPTURE = {
     "visualize_oom": visualize_oom,
     "x_search": x_search,
     "create_node": create_node,
+    "create_nodes": create_nodes,
     "create_edge": create_edge,
 }
 
@@ -195,9 +204,7 @@ async def _neo4j_connect():
     neo4jdriver = AsyncGraphDatabase.driver(
         NEO4J_URI,
         auth=(NEO4J_USERNAME, NEO4J_PASSWORD),
-        liveness_check_timeout=0,
-        max_connection_lifetime=30,
-        max_connection_pool_size=5,
+        **NEO4J_DRIVER_SETTINGS,
     )
     await neo4jdriver.verify_connectivity()
     cl.user_session.set("neo4jdriver", neo4jdriver)
@@ -207,6 +214,7 @@ async def _neo4j_connect():
 async def _neo4j_disconnect():
     neo4jdriver = cl.user_session.get("neo4jdriver")
     if neo4jdriver is not None:
+        logger.info(f"Graph session pool: {await close_graph_sessions(neo4jdriver)}")
         await neo4jdriver.close()
         cl.user_session.set("neo4jdriver", None)
     logger.info("Neo4j driver disconnected.")
@@ -218,6 +226,13 @@ async def _neo4j_disconnect():
 async def start():
     cl.user_session.set("user_and_assistant_messages", [])
     await _neo4j_connect()
+    # no-op after the first chat; keeps Cypher validation off the event loop
+    start_cypher_validation_pool()
+    # also loaded once per process
+    await warm_name_label_index(cl.user_session.get("neo4jdriver"))
+    if VECTOR_MIRROR_ENABLED:
+        await warm_vector_mirror(cl.user_session.get("neo4jdriver"),
+                                 quantization=VECTOR_MIRROR_QUANTIZATION)
     groq_client = AsyncGroq(api_key=GROQ_API_KEY, )
     cl.user_session.set("groq_client", groq_client)
     xai_client = AsyncClient(
@@ -249,8 +264,8 @@ async def start():
     cl.user_session.set("function_map", AVAILABLE_FUNCTIONS_READONLY)
     await cl.context.emitter.set_commands(commands_readonly)
     functions_with_ctx = [
-        "create_node", "create_edge", "find_node", "scan_ideas", "scan_trends", "dfs",
-        "execute_cypher_query"
+        "create_node", "create_nodes", "create_edge", "find_node", "scan_ideas", "scan_trends",
+        "dfs", "execute_cypher_query"
     ]
     cl.user_session.set("functions_with_ctx", functions_with_ctx)
     cl.user_session.set("capture_mode", False)
@@ -318,7 +333,7 @@ async def on_message(message: cl.Message):
                                tooltip="Read out loud")
 
         # setup context: begin Neo4j transation and create lock
-        lock = asyncio.Lock()
+        lock = GraphOpsLock()
         ctx = GraphOpsCtx(neo4jdriver, lock)
         # predefined answers
         output_message = cl.Message(content="💭🤔💭",
@@ -757,8 +772,8 @@ async def on_chat_resume(thread: ThreadDict):
     cl.user_session.set("function_map", AVAILABLE_FUNCTIONS_READONLY)
     await cl.context.emitter.set_commands(commands_readonly)
     functions_with_ctx = [
-        "create_node", "create_edge", "find_node", "scan_ideas", "scan_trends", "dfs",
-        "execute_cypher_query"
+        "create_node", "create_nodes", "create_edge", "find_node", "scan_ideas", "scan_trends",
+        "dfs", "execute_cypher_query"
     ]
     cl.user_session.set("functions_with_ctx", functions_with_ctx)
     cl.user_session.set("task_list", None)
@@ -12,14 +12,30 @@ from xai_sdk.chat import user, system, assistant, tool_result
 from function_tools import (
     core_execute_cypher_query,
     core_create_node,
+    core_smart_upsert_many,
     core_create_edge,
     core_find_node,
     core_scan_ideas,
     core_dfs,
+    core_flush_writes,
     core_x_search,
     core_perplexity_search,
     fetch_recent_transcripts,
+    start_cypher_validation_pool,
+    warm_name_label_index,
+    shutdown_cypher_validation_pool,
+    DEDUP_VERDICT_CACHE,
+    DEDUP_TIER_METRICS,
+    FIND_NODE_METRICS,
+    CYPHER_RESULT_CACHE,
+    GRAPH_OPS_METRICS,
+    NODE_ALIASES,
+    EMBEDDING_CACHE,
     GraphOpsCtx,
+    GraphOpsLock,
+    GraphWriteBuffer,
+    NEO4J_DRIVER_SETTINGS,
+    close_graph_sessions,
     TOOLS_DEFINITIONS,
 )
 from config import OPENAI_API_KEY, GROQ_API_KEY, XAI_API_KEY, NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
@@ -44,6 +60,7 @@ LAST_RUN_FILE = "last_run_timestamp.txt"
 TOOLS = [
     TOOLS_DEFINITIONS["execute_cypher_query"],
     TOOLS_DEFINITIONS["create_node"],
+    TOOLS_DEFINITIONS["create_nodes"],
     TOOLS_DEFINITIONS["create_edge"],
     TOOLS_DEFINITIONS["find_node"],
     TOOLS_DEFINITIONS["scan_ideas"],
@@ -55,6 +72,7 @@ TOOLS = [
 AVAILABLE_FUNCTIONS = {
     "execute_cypher_query": core_execute_cypher_query,
     "create_node": core_create_node,
+    "create_nodes": core_smart_upsert_many,
     "create_edge": core_create_edge,
     "find_node": core_find_node,
     "scan_ideas": core_scan_ideas,
@@ -104,10 +122,10 @@ async def process(chat, ctx: GraphOpsCtx, groq_client, openai_embedding_client,
             try:
                 function_name = tool_call.function.name
                 function_args = json.loads(tool_call.function.arguments)
-                if function_name in ["create_node", "create_edge", "find_node", "scan_ideas", "dfs", "execute_cypher_query"]:
+                if function_name in ["create_node", "create_nodes", "create_edge", "find_node", "scan_ideas", "dfs", "execute_cypher_query"]:
                     function_args = {"ctx": ctx, **function_args}
                 # create nodes needs extra args, to have the groq and openai clients
-                if function_name == "create_node":
+                if function_name in ["create_node", "create_nodes"]:
                     function_args["groq_client"] = groq_client
                     function_args["openai_embedding_client"] = openai_embedding_client
                 # find nodes and scan_ideas need extra args, to have the openai client
@@ -139,11 +157,11 @@ async def main() -> None:
     neo4jdriver = AsyncGraphDatabase.driver(
         NEO4J_URI,
         auth=(NEO4J_USERNAME, NEO4J_PASSWORD),
-        liveness_check_timeout=0,
-        max_connection_lifetime=30,
-        max_connection_pool_size=5,
+        **NEO4J_DRIVER_SETTINGS,
     )
     await neo4jdriver.verify_connectivity()
+    start_cypher_validation_pool()
+    await warm_name_label_index(neo4jdriver)
     groq_client = AsyncGroq(
         api_key=GROQ_API_KEY,
     )
@@ -206,8 +224,9 @@ async def main() -> None:
             logger.error(f"Unknown source type: {source_type} or missing required parameters")
             continue
 
-        lock = asyncio.Lock()
-        ctx = GraphOpsCtx(neo4jdriver, lock)
+        lock = GraphOpsLock()
+        # batch mode: merges and edges are written behind, in UNWIND batches
+        ctx = GraphOpsCtx(neo4jdriver, lock, write_buffer=GraphWriteBuffer())
 
         try:
             logger.info("Now processing content from sources into the knowledge graph using Grok-4.1-Fast with built-in search.")
@@ -216,8 +235,25 @@ async def main() -> None:
             logger.info(f"✅ Processed {source.get('name')} successfully.")
         except Exception as e:
             logger.error(f"❌ Error while processing {source.get('name')}: {str(e)}")
+        finally:
+            try:
+                await core_flush_writes(ctx)
+            except Exception as e:
+                logger.error(f"❌ Error while writing the graph updates of {source.get('name')}: {str(e)}")
+            logger.info(f"Graph write buffer: {ctx.write_buffer.stats()}")
 
+    shutdown_cypher_validation_pool()
+    logger.info(f"Graph session pool: {await close_graph_sessions(neo4jdriver)}")
     await neo4jdriver.close()
+    logger.info(f"Dedup tiers: {dict(DEDUP_TIER_METRICS)}")
+    logger.info(f"find_node: {dict(FIND_NODE_METRICS)}")
+    logger.info(f"Graph ops timeouts and cancellations: {dict(GRAPH_OPS_METRICS)}")
+    logger.info(f"Node aliases: {NODE_ALIASES.stats()}")
+    logger.info(f"Dedup verdict cache: {DEDUP_VERDICT_CACHE.stats()}")
+    logger.info(f"Cypher result cache: {CYPHER_RESULT_CACHE.stats()}")
+    DEDUP_VERDICT_CACHE.close()
+    logger.info(f"Embedding cache: {EMBEDDING_CACHE.stats()}")
+    EMBEDDING_CACHE.close()
     logger.info("\n\nBatch processing completed.")
 
 if __name__ == "__main__":
@@ -0,0 +1,177 @@
+"""
+Conformance check and benchmark for the Cypher validator grammars.
+
+Checks every query in knowledge_graph/cypher_corpus.yaml against the reference
+Earley grammar (cypher.cfg) and the LALR(1) port (cypher_lalr.cfg), then times
+both parsers on the corpus and on synthetic multi-OPTIONAL MATCH queries.
+With --fuzz N, also checks N random token-level mutations of the corpus for
+queries the LALR grammar accepts but the Earley grammar rejects.
+
+Run from the project root:
+    python benchmarks/cypher_grammar.py [--fuzz 2000]
+"""
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+from lark import LarkError
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from function_tools.core_graph_ops import (
+    check_cypher_lalr_tree,
+    get_cypher_lalr_parser,
+    get_cypher_parser,
+    _parse_cypher_query,
+)
+
+
+def earley_accepts(query: str) -> bool:
+    try:
+        get_cypher_parser().parse(query.strip())
+        return True
+    except LarkError:
+        return False
+
+
+def lalr_accepts(query: str) -> bool:
+    try:
+        return check_cypher_lalr_tree(get_cypher_lalr_parser().parse(query.strip()))
+    except LarkError:
+        return False
+
+
+def check_conformance(corpus: dict) -> bool:
+    ok = True
+    fallbacks = []
+    for expected, queries in ((True, corpus["accepted"]), (False, corpus["rejected"])):
+        for query in queries:
+            earley = earley_accepts(query)
+            lalr = lalr_accepts(query)
+            verdict, _ = _parse_cypher_query(query)
+            if earley != expected:
+                ok = False
+                print(f"[MISMATCH] Earley verdict {earley}, corpus says {expected}:\n{query}\n")
+            if lalr and not earley:
+                ok = False
+                print(f"[MISMATCH] LALR accepts a query Earley rejects:\n{query}\n")
+            if verdict != expected:
+                ok = False
+                print(f"[MISMATCH] validator verdict {verdict}, corpus says {expected}:\n{query}\n")
+            if earley and not lalr:
+                fallbacks.append(query)
+
+    total = len(corpus["accepted"]) + len(corpus["rejected"])
+    print(f"Conformance: {total} queries, {'OK' if ok else 'FAILED'}")
+    print(f"Accepted queries that need the Earley fallback: {len(fallbacks)} of {len(corpus['accepted'])}")
+    for query in fallbacks:
+        print(f"  - {' '.join(query.split())}")
+    return ok
+
+
+_TOKEN_RE = re.compile(r"'[^']*'|\"[^\"]*\"|`[^`]*`|\w+|<>|<=|>=|=~|\.\.|\S")
+
+
+def fuzz(corpus: dict, iterations: int, seed: int = 0) -> bool:
+    rng = random.Random(seed)
+    queries = corpus["accepted"] + corpus["rejected"]
+    vocabulary = sorted({tok for q in queries for tok in _TOKEN_RE.findall(q)})
+    lalr_only = 0
+    fallbacks = 0
+    for _ in range(iterations):
+        tokens = _TOKEN_RE.findall(rng.choice(queries))
+        for _ in range(rng.randint(1, 2)):
+            op = rng.randrange(5)
+            k = rng.randrange(len(tokens))
+            if op == 0 and len(tokens) > 1:
+                del tokens[k]
+            elif op == 1:
+                tokens.insert(k, rng.choice(vocabulary))
+            elif op == 2:
+                tokens[k] = rng.choice(vocabulary)
+            elif op == 3 and k + 1 < len(tokens):
+                tokens[k], tokens[k + 1] = tokens[k + 1], tokens[k]
+            else:
+                tokens[k] = tokens[k].swapcase()
+        mutated = "".join(tok + (" " if rng.random() < 0.8 else "") for tok in tokens)
+        earley = earley_accepts(mutated)
+        lalr = lalr_accepts(mutated)
+        if lalr and not earley:
+            lalr_only += 1
+            print(f"[MISMATCH] LALR accepts a mutated query Earley rejects:\n{mutated}\n")
+        elif earley and not lalr:
+            fallbacks += 1
+    print(f"Fuzz: {iterations} mutations, {lalr_only} LALR-only accepts, {fallbacks} Earley fallbacks")
+    return lalr_only == 0
+
+
+def synthetic_query(optional_matches: int) -> str:
+    lines = ["MATCH (e:EmTech {name: 'artificial intelligence'})-[:ENABLES]->(c:Capability)"]
+    for i in range(optional_matches):
+        lines.append(f"OPTIONAL MATCH (c)-[:HAS_MILESTONE]->(m{i}:Milestone) WHERE m{i}.name CONTAINS 'x{i}'")
+    items = ", ".join(f"collect(DISTINCT m{i}.name) AS ms{i}" for i in range(optional_matches))
+    lines.append(f"RETURN c.name AS capability{', ' + items if items else ''} ORDER BY capability LIMIT 25")
+    return "\n".join(lines)
+
+
+def time_parse(accepts, query: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        accepts(query)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def benchmark(corpus: dict, repeat: int = 5) -> None:
+    # build both parsers up front so construction is not timed
+    get_cypher_parser()
+    get_cypher_lalr_parser()
+
+    print("\nSynthetic queries (median ms per parse)")
+    print(f"{'OPTIONAL MATCH':>14} {'chars':>7} {'earley':>10} {'lalr':>10} {'speedup':>8}")
+    for n in (0, 1, 2, 4, 8, 16):
+        query = synthetic_query(n)
+        earley = time_parse(earley_accepts, query, repeat)
+        lalr = time_parse(lalr_accepts, query, repeat)
+        print(f"{n:>14} {len(query):>7} {earley:>10.2f} {lalr:>10.2f} {earley / lalr:>7.1f}x")
+
+    print("\nCorpus accepted queries by length (median ms per parse)")
+    buckets = {}
+    for query in corpus["accepted"]:
+        size = len(query)
+        bucket = "<100" if size < 100 else "100-300" if size < 300 else "300-600" if size < 600 else ">=600"
+        buckets.setdefault(bucket, []).append(query)
+    print(f"{'chars':>8} {'queries':>8} {'earley':>10} {'validator':>10} {'speedup':>8}")
+    for bucket in ("<100", "100-300", "300-600", ">=600"):
+        queries = buckets.get(bucket)
+        if not queries:
+            continue
+        earley = statistics.median(time_parse(earley_accepts, q, repeat) for q in queries)
+        validator = statistics.median(time_parse(_parse_cypher_query, q, repeat) for q in queries)
+        print(f"{bucket:>8} {len(queries):>8} {earley:>10.2f} {validator:>10.2f} {earley / validator:>7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fuzz", type=int, default=0, help="Number of mutated queries to check")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for --fuzz")
+    args = parser.parse_args()
+
+    with open("knowledge_graph/cypher_corpus.yaml", "r") as f:
+        corpus = yaml.safe_load(f)
+    ok = check_conformance(corpus)
+    if args.fuzz:
+        ok = fuzz(corpus, args.fuzz, args.seed) and ok
+    benchmark(corpus)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""
+Bytes-transferred benchmark for project_out_embeddings.
+
+Whole-node returns such as "MATCH (n:Idea) RETURN n" make Neo4j serialize every
+3072-float embedding over Bolt, only for core_execute_cypher_query to drop it.
+This script shows how sample queries are rewritten into embedding-free map
+projections and estimates the PackStream payload of the records before and after.
+
+Without --live the records are synthetic (nodes with a name, a description and an
+embedding of --dims floats). With --live the queries run against the Neo4j
+instance configured in .env and the payload of the records actually received is
+measured, together with the query time.
+
+Run from the project root:
+    python benchmarks/embedding_projection.py [--rows 50] [--live]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from function_tools.core_graph_ops import EMBEDDING_FREE_PROJECTION, project_out_embeddings
+
+QUERIES = [
+    "MATCH (n:Idea) RETURN n LIMIT $rows",
+    "MATCH (i:Idea)-[:PLACES]->(b:Bet) RETURN b, collect(i) AS ideas LIMIT $rows",
+    "MATCH (c:Capability)-[:HAS_MILESTONE]->(m:Milestone) RETURN c.name AS capability, m LIMIT $rows",
+    "MATCH (t:Trend) RETURN t.name AS name, t.description AS description LIMIT $rows",
+]
+
+
+def _header_size(length: int) -> int:
+    if length < 16:
+        return 1
+    if length < 256:
+        return 2
+    if length < 65536:
+        return 3
+    return 5
+
+
+def packstream_size(value) -> int:
+    """Approximate PackStream v1 encoding size of a value as sent over Bolt."""
+    from neo4j.graph import Node, Relationship, Path as GraphPath
+
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, int):
+        if -16 <= value < 128:
+            return 1
+        if -128 <= value < 128:
+            return 2
+        if -32768 <= value < 32768:
+            return 3
+        if -2147483648 <= value < 2147483648:
+            return 5
+        return 9
+    if isinstance(value, float):
+        return 9
+    if isinstance(value, str):
+        encoded = len(value.encode("utf-8"))
+        return _header_size(encoded) + encoded
+    if isinstance(value, (list, tuple)):
+        return _header_size(len(value)) + sum(packstream_size(v) for v in value)
+    if isinstance(value, dict):
+        return _header_size(len(value)) + sum(
+            packstream_size(k) + packstream_size(v) for k, v in value.items())
+    if isinstance(value, Node):
+        # struct(id, labels, properties, element_id)
+        return 2 + packstream_size(0) + packstream_size(list(value.labels)) \
+            + packstream_size(dict(value)) + packstream_size(value.element_id)
+    if isinstance(value, Relationship):
+        return 2 + 3 * packstream_size(0) + packstream_size(value.type) \
+            + packstream_size(dict(value)) + 3 * packstream_size(value.element_id)
+    if isinstance(value, GraphPath):
+        return 2 + sum(packstream_size(n) for n in value.nodes) \
+            + sum(packstream_size(r) for r in value.relationships) + packstream_size(list(range(len(value))))
+    # temporal and spatial values are small structs
+    return 12
+
+
+def synthetic_node_size(dims: int, embedding: bool) -> int:
+    """Payload of one Idea node: the full Node struct, or its embedding-free map projection."""
+    props = {
+        "name": "Idea 0",
+        "description": "A reasonably detailed description of an idea about emerging technology. " * 3,
+        "date": "2025-07-30",
+        "embedding": [0.0123456789] * dims if embedding else None,
+    }
+    if not embedding:
+        return packstream_size(props)
+    # struct header, id, labels, properties, element id
+    return 2 + 1 + packstream_size(["Idea"]) + packstream_size(props) + packstream_size("4:0f2e6a4c:0")
+
+
+def offline(rows: int, dims: int) -> None:
+    print(f"Synthetic estimate, {rows} rows, {dims}-dim embeddings\n")
+    for query in QUERIES:
+        rewritten = project_out_embeddings(query)
+        print(f"  {query}\n  -> {rewritten}")
+        # nodes per row: one per rewritten whole-node item; collect(i) counted as one node
+        nodes_per_row = rewritten.count(EMBEDDING_FREE_PROJECTION)
+        before = rows * nodes_per_row * synthetic_node_size(dims, embedding=True)
+        after = rows * nodes_per_row * synthetic_node_size(dims, embedding=False)
+        if nodes_per_row:
+            print(f"     node payload: {before / 1024:,.1f} KiB -> {after / 1024:,.1f} KiB "
+                  f"({before / after:.0f}x smaller)\n")
+        else:
+            print("     no whole-node returns, unchanged\n")
+
+
+async def live(rows: int, repeat: int) -> None:
+    from neo4j import AsyncGraphDatabase
+    from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+
+    driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+    await driver.verify_connectivity()
+
+    async def measure(query: str):
+        async def work(tx):
+            result = await tx.run(query, {"rows": rows})
+            return await result.values()
+
+        timings = []
+        size = 0
+        for _ in range(repeat):
+            async with driver.session() as session:
+                start = time.perf_counter()
+                values = await session.execute_read(work)
+                timings.append(time.perf_counter() - start)
+            size = packstream_size(values)
+        return size, statistics.median(timings)
+
+    print(f"Live measurement against {NEO4J_URI}, LIMIT {rows}, median of {repeat}\n")
+    try:
+        for query in QUERIES:
+            rewritten = project_out_embeddings(query)
+            before_size, before_time = await measure(query)
+            after_size, after_time = await measure(rewritten)
+            print(f"  {query}\n  -> {rewritten}")
+            print(f"     {before_size / 1024:,.1f} KiB in {before_time * 1000:.1f} ms -> "
+                  f"{after_size / 1024:,.1f} KiB in {after_time * 1000:.1f} ms\n")
+    finally:
+        await driver.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50, help="rows per query (default: 50)")
+    parser.add_argument("--dims", type=int, default=3072, help="embedding size for the synthetic estimate")
+    parser.add_argument("--live", action="store_true", help="measure against the configured Neo4j instance")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query in --live mode")
+    args = parser.parse_args()
+
+    if args.live:
+        asyncio.run(live(args.rows, args.repeat))
+    else:
+        offline(args.rows, args.dims)
+
+
+if __name__ == "__main__":
+    main()
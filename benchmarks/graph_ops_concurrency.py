@@ -0,0 +1,191 @@
+"""
+Latency of concurrent graph tool calls under the old global lock and GraphOpsLock.
+
+Fires --calls concurrent calls (a mix of reads and --write-ratio writes) through
+the core_graph_ops code paths and reports per-call latency and wall time, first
+with every operation serialized on one lock (the previous asyncio.Lock model) and
+then with GraphOpsLock.
+
+Without --live, a simulated driver with a connection pool of --pool connections
+answers every transaction after --latency ms. With --live, read-only queries run
+through core_execute_cypher_query against the Neo4j instance configured in .env.
+
+Run from the project root:
+    python benchmarks/graph_ops_concurrency.py [--calls 20] [--latency 40] [--live]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from function_tools.core_graph_ops import (
+    CYPHER_VALIDATION_CACHE,
+    GraphOpsCtx,
+    GraphOpsLock,
+    core_execute_cypher_query,
+    core_merge_node,
+    normalize_query_text,
+)
+
+READ_QUERIES = [
+    "MATCH (e:EmTech) RETURN e.name AS name",
+    "MATCH (e:EmTech {name: 'artificial intelligence'})-[:ENABLES]->(c:Capability) RETURN c.name AS name LIMIT 25",
+    "MATCH (b:Bet) RETURN b.name AS name, b.result AS result LIMIT 25",
+    "MATCH (t:Trend)-[:PREDICTS]->(c:Capability) RETURN t.name AS trend, c.name AS capability LIMIT 25",
+]
+
+
+class SerialLock:
+    """The previous model: one asyncio.Lock around every read and write."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def read(self):
+        async with self._lock:
+            yield
+
+    write = read
+
+
+class _Summary:
+    plan = {"operatorType": "ProduceResults@neo4j", "args": {"EstimatedRows": 1.0}}
+
+
+class _Result:
+    def __init__(self, records):
+        self._records = iter(records)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._records)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def data(self):
+        return [r.data() for r in self._records]
+
+    async def consume(self):
+        return _Summary()
+
+
+class _Record(dict):
+    def data(self):
+        return dict(self)
+
+
+class _Tx:
+    async def run(self, query, params=None):
+        return _Result([_Record(node_name=(params or {}).get("name", "x"), name="x")])
+
+
+class SimulatedDriver:
+    """Answers every transaction after a fixed latency, with a bounded connection pool."""
+
+    def __init__(self, pool_size: int, latency: float):
+        self._pool = asyncio.Semaphore(pool_size)
+        self._latency = latency
+
+    def session(self, **config):
+        driver = self
+
+        class _Session:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def close(self):
+                pass
+
+            async def _execute(self, work, *args):
+                async with driver._pool:
+                    await asyncio.sleep(driver._latency * random.uniform(0.8, 1.2))
+                    return await work(_Tx(), *args)
+
+            execute_read = _execute
+            execute_write = _execute
+
+        return _Session()
+
+
+async def run_calls(ctx: GraphOpsCtx, calls: int, write_ratio: float) -> tuple:
+    async def one_call(i: int) -> float:
+        start = time.perf_counter()
+        if random.random() < write_ratio:
+            await core_merge_node(ctx, "Party", f"Benchmark Party {i}", "benchmark")
+        else:
+            await core_execute_cypher_query(ctx, random.choice(READ_QUERIES), use_cache=False)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*(one_call(i) for i in range(calls)))
+    return latencies, time.perf_counter() - start
+
+
+def report(label: str, latencies: list, wall: float) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"  {label:<14} p50 {statistics.median(latencies) * 1000:7.1f} ms   "
+          f"p95 {p95 * 1000:7.1f} ms   wall {wall * 1000:7.1f} ms")
+
+
+async def main_async(args) -> None:
+    random.seed(args.seed)
+    for query in READ_QUERIES:
+        # the benchmark measures locking, not the validator
+        CYPHER_VALIDATION_CACHE.put(normalize_query_text(query), (True, None))
+
+    if args.live:
+        from neo4j import AsyncGraphDatabase
+        from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+        driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD),
+                                           max_connection_pool_size=args.pool)
+        await driver.verify_connectivity()
+        write_ratio = 0.0  # never write benchmark nodes into a real graph
+        print(f"Live, {args.calls} concurrent read calls, pool {args.pool}\n")
+    else:
+        driver = SimulatedDriver(args.pool, args.latency / 1000)
+        write_ratio = args.write_ratio
+        print(f"Simulated, {args.calls} concurrent calls ({write_ratio:.0%} writes), "
+              f"pool {args.pool}, {args.latency:g} ms per transaction\n")
+
+    try:
+        for label, lock in (("global lock", SerialLock()),
+                            ("GraphOpsLock", GraphOpsLock(max_readers=args.pool))):
+            ctx = GraphOpsCtx(driver, lock)
+            latencies, wall = await run_calls(ctx, args.calls, write_ratio)
+            report(label, latencies, wall)
+            if isinstance(lock, GraphOpsLock):
+                print(f"\n  {lock.stats()}")
+    finally:
+        if args.live:
+            await driver.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20, help="concurrent tool calls (default: 20)")
+    parser.add_argument("--pool", type=int, default=5, help="connection pool size (default: 5)")
+    parser.add_argument("--latency", type=float, default=40.0, help="simulated ms per transaction")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="share of simulated calls that write")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", action="store_true", help="run read queries against the configured Neo4j")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+p50 latency of short reads under sustained load, with the old and the new driver settings.
+
+The drivers used to be created with max_connection_lifetime=30 and
+liveness_check_timeout=0: every connection was re-established (TCP, TLS, Bolt
+handshake and login) every 30 seconds and pinged before each use. They now use
+NEO4J_DRIVER_SETTINGS, and graph operations take their sessions from a
+GraphSessionPool instead of opening one per call.
+
+Without --live, --workers workers issue back-to-back short reads for --duration
+seconds of virtual time against a model of the driver's connection pool: a read
+costs one round trip of --rtt ms plus --server ms, a liveness check one round trip
+and a new connection --handshake round trips. With --live, the workers run a short
+read through core_execute_cypher_query against the Neo4j instance configured in .env,
+once per setting, and the session pool stats are printed as well.
+
+Run from the project root:
+    python benchmarks/graph_session_pool.py [--workers 4] [--duration 120] [--live]
+"""
+
+import argparse
+import asyncio
+import heapq
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from function_tools.core_graph_ops import (
+    CYPHER_VALIDATION_CACHE,
+    NEO4J_DRIVER_SETTINGS,
+    GraphOpsCtx,
+    GraphOpsLock,
+    close_graph_sessions,
+    core_execute_cypher_query,
+    normalize_query_text,
+)
+
+OLD_DRIVER_SETTINGS = {
+    "liveness_check_timeout": 0,
+    "max_connection_lifetime": 30,
+    "max_connection_pool_size": 5,
+}
+
+SHORT_READ = "MATCH (e:EmTech) RETURN e.name AS name LIMIT 5"
+
+
+def simulate(settings: dict, args) -> tuple:
+    """Virtual-time model of back-to-back reads; returns (latencies, connections opened)."""
+    rtt, server = args.rtt / 1000, args.server / 1000
+    lifetime = settings["max_connection_lifetime"]
+    liveness = settings["liveness_check_timeout"]
+    connections = []  # [created_at, free_at] of the pooled connections
+    opened = 0
+    latencies = []
+    # (time the worker issues its next read, worker)
+    events = [(random.uniform(0, rtt), worker) for worker in range(args.workers)]
+    heapq.heapify(events)
+    while events:
+        now, worker = heapq.heappop(events)
+        if now > args.duration:
+            continue
+        # the pool closes idle connections that outlived max_connection_lifetime
+        connections = [c for c in connections if c[1] > now or now - c[0] < lifetime]
+        idle = [c for c in connections if c[1] <= now]
+        cost = 0.0
+        if idle:
+            connection = max(idle, key=lambda c: c[1])
+            if now - connection[1] >= liveness:
+                cost += rtt
+        else:
+            opened += 1
+            connection = [now, now]
+            connections.append(connection)
+            cost += args.handshake * rtt
+        cost += rtt + server * random.uniform(0.8, 1.2)
+        latencies.append(cost)
+        connection[1] = now + cost
+        heapq.heappush(events, (now + cost + args.think / 1000, worker))
+    return latencies, opened
+
+
+async def live_run(settings: dict, args) -> tuple:
+    from neo4j import AsyncGraphDatabase
+    from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+
+    driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD), **settings)
+    await driver.verify_connectivity()
+    ctx = GraphOpsCtx(driver, GraphOpsLock(max_readers=settings["max_connection_pool_size"]))
+    latencies = []
+    deadline = time.perf_counter() + args.duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await core_execute_cypher_query(ctx, SHORT_READ, use_cache=False)
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(args.think / 1000)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(args.workers)))
+    finally:
+        pool_stats = await close_graph_sessions(driver)
+        await driver.close()
+    return latencies, pool_stats
+
+
+def report(label: str, latencies: list, extra: str) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    print(f"  {label:<10} {len(latencies):6d} reads   p50 {statistics.median(latencies) * 1000:6.1f} ms   "
+          f"p95 {p95 * 1000:6.1f} ms   {extra}")
+
+
+async def main_async(args) -> None:
+    random.seed(args.seed)
+    settings = (("old", OLD_DRIVER_SETTINGS), ("new", NEO4J_DRIVER_SETTINGS))
+    if not args.live:
+        print(f"Simulated, {args.workers} workers for {args.duration:g} s, rtt {args.rtt:g} ms, "
+              f"server {args.server:g} ms, handshake {args.handshake} round trips\n")
+        for label, driver_settings in settings:
+            latencies, opened = simulate(driver_settings, args)
+            report(label, latencies, f"{opened} connections opened")
+        return
+
+    # the benchmark measures connections, not the validator
+    CYPHER_VALIDATION_CACHE.put(normalize_query_text(SHORT_READ), (True, None))
+    print(f"Live, {args.workers} workers for {args.duration:g} s per setting\n")
+    for label, driver_settings in settings:
+        latencies, pool_stats = await live_run(driver_settings, args)
+        report(label, latencies, f"sessions {pool_stats}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4, help="concurrent readers (default: 4)")
+    parser.add_argument("--duration", type=float, default=120.0, help="seconds of load per setting")
+    parser.add_argument("--think", type=float, default=50.0, help="ms between a worker's reads")
+    parser.add_argument("--rtt", type=float, default=20.0, help="simulated round trip in ms")
+    parser.add_argument("--server", type=float, default=3.0, help="simulated server time per read in ms")
+    parser.add_argument("--handshake", type=int, default=4,
+                        help="simulated round trips to open a connection (TCP, TLS, Bolt, login)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", action="store_true", help="run against the configured Neo4j")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Latency and hit rate of find_node: vector search only (the previous implementation)
+against the hybrid full-text and vector search with reciprocal rank fusion.
+
+Queries are node names, as the agent sends them to check whether a node exists
+(e.g. "Grok-4-Fast"), and descriptive texts. A name query is a hit when the node
+comes first; a miss is what makes the agent retry with another phrasing.
+
+Without --live, a simulated driver answers the full-text query after --rtt ms and
+the vector query after --rtt plus --index ms, and a stand-in embedding client
+answers after --embed ms; the full-text index finds the names, so only latency is
+meaningful. With --live, --nodes random --label nodes of the Neo4j instance
+configured in .env are looked up by name and by the first sentence of their
+description, embedding with OpenAI (the embedding cache is disabled).
+
+Run from the project root:
+    python benchmarks/hybrid_find_node.py [--nodes 50] [--live]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from function_tools.core_graph_ops import (
+    EMBEDDING_CACHE,
+    FIND_NODE_METRICS,
+    GraphOpsCtx,
+    GraphOpsLock,
+    close_graph_sessions,
+    core_find_node,
+    embed_search_texts,
+    execute_graph_tx,
+    vector_index_name,
+)
+
+VECTOR_QUERY = """
+CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
+YIELD node, score
+RETURN node { .name, .description } AS node, score
+ORDER BY score DESC
+"""
+
+
+class DelayedEmbeddings:
+    """Stands in for AsyncOpenAI: embeddings.create answers after a delay."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.embeddings = self
+
+    async def create(self, input, model, **kwargs):
+        await asyncio.sleep(self.delay)
+
+        class Item:
+            embedding = [random.gauss(0, 1) for _ in range(kwargs.get("dimensions", 3072))]
+
+        class Response:
+            data = [Item() for _ in input]
+        return Response()
+
+
+class SimulatedDriver:
+    """The full-text index finds names exactly; the vector index returns other nodes."""
+
+    def __init__(self, rtt: float, index: float, top_k: int):
+        self.rtt = rtt
+        self.index = index
+        self.top_k = top_k
+
+    def session(self, **config):
+        driver = self
+
+        class _Result:
+            def __init__(self, rows):
+                self.rows = rows
+
+            async def data(self):
+                return self.rows
+
+        class _Tx:
+            async def run(self, query, params=None):
+                params = params or {}
+                if "NodeAlias" in query:
+                    return _Result([])
+                if "fulltext" in query:
+                    await asyncio.sleep(driver.rtt)
+                    name = params["query"].split('"')[1]
+                    rows = [{"node": {"name": name}, "score": 5.0}] if name.startswith("Node") else []
+                    return _Result(rows)
+                await asyncio.sleep(driver.rtt + driver.index)
+                return _Result([{"node": {"name": f"Other {i}"}, "score": 0.9 - i / 100}
+                                for i in range(driver.top_k)])
+
+        class _Session:
+            async def _execute(self, work, *args):
+                return await work(_Tx(), *args)
+
+            execute_read = _execute
+            execute_write = _execute
+
+            async def close(self):
+                pass
+
+        return _Session()
+
+
+async def vector_only(ctx: GraphOpsCtx, client, query_text: str, label: str, top_k: int) -> list:
+    """The previous find_node: embed the query, then one vector index query."""
+    embedding = (await embed_search_texts(client, [query_text]))[0]
+
+    async def read_work(tx):
+        result = await tx.run(VECTOR_QUERY, {"index_name": vector_index_name(label),
+                                             "top_k": top_k, "embedding": embedding})
+        return await result.data()
+
+    async with ctx.session() as session:
+        async with ctx.lock.read():
+            return await execute_graph_tx(session, "vector", read_work)
+
+
+async def sample_queries(driver, args) -> list:
+    """(query text, expected node name, kind) for --nodes random nodes."""
+    if driver is None:
+        names = [f"Node-{i}-X" for i in range(args.nodes)]
+        return ([(name, name, "name") for name in names]
+                + [(f"a text about {name}", None, "description") for name in names])
+    async with driver.session() as session:
+        result = await session.run(
+            f"MATCH (n:`{args.label}`) WHERE n.description IS NOT NULL "
+            "WITH n, rand() AS r ORDER BY r LIMIT $limit "
+            "RETURN n.name AS name, n.description AS description", {"limit": args.nodes})
+        rows = await result.data()
+    return ([(row["name"], row["name"], "name") for row in rows]
+            + [(row["description"].split(". ")[0], row["name"], "description") for row in rows])
+
+
+async def main_async(args) -> None:
+    random.seed(args.seed)
+    if args.live:
+        from neo4j import AsyncGraphDatabase
+        from openai import AsyncOpenAI
+        from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD, OPENAI_API_KEY
+        driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        await driver.verify_connectivity()
+        client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+        queries = await sample_queries(driver, args)
+        print(f"Live, {args.nodes} {args.label} nodes, top_k {args.top_k}\n")
+    else:
+        driver = SimulatedDriver(args.rtt / 1000, args.index / 1000, args.top_k)
+        client = DelayedEmbeddings(args.embed / 1000)
+        queries = await sample_queries(None, args)
+        print(f"Simulated, rtt {args.rtt:g} ms, vector index {args.index:g} ms, "
+              f"embedding {args.embed:g} ms, top_k {args.top_k}\n")
+    EMBEDDING_CACHE.path = None
+    ctx = GraphOpsCtx(driver, GraphOpsLock())
+
+    variants = {
+        "vector": lambda text: vector_only(ctx, client, text, args.label, args.top_k),
+        "hybrid": lambda text: core_find_node(ctx, text, args.label, args.top_k, client),
+    }
+    try:
+        for variant, find in variants.items():
+            for kind in ("name", "description"):
+                latencies, first, found = [], 0, 0
+                for text, expected, query_kind in queries:
+                    if query_kind != kind:
+                        continue
+                    EMBEDDING_CACHE.clear()
+                    start = time.perf_counter()
+                    records = await find(text)
+                    latencies.append(time.perf_counter() - start)
+                    names = [record["node"]["name"] for record in records]
+                    first += bool(names) and names[0] == expected
+                    found += expected in names
+                hits = f"first {first / len(latencies):5.0%}   in top_k {found / len(latencies):5.0%}"
+                print(f"  {variant:<7} {kind:<12} mean {statistics.mean(latencies) * 1000:7.1f} ms   "
+                      + (hits if args.live or kind == "name" else ""))
+        print(f"\n  find_node: {dict(FIND_NODE_METRICS)}")
+    finally:
+        if args.live:
+            await close_graph_sessions(driver)
+            await driver.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=50, help="nodes looked up (default: 50)")
+    parser.add_argument("--label", default="Idea", help="node label (default: Idea)")
+    parser.add_argument("--top-k", type=int, default=25, help="results per query (default: 25)")
+    parser.add_argument("--rtt", type=float, default=20.0, help="simulated round trip in ms")
+    parser.add_argument("--index", type=float, default=5.0, help="simulated vector index search in ms")
+    parser.add_argument("--embed", type=float, default=250.0, help="simulated embedding request in ms")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", action="store_true", help="run against the configured Neo4j and OpenAI")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+recall@k and search latency of Matryoshka-truncated embeddings against the full
+3072-dimension vectors, to choose EMBEDDING_DIMENSIONS (see truncate_embeddings.py).
+
+Queries are --queries vectors of the corpus itself, left out of their own results.
+For each size in MATRYOSHKA_DIMENSIONS the corpus and the queries are truncated and
+renormalized; recall@k is the share of the full-size top k found in the truncated
+top k, and the latency is that of an exact in-process search (a matrix product,
+the cost VECTOR_MIRROR pays per query).
+
+Without --live the corpus is the embedding cache (embedding_cache.sqlite, the texts
+this installation has embedded) when it holds at least --nodes vectors, otherwise
+synthetic clustered vectors whose variance decays along the dimensions the way
+Matryoshka-trained embeddings do; the synthetic recall is only indicative. With
+--live the corpus is the embeddings of --label nodes in the Neo4j instance
+configured in .env, and the vector indexes of each migrated size are timed as well.
+
+Run from the project root:
+    python benchmarks/matryoshka_recall.py [--nodes 5000] [--k 10 25] [--live]
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from function_tools.core_graph_ops import (
+    EMBEDDING_CACHE_PATH,
+    FULL_EMBEDDING_DIMENSIONS,
+    MATRYOSHKA_DIMENSIONS,
+    truncate_embedding,
+    vector_index_name,
+)
+
+INDEX_QUERY = """
+CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
+YIELD node, score
+RETURN node.name AS name
+"""
+
+
+def truncate(vectors: np.ndarray, dims: int) -> np.ndarray:
+    """truncate_embedding over the rows of a matrix."""
+    head = vectors[:, :dims]
+    norms = np.linalg.norm(head, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (head / norms).astype(np.float32)
+
+
+def cached_vectors(path: str, limit: int):
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute("SELECT vector FROM embeddings WHERE length(vector) = ? LIMIT ?",
+                            (FULL_EMBEDDING_DIMENSIONS * 4, limit)).fetchall()
+    finally:
+        conn.close()
+    if len(rows) < limit:
+        return None
+    return np.stack([np.frombuffer(row[0], dtype=np.float32) for row in rows])
+
+
+def synthetic_vectors(nodes: int, rng) -> np.ndarray:
+    """Clustered unit vectors; the scale of dimension j decays like (1 + j / 64) ** -0.5."""
+    scale = (1.0 + np.arange(FULL_EMBEDDING_DIMENSIONS) / 64.0) ** -0.5
+    centers = rng.standard_normal((max(nodes // 50, 1), FULL_EMBEDDING_DIMENSIONS))
+    vectors = centers[rng.integers(len(centers), size=nodes)]
+    vectors = vectors + 0.8 * rng.standard_normal((nodes, FULL_EMBEDDING_DIMENSIONS))
+    return truncate((vectors * scale).astype(np.float32), FULL_EMBEDDING_DIMENSIONS)
+
+
+async def live_vectors(args):
+    from neo4j import AsyncGraphDatabase
+    from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+
+    driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+    await driver.verify_connectivity()
+    async with driver.session() as session:
+        result = await session.run(
+            f"MATCH (n:`{args.label}`) WHERE n.embedding IS NOT NULL "
+            "RETURN n.embedding AS embedding LIMIT $limit", {"limit": args.nodes})
+        rows = await result.data()
+    return driver, np.array([row["embedding"] for row in rows], dtype=np.float32)
+
+
+def top_k(corpus: np.ndarray, query: np.ndarray, k: int, exclude: int) -> np.ndarray:
+    """Rows of the k nearest vectors, best first, without the query's own row."""
+    scores = corpus @ query
+    scores[exclude] = -np.inf
+    rows = np.argpartition(scores, -k)[-k:]
+    return rows[np.argsort(-scores[rows])]
+
+
+def search_timings(corpus: np.ndarray, queries: np.ndarray, k: int, repeat: int) -> list:
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            scores = corpus @ query
+            np.argpartition(scores, -k)[-k:]
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def index_run(driver, label: str, dims: int, queries: np.ndarray, k: int):
+    """Per-query latencies and results of the label's vector index of a size; None without the index."""
+    index_name = vector_index_name(label, dims)
+    latencies, results = [], []
+    async with driver.session() as session:
+        for query in queries:
+            start = time.perf_counter()
+            try:
+                result = await session.run(INDEX_QUERY, {
+                    "index_name": index_name, "top_k": k + 1,
+                    "embedding": truncate_embedding(query.tolist(), dims)})
+                rows = await result.data()
+            except Exception:
+                return None
+            latencies.append(time.perf_counter() - start)
+            results.append([row["name"] for row in rows])
+    return latencies, results
+
+
+async def main_async(args) -> None:
+    rng = np.random.default_rng(args.seed)
+    driver = None
+    if args.live:
+        driver, corpus = await live_vectors(args)
+        print(f"Live, {len(corpus)} {args.label} embeddings")
+    else:
+        corpus = cached_vectors(EMBEDDING_CACHE_PATH, args.nodes)
+        if corpus is not None:
+            print(f"Embedding cache, {len(corpus)} vectors")
+        else:
+            corpus = synthetic_vectors(args.nodes, rng)
+            print(f"Synthetic, {len(corpus)} clustered vectors (no embedding cache with "
+                  f"{args.nodes} vectors found)")
+    corpus = truncate(corpus, FULL_EMBEDDING_DIMENSIONS)
+    picked = rng.choice(len(corpus), min(args.queries, len(corpus)), replace=False)
+    kmax = max(args.k)
+    print(f"{len(picked)} queries, median of {args.repeat} timing passes\n")
+
+    truth = {i: top_k(corpus, corpus[i], kmax, i) for i in picked}
+    header = "".join(f"  recall@{k:<3}" for k in args.k)
+    print(f"  {'dims':>5}  {'bytes':>6}{header}  {'search ms':>9}  speedup")
+    full_ms = None
+    for dims in (FULL_EMBEDDING_DIMENSIONS,) + MATRYOSHKA_DIMENSIONS:
+        vectors = truncate(corpus, dims)
+        recalls = []
+        for k in args.k:
+            found = [len(set(top_k(vectors, vectors[i], k, i)) & set(truth[i][:k])) / k
+                     for i in picked]
+            recalls.append(statistics.mean(found))
+        ms = statistics.median(search_timings(vectors, vectors[picked], kmax, args.repeat)) * 1000
+        full_ms = full_ms or ms
+        print(f"  {dims:5d}  {dims * 4:6d}" + "".join(f"  {r:9.3f}" for r in recalls)
+              + f"  {ms:9.3f}  {full_ms / ms:6.1f}x")
+
+    if driver is None:
+        return
+    try:
+        print(f"\n  Neo4j vector indexes, top {kmax}")
+        full = await index_run(driver, args.label, FULL_EMBEDDING_DIMENSIONS, corpus[picked], kmax)
+        for dims in (FULL_EMBEDDING_DIMENSIONS,) + MATRYOSHKA_DIMENSIONS:
+            run = full if dims == FULL_EMBEDDING_DIMENSIONS else await index_run(
+                driver, args.label, dims, corpus[picked], kmax)
+            if run is None or full is None:
+                print(f"  {dims:5d}  no index {vector_index_name(args.label, dims)}")
+                continue
+            latencies, results = run
+            recall = statistics.mean(
+                len(set(got[:kmax]) & set(want[:kmax])) / kmax for got, want in zip(results, full[1]))
+            print(f"  {dims:5d}  recall@{kmax} {recall:.3f}  "
+                  f"p50 {statistics.median(latencies) * 1000:7.1f} ms")
+    finally:
+        await driver.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=5000, help="corpus size (default: 5000)")
+    parser.add_argument("--queries", type=int, default=200, help="queries drawn from the corpus")
+    parser.add_argument("--k", type=int, nargs="+", default=[10, 25], help="recall cut-offs")
+    parser.add_argument("--repeat", type=int, default=3, help="timing passes over the queries")
+    parser.add_argument("--label", default="Idea", help="node label read with --live")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", action="store_true", help="read the embeddings from the configured Neo4j")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
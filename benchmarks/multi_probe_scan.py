@@ -0,0 +1,181 @@
+"""
+Round trips and latency of scan_ideas with 5, 10 and 20 probes: one vector query per
+probe and index (the previous implementation) against one UNWIND query per index.
+
+The probe embeddings are random unit vectors from a stand-in embedding client, so
+no OpenAI calls are made. Without --live, a simulated driver answers each query
+after --rtt ms plus --per-probe ms of index search per probe it carries. With
+--live, both variants run against the Neo4j instance configured in .env.
+
+Run from the project root:
+    python benchmarks/multi_probe_scan.py [--probes 5 10 20] [--live]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from function_tools.core_graph_ops import (
+    EMBEDDING_CACHE,
+    GraphOpsCtx,
+    GraphOpsLock,
+    close_graph_sessions,
+    core_scan_ideas,
+    execute_graph_tx,
+)
+
+PER_PROBE_QUERY = """
+CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
+YIELD node, score
+RETURN node { .name, .description } AS node, score, labels(node)[0] AS node_type
+ORDER BY score DESC
+"""
+
+INDEX_NAMES = ["idea_description_embeddings", "bet_description_embeddings"]
+
+
+class RandomEmbeddings:
+    """Stands in for AsyncOpenAI: embeddings.create returns random unit vectors."""
+
+    def __init__(self, dims: int):
+        self.dims = dims
+        self.embeddings = self
+
+    async def create(self, input, model, **kwargs):
+        class Item:
+            def __init__(self, embedding):
+                self.embedding = embedding
+
+        class Response:
+            data = [Item(self._vector()) for _ in input]
+        return Response()
+
+    def _vector(self):
+        vector = [random.gauss(0, 1) for _ in range(self.dims)]
+        norm = sum(x * x for x in vector) ** 0.5
+        return [x / norm for x in vector]
+
+
+class SimulatedDriver:
+    """Answers each query after one round trip plus index search time per probe."""
+
+    def __init__(self, rtt: float, per_probe: float):
+        self.rtt = rtt
+        self.per_probe = per_probe
+        self.queries = 0
+
+    def session(self, **config):
+        driver = self
+
+        class _Result:
+            def __init__(self, rows):
+                self.rows = rows
+
+            async def data(self):
+                return self.rows
+
+        class _Tx:
+            async def run(self, query, params=None):
+                driver.queries += 1
+                probes = len(params.get("embeddings", [None]))
+                await asyncio.sleep(driver.rtt + driver.per_probe * probes)
+                return _Result([
+                    {"node": {"name": f"node {random.randrange(200)}"}, "score": random.random()}
+                    for _ in range(params["top_k"])])
+
+        class _Session:
+            async def _execute(self, work, *args):
+                return await work(_Tx(), *args)
+
+            execute_read = _execute
+            execute_write = _execute
+
+            async def close(self):
+                pass
+
+        return _Session()
+
+
+async def per_probe_scan(ctx: GraphOpsCtx, embeddings, top_k: int) -> int:
+    """The previous scan_ideas: one transaction per probe and index, serially."""
+    found = {}
+    async with ctx.session() as session:
+        async with ctx.lock.read():
+            for embedding in embeddings:
+                for index_name in INDEX_NAMES:
+                    async def read_work(tx, _index=index_name, _emb=embedding):
+                        result = await tx.run(PER_PROBE_QUERY, {
+                            "index_name": _index, "top_k": top_k, "embedding": _emb})
+                        return await result.data()
+
+                    for record in await execute_graph_tx(session, "vector", read_work):
+                        name = record["node"]["name"]
+                        found[name] = max(found.get(name, 0), record["score"])
+    return len(found)
+
+
+async def main_async(args) -> None:
+    random.seed(args.seed)
+    EMBEDDING_CACHE.path = None  # random probes, nothing worth keeping
+    if args.live:
+        from neo4j import AsyncGraphDatabase
+        from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+        driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        await driver.verify_connectivity()
+        print(f"Live, top_k {args.top_k}, median of {args.repeat}\n")
+    else:
+        driver = SimulatedDriver(args.rtt / 1000, args.per_probe / 1000)
+        print(f"Simulated, top_k {args.top_k}, rtt {args.rtt:g} ms, "
+              f"{args.per_probe:g} ms index search per probe, median of {args.repeat}\n")
+
+    client = RandomEmbeddings(args.dims)
+    ctx = GraphOpsCtx(driver, GraphOpsLock())
+    try:
+        for probes in args.probes:
+            timings = {"per probe": [], "UNWIND": []}
+            queries = {"per probe": probes * len(INDEX_NAMES), "UNWIND": len(INDEX_NAMES)}
+            for _ in range(args.repeat):
+                texts = [f"probe {random.random()}" for _ in range(probes)]
+                embeddings = [client._vector() for _ in texts]
+
+                start = time.perf_counter()
+                await per_probe_scan(ctx, embeddings, args.top_k)
+                timings["per probe"].append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                await core_scan_ideas(ctx, texts, top_k_per_probe=args.top_k,
+                                      openai_embedding_client=client)
+                timings["UNWIND"].append(time.perf_counter() - start)
+
+            print(f"  {probes:2d} probes")
+            for label, values in timings.items():
+                print(f"     {label:<10} {queries[label]:3d} queries   "
+                      f"{statistics.median(values) * 1000:8.1f} ms")
+    finally:
+        if args.live:
+            await close_graph_sessions(driver)
+            await driver.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--probes", type=int, nargs="+", default=[5, 10, 20], help="probe counts to run")
+    parser.add_argument("--top-k", type=int, default=20, help="results per probe and index (default: 20)")
+    parser.add_argument("--dims", type=int, default=3072, help="embedding size")
+    parser.add_argument("--rtt", type=float, default=20.0, help="simulated round trip in ms")
+    parser.add_argument("--per-probe", type=float, default=2.0, help="simulated index search ms per probe")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per probe count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", action="store_true", help="run against the configured Neo4j")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
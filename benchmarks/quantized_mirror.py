@@ -0,0 +1,120 @@
+"""
+Memory per 100k nodes, single-core query throughput and recall@k of the vector
+mirror with float32, int8 and binary indexes (see VECTOR_MIRROR_QUANTIZATION).
+
+Each index is filled with --nodes vectors of --dims dimensions and trained as the
+mirror does after a sync. A query is the coarse search of one index for
+QUANTIZED_RERANK_FACTOR * k candidates (k for float32), then the re-ranking of the
+candidates by their full-precision vectors, which the mirror leaves to Neo4j and
+this script does in process. recall@k is measured against an exact float search.
+BLAS and OpenMP are limited to one thread.
+
+Without --live the vectors are synthetic: clustered, so that nearest neighbours
+mean something. With --live they are the --label embeddings of the Neo4j instance
+configured in .env (at most --nodes of them).
+
+Run from the project root:
+    python benchmarks/quantized_mirror.py [--nodes 20000] [--dims 3072] [--live]
+"""
+
+import os
+
+# one CPU core, set before numpy loads its BLAS
+for variable in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ[variable] = "1"
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from function_tools.core_graph_ops import embedding_property
+from function_tools.vector_mirror import MIRROR_INDEX_CLASSES, QUANTIZED_RERANK_FACTOR
+
+
+def synthetic_vectors(nodes: int, dims: int, rng) -> np.ndarray:
+    centers = rng.standard_normal((max(nodes // 50, 1), dims), dtype=np.float32)
+    vectors = np.empty((nodes, dims), dtype=np.float32)
+    for chunk in range(0, nodes, 4096):
+        size = min(4096, nodes - chunk)
+        vectors[chunk:chunk + size] = (centers[rng.integers(len(centers), size=size)]
+                                       + 0.8 * rng.standard_normal((size, dims), dtype=np.float32))
+    return vectors
+
+
+async def live_vectors(args) -> np.ndarray:
+    from neo4j import AsyncGraphDatabase
+    from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+
+    prop = embedding_property()
+    driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+    try:
+        async with driver.session() as session:
+            result = await session.run(
+                f"MATCH (n:`{args.label}`) WHERE n.{prop} IS NOT NULL "
+                f"RETURN n.{prop} AS embedding LIMIT $limit", {"limit": args.nodes})
+            rows = await result.data()
+    finally:
+        await driver.close()
+    return np.array([row["embedding"] for row in rows], dtype=np.float32)
+
+
+def main_run(vectors: np.ndarray, args) -> None:
+    rng = np.random.default_rng(args.seed)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)
+    truth = {i: set(np.argsort(-(normalized @ normalized[i]))[:args.k]) for i in queries}
+    names = [f"node {i}" for i in range(len(vectors))]
+    print(f"  {'index':<8} {'bytes/node':>10} {'MiB/100k':>9} {'queries/s':>10} {'recall@' + str(args.k):>9}")
+
+    for quantization, cls in MIRROR_INDEX_CLASSES.items():
+        index = cls(vectors.shape[1])
+        for name, vector in zip(names, vectors):
+            index.upsert(name, vector)
+        index.train()
+        per_node = index.arrays()["vectors"].nbytes / len(vectors)
+        if quantization == "int8":
+            per_node += 4  # the scale of each vector
+        candidates = args.k * (QUANTIZED_RERANK_FACTOR if index.reranked else 1)
+
+        recalls, timings = [], []
+        for i in queries:
+            start = time.perf_counter()
+            rows = [int(name.split()[1]) for name, _ in index.search(vectors[i], candidates)]
+            if index.reranked:
+                rows = sorted(rows, key=lambda row: -float(normalized[row] @ normalized[i]))
+            timings.append(time.perf_counter() - start)
+            recalls.append(len(truth[i] & set(rows[:args.k])) / args.k)
+        print(f"  {quantization:<8} {per_node:10.0f} {per_node * 100_000 / 2 ** 20:9.1f} "
+              f"{1 / statistics.median(timings):10.0f} {statistics.mean(recalls):9.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=20000, help="vectors per index (default: 20000)")
+    parser.add_argument("--dims", type=int, default=3072, help="synthetic embedding size")
+    parser.add_argument("--queries", type=int, default=100, help="queries drawn from the vectors")
+    parser.add_argument("--k", type=int, default=10, help="results per query (default: 10)")
+    parser.add_argument("--label", default="Idea", help="node label read with --live")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--live", action="store_true", help="read the embeddings from the configured Neo4j")
+    args = parser.parse_args()
+
+    if args.live:
+        vectors = asyncio.run(live_vectors(args))
+        print(f"Live, {len(vectors)} {args.label} embeddings of {vectors.shape[1]} dimensions, one core\n")
+    else:
+        vectors = synthetic_vectors(args.nodes, args.dims, np.random.default_rng(args.seed))
+        print(f"Synthetic, {args.nodes} clustered vectors of {args.dims} dimensions, one core\n")
+    main_run(vectors, args)
+
+
+if __name__ == "__main__":
+    main()
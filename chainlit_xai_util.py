@@ -6,6 +6,24 @@ from xai_sdk.chat import tool_result, user, assistant, tool
 from typing import Any, Optional, List, Dict, Callable
 import asyncio
 
+# How many tool calls of one turn may run at the same time
+MAX_CONCURRENT_TOOL_CALLS = 4
+# Turns with a failing tool call after which the response is given up
+MAX_FAILED_TURNS = 3
+
+# Tools whose calls depend on each other (a create_edge needs the nodes created
+# before it, task updates need the plan); these run one at a time in the order
+# they were issued, and the calls issued after one of them wait for it
+SEQUENTIAL_TOOLS = {
+    "create_node",
+    "create_nodes",
+    "create_edge",
+    "plan_tasks",
+    "get_tasks",
+    "mark_task_as_running",
+    "mark_task_as_done",
+}
+
 
 async def generate_response(
     xai_client: Any,
@@ -13,11 +31,18 @@ async def generate_response(
     function_map: Dict[str, Callable],
     functions_with_ctx: List[str],
     ctx: Any,
-    messages: List[Any]
+    messages: List[Any],
+    max_concurrent_tool_calls: int = MAX_CONCURRENT_TOOL_CALLS
 ) -> Optional[str]:
     """
     Generates a response from the LLM, handling tool calls.
     Returns the final response content as a string, or None if there was an error.
+
+    The tool calls of a turn run concurrently up to the first call of a
+    SEQUENTIAL_TOOLS tool; later calls run once it is done. Results are appended in
+    the order the model issued the calls, and a failing call is reported as an error
+    result without dropping the others. The response is given up after
+    MAX_FAILED_TURNS turns with a failing call.
     
     Args:
         xai_client: The initialized XAI client.
@@ -26,6 +51,7 @@ async def generate_response(
         functions_with_ctx: List of function names that require context.
         ctx: Context for graph operations.
         messages: Full list of messages to send to the LLM (system + history).
+        max_concurrent_tool_calls: Limit on tool calls running at the same time.
     """
 
     error_count = 0
@@ -61,40 +87,57 @@ async def generate_response(
         chat.append(response)
 
         logger.info(f"Going to process tool calls: {len(response.tool_calls)}")
-        # Handle function calls
-        for tool_call in response.tool_calls:
-            try:
-                function_name = tool_call.function.name  # Access as attribute
-                function_args = json.loads(tool_call.function.arguments)
-                if function_name in functions_with_ctx:
-                    function_args = {"ctx": ctx, **function_args}
+        semaphore = asyncio.Semaphore(max_concurrent_tool_calls)
+
+        async def run_tool_call(tool_call, after: Optional[asyncio.Future]) -> str:
+            if after is not None:
+                # whatever its outcome, the sequential call issued before this one is over
+                await asyncio.wait([after])
+            function_name = tool_call.function.name  # Access as attribute
+            function_args = json.loads(tool_call.function.arguments)
+            if function_name in functions_with_ctx:
+                function_args = {"ctx": ctx, **function_args}
+            async with semaphore:
                 result = await function_map[function_name](**function_args)
 
-                # Convert result to JSON string for tool_result
-                result_str = json.dumps(result) if not isinstance(
-                    result, str) else result
-                chat.append(tool_result(result_str))
+            # Convert result to JSON string for tool_result
+            return json.dumps(result) if not isinstance(result, str) else result
 
-            except asyncio.CancelledError:
-                logger.error(
-                    "❌ Error while processing LLM response. CancelledError.")
-                await cl.Message(
-                    content=
-                    "❌ Error while processing LLM response. CancelledError",
-                    type="system_message").send()
-                return None
-            except Exception as e:
+        # Handle function calls; each call runs after the last sequential call issued before it
+        calls = []
+        last_sequential = None
+        for tool_call in response.tool_calls:
+            call = asyncio.ensure_future(run_tool_call(tool_call, last_sequential))
+            if tool_call.function.name in SEQUENTIAL_TOOLS:
+                last_sequential = call
+            calls.append(call)
+        try:
+            results = await asyncio.gather(*calls, return_exceptions=True)
+        except asyncio.CancelledError:
+            logger.error(
+                "❌ Error while processing LLM response. CancelledError.")
+            await cl.Message(
+                content=
+                "❌ Error while processing LLM response. CancelledError",
+                type="system_message").send()
+            return None
+
+        last_error = None
+        for tool_call, result in zip(response.tool_calls, results):
+            if isinstance(result, BaseException):
                 logger.error(
-                    f"❌ Error while processing LLM response. Error: {str(e)}")
-                error_count += 1
-                if error_count >= 3:
-                    await cl.Message(
-                        content=
-                        f"❌ Error while processing LLM response. Error: {str(e)}",
-                        type="system_message").send()
-                    return None
-                # else - if we didn't return
-                chat.append(tool_result(json.dumps({"error": str(e)})))
-                break
-    return None
+                    f"❌ Error while processing tool call {tool_call.function.name}. Error: {str(result)}")
+                last_error = result
+                chat.append(tool_result(json.dumps({"error": str(result)})))
+            else:
+                chat.append(tool_result(result))
 
+        if last_error is not None:
+            error_count += 1
+        if error_count >= MAX_FAILED_TURNS:
+            await cl.Message(
+                content=
+                f"❌ Error while processing LLM response. Error: {str(last_error)}",
+                type="system_message").send()
+            return None
+    return None
@@ -12,4 +12,9 @@ NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 ELEVENLABS_VOICE_ID = os.getenv("ELEVENLABS_VOICE_ID")
 DESCOPE_PROJECT_ID = os.getenv("DESCOPE_PROJECT_ID")
-USER_PARTY_NAME = os.getenv("USER_PARTY_NAME", "User")
\ No newline at end of file
+USER_PARTY_NAME = os.getenv("USER_PARTY_NAME", "User")
+# Search the vector indexes in process, see warm_vector_mirror; needs numpy, from the
+# vector-mirror extra (pip install ".[vector-mirror]"), and fails at startup without it
+VECTOR_MIRROR_ENABLED = os.getenv("VECTOR_MIRROR_ENABLED", "false").lower() == "true"
+# How the mirror stores the embeddings: float32, int8 or binary (quantized, re-ranked in Neo4j)
+VECTOR_MIRROR_QUANTIZATION = os.getenv("VECTOR_MIRROR_QUANTIZATION", "float32")
@@ -31,11 +31,27 @@ from xai_sdk.chat import system as xai_system, user as xai_user, tool_result as
 # Core function tools (no Chainlit dependency)
 from function_tools.core_graph_ops import (
     GraphOpsCtx,
+    GraphOpsLock,
+    NEO4J_DRIVER_SETTINGS,
+    close_graph_sessions,
     core_execute_cypher_query,
     core_find_node,
     core_scan_ideas,
     core_scan_trends,
     core_dfs,
+    start_cypher_validation_pool,
+    warm_name_label_index,
+    warm_vector_mirror,
+    VECTOR_MIRROR,
+    FIND_NODE_METRICS,
+    CYPHER_RESULT_CACHE,
+    GRAPH_OPS_METRICS,
+    shutdown_cypher_validation_pool,
+    bump_graph_generation,
+    embed_search_texts,
+    vector_index_name,
+    EMBEDDING_CACHE,
+    EMBEDDING_PROPERTIES,
 )
 from function_tools.core_x_search import core_x_search
 from function_tools.tool_def import TOOLS_DEFINITIONS
@@ -51,6 +67,8 @@ NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 XAI_API_KEY = os.getenv("XAI_API_KEY")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+VECTOR_MIRROR_ENABLED = os.getenv("VECTOR_MIRROR_ENABLED", "false").lower() == "true"
+VECTOR_MIRROR_QUANTIZATION = os.getenv("VECTOR_MIRROR_QUANTIZATION", "float32")
 USER_PARTY_NAME = os.getenv("USER_PARTY_NAME", "User")
 
 # ---------------------------------------------------------------------------
@@ -106,7 +124,7 @@ def neo4j_to_json(obj):
     if isinstance(obj, (Date, DateTime)):
         return obj.iso_format()
     if isinstance(obj, dict):
-        return {k: neo4j_to_json(v) for k, v in obj.items() if k != "embedding" and v is not None}
+        return {k: neo4j_to_json(v) for k, v in obj.items() if k not in EMBEDDING_PROPERTIES and v is not None}
     if isinstance(obj, list):
         return [neo4j_to_json(i) for i in obj]
     return obj
@@ -121,12 +139,23 @@ driver = None
 async def lifespan(app: FastAPI):
     global driver
     driver = AsyncGraphDatabase.driver(
-        NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD),
-        max_connection_lifetime=120, max_connection_pool_size=5,
+        NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD), **NEO4J_DRIVER_SETTINGS,
     )
     await driver.verify_connectivity()
     logger.info("✅ Neo4j connected")
+    start_cypher_validation_pool()
+    await warm_name_label_index(driver)
+    if VECTOR_MIRROR_ENABLED:
+        await warm_vector_mirror(driver, quantization=VECTOR_MIRROR_QUANTIZATION)
     yield
+    shutdown_cypher_validation_pool()
+    logger.info(f"Embedding cache: {EMBEDDING_CACHE.stats()}")
+    logger.info(f"Cypher result cache: {CYPHER_RESULT_CACHE.stats()}")
+    logger.info(f"Vector mirror: {VECTOR_MIRROR.stats()}")
+    logger.info(f"find_node: {dict(FIND_NODE_METRICS)}")
+    logger.info(f"Graph ops timeouts and cancellations: {dict(GRAPH_OPS_METRICS)}")
+    EMBEDDING_CACHE.close()
+    logger.info(f"Graph session pool: {await close_graph_sessions(driver)}")
     await driver.close()
     logger.info("Neo4j closed")
 
@@ -532,7 +561,7 @@ async def save_trend(req: SaveTrendRequest):
         groq_client = AsyncGroq(api_key=GROQ_API_KEY)
         openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
-        ctx = GraphOpsCtx(neo4jdriver=driver, lock=asyncio.Lock())
+        ctx = GraphOpsCtx(neo4jdriver=driver, lock=GraphOpsLock())
 
         # Create the Trend node via smart_upsert
         result = await core_create_node(
@@ -546,7 +575,7 @@ async def save_trend(req: SaveTrendRequest):
         for cap_name in req.capabilities:
             try:
                 edge_result = await core_create_edge(
-                    ctx, "Trend", req.trend_name, "PREDICTS", "Capability", cap_name
+                    ctx, req.trend_name, cap_name, "PREDICTS"
                 )
                 edge_results.append(edge_result)
             except Exception as e:
@@ -664,7 +693,7 @@ async def analyze_news(req: AnalyzeRequest):
     try:
         xai_client = XAIAsyncClient(api_key=XAI_API_KEY, timeout=180)
         openai_embedding_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        ctx = GraphOpsCtx(neo4jdriver=driver, lock=asyncio.Lock())
+        ctx = GraphOpsCtx(neo4jdriver=driver, lock=GraphOpsLock())
 
         tools = [
             TOOLS_DEFINITIONS["execute_cypher_query"],
@@ -854,7 +883,7 @@ async def check_idea(req: CheckIdeaRequest):
     try:
         xai_client = XAIAsyncClient(api_key=XAI_API_KEY, timeout=180)
         openai_embedding_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        ctx = GraphOpsCtx(neo4jdriver=driver, lock=asyncio.Lock())
+        ctx = GraphOpsCtx(neo4jdriver=driver, lock=GraphOpsLock())
 
         # Ensure idea exists early for clearer API behavior.
         exists = await core_execute_cypher_query(
@@ -970,7 +999,7 @@ async def evaluate_bet(req: EvaluateBetRequest):
         # 2) Agentic evaluation with tool calling.
         xai_client = XAIAsyncClient(api_key=XAI_API_KEY, timeout=180)
         openai_embedding_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        ctx = GraphOpsCtx(neo4jdriver=driver, lock=asyncio.Lock())
+        ctx = GraphOpsCtx(neo4jdriver=driver, lock=GraphOpsLock())
 
         tools = [
             TOOLS_DEFINITIONS["execute_cypher_query"],
@@ -1101,6 +1130,7 @@ async def evaluate_bet(req: EvaluateBetRequest):
                 "result": evaluation_result,
             })
             updated_bet = await update_result.single()
+        bump_graph_generation()
 
         updated_payload = neo4j_to_json(dict(updated_bet)) if updated_bet else {
             "name": req.bet_name,
@@ -1141,7 +1171,7 @@ async def map_search(req: MapRequest):
         from function_tools.core_graph_ops import GraphOpsCtx, core_scan_ideas, core_scan_trends
 
         openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-        ctx = GraphOpsCtx(neo4jdriver=driver, lock=asyncio.Lock())
+        ctx = GraphOpsCtx(neo4jdriver=driver, lock=GraphOpsLock())
 
         # Use the query itself as the probe for semantic search
         probes = [req.query]
@@ -1201,14 +1231,11 @@ async def _search_convergences(openai_client, query: str, emtech: str) -> list:
     """Semantic vector search for Convergence nodes filtered to the given EmTech."""
     try:
         # 1. Generate embedding for the query
-        emb_response = await openai_client.embeddings.create(
-            model="text-embedding-3-large", input=[query]
-        )
-        embedding = emb_response.data[0].embedding
+        embedding = (await embed_search_texts(openai_client, [query]))[0]
 
         # 2. Query the convergence vector index
         vector_query = """
-        CALL db.index.vector.queryNodes('convergence_description_embeddings', $top_k, $embedding)
+        CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
         YIELD node, score
         WITH node AS conv, score
         // Filter: must be connected to the selected EmTech
@@ -1227,6 +1254,7 @@ async def _search_convergences(openai_client, query: str, emtech: str) -> list:
         """
         async with driver.session() as session:
             result = await session.run(vector_query, {
+                "index_name": vector_index_name("Convergence"),
                 "top_k": 20,
                 "embedding": embedding,
                 "emtech": emtech,
@@ -2,19 +2,43 @@ from .web_search_brave import web_search_brave_tool
 from .web_search_brave import web_search_brave
 from .chainlit_graph_ops import execute_cypher_query
 from .chainlit_graph_ops import create_node
+from .chainlit_graph_ops import create_nodes
 from .chainlit_graph_ops import create_edge
 from .chainlit_graph_ops import find_node
 from .chainlit_graph_ops import scan_ideas
 from .chainlit_graph_ops import scan_trends
 from .chainlit_graph_ops import dfs
 from .core_graph_ops import GraphOpsCtx
+from .core_graph_ops import GraphOpsLock
+from .core_graph_ops import GraphWriteBuffer
+from .core_graph_ops import GraphSessionPool
+from .core_graph_ops import NEO4J_DRIVER_SETTINGS
+from .core_graph_ops import close_graph_sessions
 from .core_graph_ops import core_execute_cypher_query
 from .core_graph_ops import core_create_node
+from .core_graph_ops import core_smart_upsert_many
 from .core_graph_ops import core_create_edge
 from .core_graph_ops import core_find_node
 from .core_graph_ops import core_scan_ideas
 from .core_graph_ops import core_scan_trends
 from .core_graph_ops import core_dfs
+from .core_graph_ops import core_flush_writes
+from .core_graph_ops import start_cypher_validation_pool
+from .core_graph_ops import warm_name_label_index
+from .core_graph_ops import NAME_LABEL_INDEX
+from .core_graph_ops import NODE_ALIASES
+from .core_graph_ops import warm_vector_mirror
+from .core_graph_ops import VECTOR_MIRROR
+from .core_graph_ops import shutdown_cypher_validation_pool
+from .core_graph_ops import bump_graph_generation
+from .core_graph_ops import DEDUP_VERDICT_CACHE
+from .core_graph_ops import DEDUP_TIER_METRICS
+from .core_graph_ops import FIND_NODE_METRICS
+from .core_graph_ops import CYPHER_RESULT_CACHE
+from .core_graph_ops import GRAPH_OPS_METRICS
+from .core_graph_ops import EMBEDDING_CACHE
+from .core_graph_ops import embed_texts
+from .core_graph_ops import embed_search_texts
 from .task_ops import plan_tasks
 from .task_ops import get_tasks
 from .task_ops import mark_task_as_running
@@ -2,6 +2,7 @@ import chainlit as cl
 from .core_graph_ops import GraphOpsCtx
 from .core_graph_ops import core_execute_cypher_query
 from .core_graph_ops import core_create_node
+from .core_graph_ops import core_smart_upsert_many
 from .core_graph_ops import core_create_edge
 from .core_graph_ops import core_find_node
 from .core_graph_ops import core_scan_ideas
@@ -68,6 +69,47 @@ async def create_node(ctx: GraphOpsCtx, node_type: str, name: str, description:
             await step.remove()
         return output
 
+async def create_nodes(ctx: GraphOpsCtx, items: List[dict]) -> Dict[str, str]:
+    async with cl.Step(name="Create_Nodes", type="tool") as step:
+        step.show_input = True
+        step.input = {"items": items}
+
+        groq_client = cl.user_session.get("groq_client")
+        openai_embedding_client = cl.user_session.get("openai_embedding_client")
+
+        step_message = cl.Message(content=f"Creating {len(items)} nodes: {', '.join(item['name'] for item in items)}")
+        await step_message.send()
+
+        output = await core_smart_upsert_many(ctx, items, groq_client, openai_embedding_client)
+
+        # Track the newly created nodes for frontend dashboard filtering
+        new_nodes = cl.user_session.get("new_nodes")
+        if new_nodes is not None:
+            key_map = {
+                "Trend": "trends",
+                "Idea": "ideas",
+                "Convergence": "convergences",
+                "Bet": "bets",
+                "Capability": "capabilities",
+                "Milestone": "milestones"
+            }
+            for item in items:
+                category = key_map.get(item["node_type"])
+                node_name = output.get(item["name"])
+                if category and node_name:
+                    new_nodes[category].append({
+                        "id": node_name,
+                        "name": node_name,
+                        "description": item["description"],
+                        "type": item["node_type"]
+                    })
+
+        step.output = output
+        debug = cl.user_session.get("debug_settings")
+        if not debug:
+            await step.remove()
+        return output
+
 async def create_edge(
     ctx: GraphOpsCtx,
     source_name: str,
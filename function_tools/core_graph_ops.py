@@ -1,25 +1,157 @@
-from neo4j import AsyncDriver, AsyncTransaction
-from neo4j.exceptions import ClientError, CypherSyntaxError
+from neo4j import AsyncDriver, AsyncSession, AsyncTransaction, unit_of_work
+from neo4j.exceptions import ClientError, CypherSyntaxError, Neo4jError
 import json
 from typing import List, Dict, Optional, Union, Tuple, Any
 from pydantic import BaseModel
 
 from neo4j.time import Date, DateTime
 from dataclasses import dataclass
+from contextlib import asynccontextmanager
 from typing import Literal
-from asyncio import Lock
+import asyncio
+import copy
+import functools
+import hashlib
 import logging
+import sqlite3
+import time
+import weakref
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from neo4j.exceptions import ServiceUnavailable
-from lark import Lark, ParseError, UnexpectedCharacters, UnexpectedToken
+from lark import Lark, LarkError, ParseError, UnexpectedCharacters, UnexpectedToken
+from lark import Token, Tree
+from collections import Counter, OrderedDict
+import re
+import signal
+import threading
+from array import array
+from .vector_mirror import ANN_AVAILABLE, MIRROR_INDEX_CLASSES, VectorMirror, similar_pairs
 
 # Load the Cypher grammar
 with open("knowledge_graph/cypher.cfg", "r") as f:
     CYPHER_GRAMMAR = f.read()
 
+# LALR(1) port of the same grammar, used as the fast path in validate_cypher_query
+with open("knowledge_graph/cypher_lalr.cfg", "r") as f:
+    CYPHER_LALR_GRAMMAR = f.read()
+
+# The compiled parsers are built lazily, once per process (see get_cypher_parser)
+_CYPHER_PARSER: Optional[Lark] = None
+_CYPHER_LALR_PARSER: Optional[Lark] = None
+
+# Mirrors SAFE_FUNCTION in cypher.cfg; cypher_lalr.cfg lexes function names as NAME
+_SAFE_FUNCTION_NAMES = frozenset({
+    "abs", "coalesce", "tostring", "tointeger", "tofloat", "length", "size",
+    "id", "labels", "type", "startnode", "endnode", "head", "last", "tail",
+    "range", "substring", "replace", "tolower", "toupper", "left", "right",
+    "split", "reverse", "date", "datetime", "localdatetime", "time",
+    "localtime", "duration", "trim", "count", "keys", "properties",
+    "elementid", "nodes", "relationships", "collect",
+})
+
+# Mirrors LOWER_IDENTIFIER in cypher.cfg
+_BINDING_VARIABLE_RE = re.compile(r"[a-z_][a-z0-9_]*")
+
+
+def get_cypher_parser() -> Lark:
+    """
+    Returns the process-wide Lark parser for the Cypher grammar, building it on first use.
+    Compiling the grammar is far more expensive than parsing a typical query, so the
+    parser is never rebuilt per call.
+    """
+    global _CYPHER_PARSER
+    if _CYPHER_PARSER is None:
+        _CYPHER_PARSER = Lark(CYPHER_GRAMMAR, start='start', parser='earley')
+    return _CYPHER_PARSER
+
+
+def get_cypher_lalr_parser() -> Lark:
+    """Returns the process-wide LALR(1) parser for cypher_lalr.cfg, building it on first use."""
+    global _CYPHER_LALR_PARSER
+    if _CYPHER_LALR_PARSER is None:
+        _CYPHER_LALR_PARSER = Lark(CYPHER_LALR_GRAMMAR,
+                                   start='start',
+                                   parser='lalr',
+                                   lexer='contextual',
+                                   propagate_positions=True)
+    return _CYPHER_LALR_PARSER
+
+
+def check_cypher_lalr_tree(tree: Tree) -> bool:
+    """
+    Applies the lexical rules of cypher.cfg that cypher_lalr.cfg leaves to the parse tree:
+    binding variables must be lower-case identifiers and called functions must be allow-listed.
+    """
+    for subtree in tree.iter_subtrees():
+        if subtree.data == "binding_variable":
+            if not _BINDING_VARIABLE_RE.fullmatch(subtree.children[0]):
+                return False
+        elif subtree.data == "function_name":
+            if subtree.children[0].lower() not in _SAFE_FUNCTION_NAMES:
+                return False
+        elif subtree.data == "count_star":
+            if subtree.children[0].children[0].lower() != "count":
+                return False
+    return True
+
+
+def normalize_query_text(query: str) -> str:
+    """Collapses all runs of whitespace so that reformatted queries share a cache key."""
+    return " ".join(query.split())
+
+
+class ValidationCache:
+    """
+    Bounded LRU cache mapping whitespace-normalized query text to its
+    (is_valid, error_message) verdict, with hit/miss counters.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[bool, Optional[str]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[bool, Optional[str]]]:
+        verdict = self._entries.get(key)
+        if verdict is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return verdict
+
+    def put(self, key: str, verdict: Tuple[bool, Optional[str]]) -> None:
+        self._entries[key] = verdict
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+CYPHER_VALIDATION_CACHE = ValidationCache(maxsize=1024)
+
 
 def validate_cypher_query(query: str) -> Tuple[bool, Optional[str]]:
     """
     Validates a Cypher query using the context-free grammar.
+    Verdicts are cached by whitespace-normalized query text in CYPHER_VALIDATION_CACHE,
+    so a cached error message reports positions for the first spelling of the query seen.
     
     Args:
         query: The Cypher query string to validate
@@ -27,12 +159,29 @@ def validate_cypher_query(query: str) -> Tuple[bool, Optional[str]]:
     Returns:
         Tuple of (is_valid, error_message)
     """
+    key = normalize_query_text(query)
+    cached = CYPHER_VALIDATION_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    verdict = _parse_cypher_query(query)
+    CYPHER_VALIDATION_CACHE.put(key, verdict)
+    return verdict
+
+
+def _parse_cypher_query(query: str) -> Tuple[bool, Optional[str]]:
+    # Fast path: the LALR grammar accepts a subset of what the Earley grammar accepts,
+    # so its acceptance is final. Anything it rejects is re-checked by the Earley parser,
+    # which remains the reference for both the verdict and the error message.
     try:
-        # Create Lark parser with the grammar
-        parser = Lark(CYPHER_GRAMMAR, start='start', parser='earley')
+        if check_cypher_lalr_tree(get_cypher_lalr_parser().parse(query.strip())):
+            return True, None
+    except LarkError:
+        pass
 
+    try:
         # Parse the query - this will raise an exception if invalid
-        parser.parse(query.strip())
+        get_cypher_parser().parse(query.strip())
 
         return True, None  # Valid query
 
@@ -46,6 +195,364 @@ def validate_cypher_query(query: str) -> Tuple[bool, Optional[str]]:
         return False, f"Validation error: {str(e)}"
 
 
+# Validation runs in worker processes so a pathological query cannot block the event loop
+CYPHER_VALIDATION_TIMEOUT = 5.0  # wall-clock seconds of parsing per query, timed in the worker
+# Further seconds a query may wait for a free (or starting) worker
+CYPHER_VALIDATION_QUEUE_TIMEOUT = 30.0
+CYPHER_VALIDATION_WORKERS = 2
+
+_VALIDATION_POOL: Optional[ProcessPoolExecutor] = None
+
+
+class _ParseTimeout(BaseException):
+    """Interrupts a parse at its deadline; a BaseException so the parser's handlers let it through."""
+
+
+def _raise_parse_timeout(signum, frame):
+    raise _ParseTimeout()
+
+
+def _parse_cypher_query_timed(query: str, timeout: float) -> Optional[Tuple[bool, Optional[str]]]:
+    """
+    Runs in a validation worker: parses the query with a deadline that starts here, so
+    time spent queued or starting the worker does not count. Returns None if the parse
+    is interrupted at the deadline. A parse the interrupt cannot reach (or any parse
+    where SIGALRM does not exist) ends the worker process itself at twice the timeout.
+    """
+    watchdog = threading.Timer(2 * timeout, os._exit, args=(1, ))
+    watchdog.daemon = True
+    watchdog.start()
+    interruptible = hasattr(signal, "setitimer")
+    if interruptible:
+        previous = signal.signal(signal.SIGALRM, _raise_parse_timeout)
+    try:
+        if interruptible:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        return _parse_cypher_query(query)
+    except _ParseTimeout:
+        return None
+    finally:
+        if interruptible:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+        watchdog.cancel()
+
+
+def _warm_cypher_parsers() -> None:
+    get_cypher_lalr_parser()
+    get_cypher_parser()
+
+
+def start_cypher_validation_pool(
+        max_workers: int = CYPHER_VALIDATION_WORKERS) -> ProcessPoolExecutor:
+    """
+    Starts the process pool used by validate_cypher_query_async, if it is not running yet.
+    Every worker builds both parsers as soon as it starts, so call this at application
+    startup to keep grammar compilation off the first query.
+    """
+    global _VALIDATION_POOL
+    if _VALIDATION_POOL is None:
+        # spawn rather than fork: the parent has a running event loop and driver threads
+        pool = ProcessPoolExecutor(max_workers=max_workers,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_warm_cypher_parsers)
+        # one task per worker makes the pool start all of its processes now
+        for _ in range(max_workers):
+            pool.submit(_warm_cypher_parsers)
+        _VALIDATION_POOL = pool
+        # the in-process LALR parser is still used by project_out_embeddings
+        get_cypher_lalr_parser()
+    return _VALIDATION_POOL
+
+
+def shutdown_cypher_validation_pool() -> None:
+    """
+    Stops the validation workers without waiting: queued queries are cancelled, and a
+    busy worker exits after its parse, which its own deadline bounds
+    (see _parse_cypher_query_timed).
+    """
+    global _VALIDATION_POOL
+    pool, _VALIDATION_POOL = _VALIDATION_POOL, None
+    if pool is None:
+        return
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def validate_cypher_query_async(
+        query: str,
+        timeout: float = CYPHER_VALIDATION_TIMEOUT) -> Tuple[bool, Optional[str]]:
+    """
+    Like validate_cypher_query, but parses in the validation process pool with a
+    timeout on the parse itself (time waiting for a worker does not count). A query
+    that times out is reported as invalid, with an error message asking for a simpler
+    query. Only the parser's verdicts are cached: a timeout can be transient (a busy
+    or starting pool), so the query is parsed again next time.
+
+    Args:
+        query: The Cypher query string to validate
+        timeout: Seconds of parsing before giving up
+
+    Returns:
+        Tuple of (is_valid, error_message)
+    """
+    key = normalize_query_text(query)
+    cached = CYPHER_VALIDATION_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = start_cypher_validation_pool()
+        try:
+            verdict = await asyncio.wait_for(
+                loop.run_in_executor(pool, _parse_cypher_query_timed, query, timeout),
+                timeout + CYPHER_VALIDATION_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logging.error(f"Cypher validation got no result within {timeout + CYPHER_VALIDATION_QUEUE_TIMEOUT:g}s")
+            return False, "Validation error: the validation workers are busy, retry the query"
+        except BrokenProcessPool:
+            # a worker ended itself past its deadline (or crashed); retry on a fresh pool
+            logging.warning("Cypher validation pool broke, retrying the query on a new pool")
+            if _VALIDATION_POOL is pool:
+                shutdown_cypher_validation_pool()
+            if attempt == 0:
+                continue
+            return False, "Validation error: the validation worker pool is unavailable"
+        if verdict is None:
+            logging.error(f"Cypher validation timed out after {timeout:g}s")
+            return (
+                False,
+                f"Validation timed out after {timeout:g}s: the query is too complex to validate. "
+                "Split it into smaller queries or simplify its patterns and expressions.")
+        CYPHER_VALIDATION_CACHE.put(key, verdict)
+        return verdict
+
+
+# Node properties holding embeddings: the full vector and its truncations to
+# MATRYOSHKA_DIMENSIONS (see truncate_embeddings.py)
+EMBEDDING_PROPERTIES = ("embedding", "embedding_1024", "embedding_256")
+# Appended to whole-node return items so Neo4j never serializes the embedding vectors
+EMBEDDING_FREE_PROJECTION = " {.*, " + ", ".join(f"{prop}: null" for prop in EMBEDDING_PROPERTIES) + "}"
+
+# Rules that end the descent in _plain_variable: their single child is not a value
+_NOT_A_VARIABLE_RULES = {"pattern_expression", "map_projection"}
+
+# Rules that introduce a binding_variable that is not a node
+_NON_NODE_BINDING_RULES = (
+    "unwind_statement",
+    "path_variable_declaration",
+    "subpath_variable_declaration",
+    "relationship_pattern_filler",
+    "list_element_source",
+    "reduce_expression",
+    "quantifier_expression",
+    "pattern_source",
+)
+
+
+def _plain_variable(tree: Tree) -> Optional[Token]:
+    """Returns the variable token if the expression is nothing but a bare variable."""
+    node = tree
+    while isinstance(node, Tree):
+        if node.data == "binding_variable":
+            return node.children[0]
+        if node.data in _NOT_A_VARIABLE_RULES or len(node.children) != 1:
+            return None
+        node = node.children[0]
+    return None
+
+
+def _node_variables(tree: Tree) -> set:
+    """
+    Collects the variables that are bound to nodes in every part of the query:
+    node pattern variables and WITH/RETURN aliases of them. A name that is also
+    bound to anything else anywhere in the query is left out.
+    """
+    node_vars = set()
+    for filler in tree.find_data("node_pattern_filler"):
+        first = filler.children[0]
+        if isinstance(first, Tree) and first.data == "labelled_variable":
+            first = first.children[0]
+        if isinstance(first, Tree) and first.data == "binding_variable":
+            node_vars.add(str(first.children[0]))
+
+    other_vars = set()
+    for rule in _NON_NODE_BINDING_RULES:
+        for subtree in tree.find_data(rule):
+            for child in subtree.children:
+                if isinstance(child, Tree) and child.data == "binding_variable":
+                    other_vars.add(str(child.children[0]))
+    # inside a quantified path pattern, "((x)-->(y))+" binds lists of nodes
+    for factor in tree.find_data("path_factor"):
+        if len(factor.children) > 1:
+            other_vars.update(str(v.children[0]) for v in factor.find_data("binding_variable"))
+    for item in tree.find_data("return_item"):
+        if len(item.children) < 2:
+            continue
+        alias = str(item.children[1].children[-1].children[0])
+        variable = _plain_variable(item.children[0])
+        if variable is not None and str(variable) in node_vars:
+            node_vars.add(alias)
+        else:
+            other_vars.add(alias)
+    return node_vars - other_vars
+
+
+@functools.lru_cache(maxsize=1024)
+def project_out_embeddings(query: str) -> str:
+    """
+    Rewrites whole-node items in the RETURN clauses of a validated query into map
+    projections without the embeddings, e.g. "RETURN n" becomes
+    "RETURN n {.*, embedding: null, ...} AS n" and "collect(m)" becomes
+    "collect(m {.*, embedding: null, ...})". Column names are kept, so the records
+    look the same once filter_embedding has dropped the null keys.
+
+    Queries the LALR grammar cannot parse are returned unchanged, as are
+    variables the ORDER BY clause passes to a function (e.g. elementId(n)).
+    Paths are not rewritten.
+    """
+    query = query.strip()
+    try:
+        tree = get_cypher_lalr_parser().parse(query)
+    except LarkError:
+        return query
+
+    node_vars = _node_variables(tree)
+    if not node_vars:
+        return query
+
+    insertions = []
+    for statement in tree.find_data("return_statement"):
+        body = statement.children[1]
+        keep = set()
+        for clause in statement.children[2:]:
+            for call in clause.find_data("function_invocation"):
+                keep.update(str(v.children[0]) for v in call.find_data("binding_variable"))
+
+        for item in body.find_data("return_item"):
+            expression = item.children[0]
+            targets = []
+            variable = _plain_variable(expression)
+            if variable is not None:
+                targets.append(variable)
+            else:
+                for call in expression.find_data("function_invocation"):
+                    name = call.children[0]
+                    if not (isinstance(name, Tree) and name.data == "function_name"
+                            and str(name.children[0]).lower() == "collect"):
+                        continue
+                    arguments = call.children[-1]
+                    if isinstance(arguments, Tree) and arguments.data == "function_argument_list" \
+                            and len(arguments.children) == 1:
+                        argument = _plain_variable(arguments.children[0])
+                        if argument is not None:
+                            targets.append(argument)
+            targets = [t for t in targets if str(t) in node_vars and str(t) not in keep]
+            if not targets:
+                continue
+
+            for token in targets:
+                insertions.append((token.end_pos, EMBEDDING_FREE_PROJECTION))
+            if len(item.children) < 2:
+                # keep the column name the unrewritten item would have had
+                original = query[item.meta.start_pos:item.meta.end_pos]
+                alias = original if variable is not None else "`" + original.replace("`", "``") + "`"
+                insertions.append((item.meta.end_pos, f" AS {alias}"))
+
+    # right to left; at the same offset the alias was queued last and goes in first
+    for _, (position, text) in sorted(enumerate(insertions),
+                                      key=lambda i: (i[1][0], i[0]), reverse=True):
+        query = query[:position] + text + query[position:]
+    return query
+
+
+class NameLabelIndex:
+    """
+    In-process map from node name to the labels of the nodes with that name.
+
+    Names are only indexed per label, so "which node is called X?" without a label
+    scans the whole graph. The map is warmed from the graph once per process (see
+    warm_name_label_index) and kept current by the node writes of this module, so
+    endpoints can be resolved through a single labelled index lookup. Other processes
+    write to the same graph, so an entry can be missing or stale: callers treat it as
+    a hint and fall back to their label-less or schema-based lookup.
+    """
+
+    def __init__(self):
+        self._labels: Dict[str, List[str]] = {}
+        self.warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str) -> List[str]:
+        labels = self._labels.get(name)
+        if labels:
+            self.hits += 1
+            return list(labels)
+        self.misses += 1
+        return []
+
+    def __contains__(self, name: str) -> bool:
+        return bool(self._labels.get(name))
+
+    def put(self, name: str, label: str) -> None:
+        labels = self._labels.setdefault(name, [])
+        if label not in labels:
+            labels.append(label)
+
+    def discard(self, name: str, label: Optional[str] = None) -> None:
+        """Forgets the node with the name and label (any label if None)."""
+        labels = self._labels.get(name)
+        if labels is None:
+            return
+        if label is None or labels == [label]:
+            del self._labels[name]
+        elif label in labels:
+            labels.remove(label)
+
+    def rename(self, old_name: str, new_name: str, label: str) -> None:
+        if old_name != new_name:
+            self.discard(old_name, label)
+        self.put(new_name, label)
+
+    def load(self, rows: List[Dict[str, Any]]) -> None:
+        self._labels = {}
+        for row in rows:
+            for label in row["labels"]:
+                self.put(row["name"], label)
+        self.warmed = True
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "names": len(self._labels),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+NAME_LABEL_INDEX = NameLabelIndex()
+
+
+async def warm_name_label_index(neo4jdriver: AsyncDriver, force: bool = False) -> None:
+    """Loads NAME_LABEL_INDEX from the graph; a no-op if it is already warm unless force is set."""
+    if NAME_LABEL_INDEX.warmed and not force:
+        return
+
+    async def read_names(tx: AsyncTransaction):
+        result = await tx.run(
+            "MATCH (n) WHERE n.name IS NOT NULL RETURN n.name AS name, labels(n) AS labels")
+        return await result.data()
+
+    start = time.perf_counter()
+    async with neo4jdriver.session() as session:
+        rows = await execute_graph_tx(session, "cypher", read_names)
+    NAME_LABEL_INDEX.load(rows)
+    logging.info(f"[NAME_LABEL_INDEX] warmed with {len(rows)} nodes "
+                 f"in {time.perf_counter() - start:.2f}s")
+
+
 class Neo4jDateEncoder(json.JSONEncoder):
 
     def default(self, o):
@@ -70,7 +577,6 @@ def parse_date_properties(props: dict) -> dict:
     neo4j.time.Date object. Non-string values and unknown keys are passed through
     unchanged.
     """
-    import re
     result = {}
     for k, v in props.items():
         if k in _DATE_PROPERTY_KEYS and isinstance(v, str):
@@ -96,18 +602,461 @@ def parse_date_properties(props: dict) -> dict:
 
 
 EMBEDDING_MODEL = "text-embedding-3-large"
+# Size of the embeddings EMBEDDING_MODEL returns, stored as n.embedding and indexed
+# by the indexes of vector_index.cypher
+FULL_EMBEDDING_DIMENSIONS = 3072
+# Sizes truncate_embeddings.py can cut the stored embeddings to (Matryoshka truncation)
+MATRYOSHKA_DIMENSIONS = (1024, 256)
+# Size the vector searches run at: FULL_EMBEDDING_DIMENSIONS, or one of
+# MATRYOSHKA_DIMENSIONS once truncate_embeddings.py has migrated the graph to it.
+# benchmarks/matryoshka_recall.py measures what each size costs in recall.
+EMBEDDING_DIMENSIONS = FULL_EMBEDDING_DIMENSIONS
+
+
+def embedding_property(dims: Optional[int] = None) -> str:
+    """Node property holding the embeddings of a size (default EMBEDDING_DIMENSIONS)."""
+    dims = dims or EMBEDDING_DIMENSIONS
+    return "embedding" if dims == FULL_EMBEDDING_DIMENSIONS else f"embedding_{dims}"
+
+
+def vector_index_name(label: str, dims: Optional[int] = None) -> str:
+    """Vector index over embedding_property(dims) of a node label."""
+    dims = dims or EMBEDDING_DIMENSIONS
+    name = f"{label.lower()}_description_embeddings"
+    return name if dims == FULL_EMBEDDING_DIMENSIONS else f"{name}_{dims}"
+
+
+def truncate_embedding(embedding: List[float], dims: Optional[int] = None) -> List[float]:
+    """The first dims (default EMBEDDING_DIMENSIONS) values of an embedding, renormalized to unit length."""
+    dims = dims or EMBEDDING_DIMENSIONS
+    if len(embedding) <= dims:
+        return embedding
+    head = embedding[:dims]
+    norm = sum(x * x for x in head) ** 0.5
+    return [x / norm for x in head] if norm else head
+
+
+def embedding_props(embedding: List[float]) -> Dict[str, Optional[List[float]]]:
+    """
+    Node properties for a new full-size embedding: n.embedding, its truncation to
+    EMBEDDING_DIMENSIONS, and null for the other sizes, so that truncate_embeddings.py
+    recomputes them rather than keeping a vector of the old description.
+    """
+    props = {"embedding": embedding}
+    for dims in MATRYOSHKA_DIMENSIONS:
+        props[embedding_property(dims)] = (truncate_embedding(embedding, dims)
+                                           if dims == EMBEDDING_DIMENSIONS else None)
+    return props
+
+# SQLite file of the embedding cache's disk tier, relative to the working directory; None disables it
+EMBEDDING_CACHE_PATH = "embedding_cache.sqlite"
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of embeddings keyed by sha256(model, dimensions, text).
+
+    An in-memory LRU tier sits in front of a disk tier of float32 blobs in SQLite, so
+    texts that were embedded before (node descriptions, repeated search queries) are
+    not sent to the embeddings API again, also across restarts. Vectors are kept as
+    float32, which is far below the precision that matters for cosine similarity.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = EMBEDDING_CACHE_PATH):
+        self.maxsize = maxsize
+        self.path = path
+        self._cache: "OrderedDict[str, array]" = OrderedDict()
+        self._conn = None
+        self.memory_bytes = 0
+        self.reset_stats()
+
+    def _connect(self):
+        if self._conn is None and self.path:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, dimensions: Optional[int], text: str) -> str:
+        return hashlib.sha256(json.dumps([model, dimensions, text]).encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: array) -> None:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return
+        self._cache[key] = vector
+        self.memory_bytes += vector.itemsize * len(vector)
+        while len(self._cache) > self.maxsize:
+            _, evicted = self._cache.popitem(last=False)
+            self.memory_bytes -= evicted.itemsize * len(evicted)
+
+    def get(self, key: str) -> Optional[List[float]]:
+        vector = self._cache.get(key)
+        if vector is not None:
+            self._cache.move_to_end(key)
+            self.memory_hits += 1
+        else:
+            conn = self._connect()
+            row = conn.execute("SELECT vector FROM embeddings WHERE key = ?",
+                               (key, )).fetchone() if conn is not None else None
+            if row is None:
+                self.misses += 1
+                return None
+            vector = array("f")
+            vector.frombytes(row[0])
+            self._remember(key, vector)
+            self.disk_hits += 1
+        self.bytes_served += vector.itemsize * len(vector)
+        return vector.tolist()
+
+    def put_many(self, items: List[Tuple[str, List[float]]]) -> None:
+        vectors = [(key, array("f", embedding)) for key, embedding in items]
+        for key, vector in vectors:
+            self._remember(key, vector)
+            self.bytes_fetched += vector.itemsize * len(vector)
+        conn = self._connect()
+        if conn is not None:
+            conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?)",
+                             [(key, vector.tobytes()) for key, vector in vectors])
+            conn.commit()
+
+    def clear(self) -> None:
+        """Empties the memory tier; the disk tier is kept."""
+        self._cache.clear()
+        self.memory_bytes = 0
+
+    def reset_stats(self) -> None:
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.bytes_fetched = 0
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "bytes_served": self.bytes_served,
+            "bytes_fetched": self.bytes_fetched,
+            "memory_entries": len(self._cache),
+            "memory_bytes": self.memory_bytes,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+EMBEDDING_CACHE = EmbeddingCache()
+
+
+async def embed_texts(openai_embedding_client,
+                      texts: List[str],
+                      model: str = EMBEDDING_MODEL,
+                      dimensions: Optional[int] = None) -> List[List[float]]:
+    """
+    Returns the embeddings of the texts, in order, through EMBEDDING_CACHE. Texts that
+    are not cached are embedded in one request (each distinct text once).
+    """
+    keys = [EmbeddingCache.make_key(model, dimensions, text) for text in texts]
+    embeddings = [EMBEDDING_CACHE.get(key) for key in keys]
+    missing = {}
+    for key, text, embedding in zip(keys, texts, embeddings):
+        if embedding is None:
+            missing.setdefault(key, text)
+    if missing:
+        request = {"model": model, "input": list(missing.values())}
+        if dimensions is not None:
+            request["dimensions"] = dimensions
+        emb_response = await openai_embedding_client.embeddings.create(**request)
+        fetched = dict(zip(missing, (item.embedding for item in emb_response.data)))
+        EMBEDDING_CACHE.put_many(list(fetched.items()))
+        embeddings = [embedding if embedding is not None else fetched[key]
+                      for key, embedding in zip(keys, embeddings)]
+    return embeddings
+
+
+async def embed_search_texts(openai_embedding_client, texts: List[str]) -> List[List[float]]:
+    """
+    Embeddings of search texts at EMBEDDING_DIMENSIONS; the API truncates and
+    renormalizes them when the searches run on truncated vectors.
+    """
+    dimensions = None if EMBEDDING_DIMENSIONS == FULL_EMBEDDING_DIMENSIONS else EMBEDDING_DIMENSIONS
+    return await embed_texts(openai_embedding_client, texts, dimensions=dimensions)
+
+
+
+# Driver settings of app.py, batch.py, scraper.py and the dashboard. Connections are
+# kept for an hour (they were re-established every 30 seconds), TCP keepalive keeps
+# idle ones from being dropped by the network, and a connection idle for longer than
+# liveness_check_timeout is checked before use instead of every one, every time.
+NEO4J_DRIVER_SETTINGS: Dict[str, Any] = {
+    "max_connection_lifetime": 3600,
+    "max_connection_pool_size": 5,
+    "liveness_check_timeout": 60,
+    "keep_alive": True,
+    "connection_acquisition_timeout": 30,
+}
+
+# Concurrent reads allowed per GraphOpsLock: one per pooled connection of our drivers
+GRAPH_OPS_MAX_CONCURRENT_READS = NEO4J_DRIVER_SETTINGS["max_connection_pool_size"]
+
+
+class GraphOpsLock:
+    """
+    Readers-writer lock for graph operations.
+
+    Up to max_readers reads run at once (each holds one pooled connection), while a
+    write runs alone so that node_name_mapping updates and the reads that depend on
+    them happen in order. A waiting writer blocks new readers, so a steady stream of
+    reads cannot starve writes.
+    """
+
+    def __init__(self, max_readers: int = GRAPH_OPS_MAX_CONCURRENT_READS):
+        self.max_readers = max_readers
+        self._condition = asyncio.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+        self.peak_readers = 0
+        self.read_waits = 0
+        self.write_waits = 0
+
+    @asynccontextmanager
+    async def read(self):
+        async with self._condition:
+            if self._writing or self._writers_waiting or self._readers >= self.max_readers:
+                self.read_waits += 1
+                await self._condition.wait_for(
+                    lambda: not (self._writing or self._writers_waiting
+                                 or self._readers >= self.max_readers))
+            self._readers += 1
+            self.peak_readers = max(self.peak_readers, self._readers)
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._readers -= 1
+                self._condition.notify_all()
+
+    @asynccontextmanager
+    async def write(self):
+        async with self._condition:
+            if self._writing or self._readers:
+                self.write_waits += 1
+                self._writers_waiting += 1
+                try:
+                    await self._condition.wait_for(lambda: not (self._writing or self._readers))
+                finally:
+                    self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_readers": self.max_readers,
+            "readers": self._readers,
+            "writing": self._writing,
+            "peak_readers": self.peak_readers,
+            "read_waits": self.read_waits,
+            "write_waits": self.write_waits,
+        }
+
+
+# Idle sessions kept per driver by GraphSessionPool
+GRAPH_SESSION_POOL_SIZE = GRAPH_OPS_MAX_CONCURRENT_READS
+
+
+class GraphSessionPool:
+    """
+    Reusable sessions of one driver, shared by all GraphOpsCtx objects built on it
+    (see GraphSessionPool.for_driver).
+
+    A session is handed to one operation at a time, since sessions must not be used
+    concurrently; when all are busy a new one is opened, and at most size idle ones
+    are kept. Sessions are kept per fetch_size, which the driver only takes per
+    session. A session whose operation failed is closed rather than reused. The
+    connections underneath are pooled by the driver (see NEO4J_DRIVER_SETTINGS).
+    """
+
+    _pools: "weakref.WeakKeyDictionary[AsyncDriver, GraphSessionPool]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, neo4jdriver: AsyncDriver, size: int = GRAPH_SESSION_POOL_SIZE):
+        self.neo4jdriver = neo4jdriver
+        self.size = size
+        self._idle: Dict[Optional[int], List[Any]] = {}  # fetch_size -> idle sessions
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.acquisitions = 0
+        self.reused = 0
+        self.opened = 0
+        self.discarded = 0
+        self.busy_time = 0.0
+        self._started = time.perf_counter()
+
+    @classmethod
+    def for_driver(cls, neo4jdriver: AsyncDriver) -> "GraphSessionPool":
+        pool = cls._pools.get(neo4jdriver)
+        if pool is None:
+            pool = cls._pools[neo4jdriver] = cls(neo4jdriver)
+        return pool
+
+    def _idle_count(self) -> int:
+        return sum(len(sessions) for sessions in self._idle.values())
+
+    @asynccontextmanager
+    async def session(self, fetch_size: Optional[int] = None):
+        idle = self._idle.setdefault(fetch_size, [])
+        if idle:
+            session = idle.pop()
+            self.reused += 1
+        else:
+            config = {} if fetch_size is None else {"fetch_size": fetch_size}
+            session = self.neo4jdriver.session(**config)
+            self.opened += 1
+        self.acquisitions += 1
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        start = time.perf_counter()
+        healthy = False
+        try:
+            yield session
+            healthy = True
+        finally:
+            self.in_use -= 1
+            self.busy_time += time.perf_counter() - start
+            if healthy and self._idle_count() < self.size:
+                self._idle.setdefault(fetch_size, []).append(session)
+            else:
+                self.discarded += 1
+                await session.close()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for sessions in idle.values():
+            for session in sessions:
+                await session.close()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "size": self.size,
+            "in_use": self.in_use,
+            "idle": self._idle_count(),
+            "peak_in_use": self.peak_in_use,
+            "acquisitions": self.acquisitions,
+            "reused": self.reused,
+            "opened": self.opened,
+            "discarded": self.discarded,
+            # share of the time the pool's sessions were busy
+            "utilization": self.busy_time / (elapsed * self.size) if elapsed and self.size else 0.0,
+        }
+
+
+async def close_graph_sessions(neo4jdriver: AsyncDriver) -> Dict[str, Any]:
+    """Closes the pooled sessions of a driver; call before closing the driver. Returns the pool's stats."""
+    pool = GraphSessionPool._pools.pop(neo4jdriver, None)
+    if pool is None:
+        return {}
+    await pool.close()
+    return pool.stats()
+
+
+# Write-behind buffering of batch-mode contexts: flush after this many buffered
+# operations, or this many seconds after the first one
+GRAPH_WRITE_BUFFER_MAX_OPS = 200
+GRAPH_WRITE_BUFFER_MAX_DELAY = 5.0
+
+
+class GraphWriteBuffer:
+    """
+    Pending merge-node and create-edge operations of a batch-mode GraphOpsCtx.
+
+    core_merge_node, core_create_edge and the plain merges of core_smart_upsert_many
+    only record their operation; core_flush_writes writes everything recorded in one
+    transaction, one UNWIND statement per label and per relationship type, once
+    GRAPH_WRITE_BUFFER_MAX_OPS operations are pending or GRAPH_WRITE_BUFFER_MAX_DELAY
+    seconds after the first one. Reads of the context
+    (core_execute_cypher_query, core_dfs) flush first.
+    """
+
+    def __init__(self,
+                 max_ops: int = GRAPH_WRITE_BUFFER_MAX_OPS,
+                 max_delay: float = GRAPH_WRITE_BUFFER_MAX_DELAY):
+        self.max_ops = max_ops
+        self.max_delay = max_delay
+        # (label, name) -> properties to set
+        self.nodes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # dicts with source_name, target_name, relationship_type and props
+        self.edges: List[Dict[str, Any]] = []
+        self.flushes = 0
+        self.flushed_nodes = 0
+        self.flushed_edges = 0
+        self.failed_edges: List[str] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.nodes) + len(self.edges)
+
+    def add_node(self, label: str, name: str, props: Dict[str, Any]) -> None:
+        self.nodes.setdefault((label, name), {}).update(props)
+
+    def add_edge(self, source_name: str, target_name: str, relationship_type: str,
+                 props: Dict[str, Any]) -> None:
+        self.edges.append({
+            "source_name": source_name,
+            "target_name": target_name,
+            "relationship_type": relationship_type,
+            "props": props,
+        })
+
+    def node_labels(self, name: str) -> List[str]:
+        """Labels of the buffered nodes with the name."""
+        return [label for label, node_name in self.nodes if node_name == name]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self),
+            "flushes": self.flushes,
+            "flushed_nodes": self.flushed_nodes,
+            "flushed_edges": self.flushed_edges,
+            "failed_edges": len(self.failed_edges),
+        }
 
 
 @dataclass
 class GraphOpsCtx:
     neo4jdriver: AsyncDriver
-    lock: Lock
+    lock: GraphOpsLock = None
     node_name_mapping: Dict[
         str, str] = None  # Maps old node names to actual node names
+    write_buffer: Optional[GraphWriteBuffer] = None  # set for batch mode (write-behind)
+    session_pool: Optional[GraphSessionPool] = None  # defaults to the driver's shared pool
 
     def __post_init__(self):
+        if self.lock is None:
+            self.lock = GraphOpsLock()
         if self.node_name_mapping is None:
             self.node_name_mapping = {}
+        if self.session_pool is None:
+            self.session_pool = GraphSessionPool.for_driver(self.neo4jdriver)
+
+    def session(self, fetch_size: Optional[int] = None):
+        """A pooled session for one graph operation: async with ctx.session() as session."""
+        return self.session_pool.session(fetch_size)
 
 
 async def run_transaction(tx: AsyncTransaction, query, params=None):
@@ -119,17 +1068,264 @@ async def run_transaction(tx: AsyncTransaction, query, params=None):
     return await result.data()
 
 
+# Server-side transaction timeouts in seconds, per kind of graph operation
+TX_TIMEOUTS: Dict[str, float] = {
+    "cypher": 30.0,  # LLM-authored queries and lookups
+    "vector": 15.0,  # vector index searches
+    "dfs": 60.0,  # subgraph expansion
+    "write": 20.0,  # node and edge writes
+}
+
+# Counters such as "cypher.timeout" or "vector.cancelled"
+GRAPH_OPS_METRICS: Counter = Counter()
+
+
+async def execute_graph_tx(session: AsyncSession, operation: str, work, *args,
+                           write: bool = False):
+    """
+    Runs work in a managed read (or write) transaction whose server-side timeout is
+    TX_TIMEOUTS[operation].
+
+    If the calling task is cancelled, the driver drops the connection and the server
+    rolls the transaction back; the cancellation is counted and re-raised. A server
+    timeout is counted and raised as a RuntimeError.
+    """
+    timeout = TX_TIMEOUTS[operation]
+    timed_work = unit_of_work(timeout=timeout)(work)
+    try:
+        if write:
+            return await session.execute_write(timed_work, *args)
+        return await session.execute_read(timed_work, *args)
+    except asyncio.CancelledError:
+        GRAPH_OPS_METRICS[f"{operation}.cancelled"] += 1
+        logging.warning(f"[GRAPH_OPS] {operation} transaction cancelled")
+        raise
+    except Neo4jError as e:
+        if "TransactionTimedOut" in (e.code or ""):
+            GRAPH_OPS_METRICS[f"{operation}.timeout"] += 1
+            logging.warning(f"[GRAPH_OPS] {operation} transaction timed out after {timeout:g}s")
+            raise RuntimeError(
+                f"The {operation} operation timed out after {timeout:g}s and was rolled back. "
+                f"Narrow it down (more selective filters, smaller depth or LIMIT) and retry."
+            ) from e
+        raise
+
+
+# Graph-wide write generation. Every write path bumps it, which invalidates
+# all cached read results at once (see QueryResultCache).
+_GRAPH_GENERATION = 0
+
+
+def get_graph_generation() -> int:
+    return _GRAPH_GENERATION
+
+
+def bump_graph_generation() -> int:
+    """Marks the graph as modified; call after any successful write transaction."""
+    global _GRAPH_GENERATION
+    _GRAPH_GENERATION += 1
+    return _GRAPH_GENERATION
+
+
+class QueryResultCache:
+    """
+    Bounded LRU cache of read-query results keyed by whitespace-normalized
+    query text and parameters.
+
+    Entries are tagged with the graph generation at the time the query was
+    issued and are discarded once the generation moves on or the entry is
+    older than ttl seconds. Hit/miss counters are kept per normalized query.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[int, float, List[dict]]]" = OrderedDict()
+        self._query_stats: "OrderedDict[str, Dict[str, int]]" = OrderedDict()
+
+    @staticmethod
+    def make_key(query: str, params: Optional[Dict[str, Any]] = None,
+                 variant: Any = None) -> str:
+        return json.dumps([normalize_query_text(query), params or {}, variant],
+                          sort_keys=True, default=str)
+
+    def _count(self, query: str, outcome: str) -> None:
+        normalized = normalize_query_text(query)
+        counts = self._query_stats.setdefault(normalized, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+        self._query_stats.move_to_end(normalized)
+        while len(self._query_stats) > self.maxsize:
+            self._query_stats.popitem(last=False)
+
+    def get(self, query: str, params: Optional[Dict[str, Any]] = None,
+            variant: Any = None) -> Optional[List[dict]]:
+        key = self.make_key(query, params, variant)
+        entry = self._entries.get(key)
+        if entry is not None:
+            generation, stored_at, records = entry
+            if generation == _GRAPH_GENERATION and time.monotonic() - stored_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._count(query, "hits")
+                return copy.deepcopy(records)
+            del self._entries[key]
+        self.misses += 1
+        self._count(query, "misses")
+        return None
+
+    def put(self, query: str, params: Optional[Dict[str, Any]], generation: int,
+            records: List[dict], variant: Any = None) -> None:
+        if generation != _GRAPH_GENERATION or self.maxsize <= 0:
+            return  # a write landed while the query was running
+        key = self.make_key(query, params, variant)
+        self._entries[key] = (generation, time.monotonic(), copy.deepcopy(records))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._query_stats.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self, top_queries: Optional[int] = 10) -> Dict[str, Any]:
+        """Overall counters and those of the top_queries most hit queries (all if None)."""
+        queries = sorted(self._query_stats.items(),
+                         key=lambda item: (item[1]["hits"], item[1]["misses"]), reverse=True)
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "generation": _GRAPH_GENERATION,
+            "hits": self.hits,
+            "misses": self.misses,
+            "queries": {q: dict(c) for q, c in queries[:top_queries]},
+        }
+
+
+CYPHER_RESULT_CACHE = QueryResultCache(maxsize=256, ttl=300.0)
+
+# Bounds for streamed query results (see core_execute_cypher_query)
+CYPHER_FETCH_SIZE = 100  # records pulled from the server per round trip
+CYPHER_MAX_ROWS = 200
+CYPHER_MAX_BYTES = 64_000  # serialized JSON size of the returned rows
+CYPHER_COUNT_LIMIT = 10_000  # rows counted past the cap before giving up
+
+# EXPLAIN-based cost guard thresholds (see check_query_plan)
+CYPHER_MAX_ESTIMATED_ROWS = 1_000_000  # at any operator in the plan
+CYPHER_MAX_CARTESIAN_ROWS = 10_000
+CYPHER_MAX_ALL_NODES_SCAN_ROWS = 10_000
+CYPHER_ALLOW_UNBOUNDED_VAR_LENGTH = False
+
+# Plan verdicts keyed by query shape: normalized text with string literals blanked
+CYPHER_PLAN_CACHE = ValidationCache(maxsize=1024)
+_STRING_LITERAL_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+# "[*]", "[r*2..]" or "{1, *}" in an operator's Details
+_UNBOUNDED_LENGTH_RE = re.compile(r"\*\s*\]|\*\s*\d*\s*\.\.\s*\]|,\s*\*\s*\}")
+
+
+def query_shape(query: str) -> str:
+    """Normalized query text with string literals replaced, so e.g. lookups of different names share a plan verdict."""
+    return _STRING_LITERAL_RE.sub("?", normalize_query_text(query))
+
+
+def _plan_operators(plan: dict):
+    yield plan
+    for child in plan.get("children", []):
+        yield from _plan_operators(child)
+
+
+def check_query_plan(plan: Optional[dict]) -> Tuple[bool, Optional[str]]:
+    """
+    Inspects an EXPLAIN plan (ResultSummary.plan) for operators that make a query
+    too expensive to run: large cartesian products, variable-length patterns
+    without an upper bound, large AllNodesScans, and oversized row estimates.
+
+    Returns:
+        tuple: (True, None) if the query may run, or (False, error_message) with a
+        hint on how to rewrite it.
+    """
+    if not plan:
+        return True, None
+    operators = list(_plan_operators(plan))
+    for operator in operators:
+        name = operator.get("operatorType", "").split("@")[0]
+        args = operator.get("args", {})
+        rows = float(args.get("EstimatedRows", 0) or 0)
+        details = str(args.get("Details", ""))
+        identifiers = ", ".join(sorted(i for i in operator.get("identifiers", [])
+                                       if not i.startswith("anon_")))
+
+        if name == "CartesianProduct" and rows > CYPHER_MAX_CARTESIAN_ROWS:
+            return False, (
+                f"Query rejected: it combines disconnected patterns into a cartesian product of "
+                f"~{rows:,.0f} rows (variables: {identifiers}). Connect the patterns with a "
+                f"relationship, filter each side on a property such as {{name: ...}}, or split "
+                f"it into separate queries.")
+        if (("VarLengthExpand" in name or name.startswith("Repeat"))
+                and not CYPHER_ALLOW_UNBOUNDED_VAR_LENGTH
+                and _UNBOUNDED_LENGTH_RE.search(details)):
+            return False, (
+                f"Query rejected: the variable-length pattern {details} has no upper bound. "
+                f"Give it a maximum length, e.g. [*1..3], or use the dfs tool to explore "
+                f"a node's neighbourhood.")
+        if name == "AllNodesScan" and rows > CYPHER_MAX_ALL_NODES_SCAN_ROWS:
+            return False, (
+                f"Query rejected: it scans all ~{rows:,.0f} nodes because the pattern for "
+                f"{identifiers or 'a node'} has no label. Add a label, e.g. (n:Capability), "
+                f"and filter on name where possible.")
+
+    # Only then the generic estimate, reported at the operator where it is largest
+    largest = max(operators, key=lambda o: float(o.get("args", {}).get("EstimatedRows", 0) or 0))
+    rows = float(largest.get("args", {}).get("EstimatedRows", 0) or 0)
+    if rows > CYPHER_MAX_ESTIMATED_ROWS:
+        name = largest.get("operatorType", "").split("@")[0]
+        return False, (
+            f"Query rejected: the planner estimates ~{rows:,.0f} rows at {name}, above "
+            f"the limit of {CYPHER_MAX_ESTIMATED_ROWS:,}. Add selective filters, "
+            f"aggregate earlier with WITH, or add a LIMIT.")
+    return True, None
+
+
 # Core logic functions, independent of Chainlit
 
 
 async def core_execute_cypher_query(ctx: GraphOpsCtx,
-                                    query: str) -> List[dict]:
+                                    query: str,
+                                    params: Optional[Dict[str, Any]] = None,
+                                    use_cache: bool = True,
+                                    max_rows: Optional[int] = CYPHER_MAX_ROWS,
+                                    max_bytes: Optional[int] = CYPHER_MAX_BYTES,
+                                    fetch_size: int = CYPHER_FETCH_SIZE) -> List[dict]:
     """
     Executes the provided Cypher query against the Neo4j database and returns the results.
     Robust error handling is implemented to catch exceptions from invalid queries or empty result sets.
 
+    The query is EXPLAINed first and rejected with a rewrite hint if its plan is too
+    expensive (see check_query_plan); plan verdicts are cached by query_shape.
+
+    Records are streamed fetch_size at a time and collection stops once max_rows rows or
+    max_bytes of serialized JSON have been gathered. The remaining rows are only counted
+    (up to CYPHER_COUNT_LIMIT), and a final {"truncated": true, ...} marker reports how
+    many rows were returned out of how many.
+
+    Results are served from CYPHER_RESULT_CACHE when the same query and parameters were
+    run since the last graph write; pass use_cache=False to always hit the database.
+
+    Args:
+        query (str): A read-only Cypher query.
+        params (dict): Optional query parameters.
+        use_cache (bool): Whether to read from and populate the result cache.
+        max_rows (int): Maximum number of rows to return; None for no limit.
+        max_bytes (int): Maximum serialized size of the returned rows; None for no limit.
+        fetch_size (int): Number of records requested from the server per batch.
+
     Returns:
-        list: A list of dictionaries representing the records from the database query.
+        list: A list of dictionaries representing the records from the database query,
+        followed by a truncation marker if a limit was hit.
 
     Raises:
         RuntimeError: If there is an error executing the Cypher query.
@@ -137,12 +1333,12 @@ async def core_execute_cypher_query(ctx: GraphOpsCtx,
 
     def filter_embedding(obj):
         """
-        Recursively removes the 'embedding' key and converts Neo4j Date/DateTime to strings.
+        Recursively removes the embedding keys and converts Neo4j Date/DateTime to strings.
         """
         if isinstance(obj, dict):
             return {
                 k: filter_embedding(v)
-                for k, v in obj.items() if k != 'embedding'
+                for k, v in obj.items() if k not in EMBEDDING_PROPERTIES
             }
         elif isinstance(obj, list):
             return [filter_embedding(item) for item in obj]
@@ -157,29 +1353,238 @@ async def core_execute_cypher_query(ctx: GraphOpsCtx,
     logging.info(f"[CYPHER_QUERY]:\n{query}")
 
     # Validate the query before execution
-    is_valid, validation_error = validate_cypher_query(query)
+    is_valid, validation_error = await validate_cypher_query_async(query)
     if not is_valid:
         logging.error(
             f"validate_cypher_query caught and reported an Invalid Cypher query: {validation_error}"
         )
         raise RuntimeError(f"Invalid Cypher query: {validation_error}")
 
-    async with ctx.neo4jdriver.session() as session:
+    # Never let the server ship embedding vectors we would throw away
+    rewritten_query = project_out_embeddings(query)
+    if rewritten_query != query.strip():
+        logging.info(f"[CYPHER_QUERY] rewritten to:\n{rewritten_query}")
+
+    # read your own buffered writes
+    if ctx.write_buffer is not None:
+        await core_flush_writes(ctx)
+
+    limits = (max_rows, max_bytes)
+    if use_cache:
+        cached = CYPHER_RESULT_CACHE.get(query, params, variant=limits)
+        if cached is not None:
+            logging.info("[CYPHER_QUERY] served from result cache")
+            return cached
+    generation = get_graph_generation()
+
+    async with ctx.session(fetch_size) as session:
+
+        async def explain_work(tx: AsyncTransaction):
+            result = await tx.run("EXPLAIN " + rewritten_query, params or {})
+            summary = await result.consume()
+            return summary.plan
 
         async def read_work(tx: AsyncTransaction):
-            result = await tx.run(query)
-            records = await result.data()
-            if not records:
-                return []
-            filtered_records = [filter_embedding(record) for record in records]
-            return filtered_records
+            result = await tx.run(rewritten_query, params or {})
+            rows = []
+            size = 2  # the enclosing "[]"
+            async for record in result:
+                row = filter_embedding(record.data())
+                if max_rows is not None and len(rows) >= max_rows:
+                    break
+                if max_bytes is not None:
+                    size += len(json.dumps(row, default=str)) + 2
+                    if size > max_bytes:
+                        break
+                rows.append(row)
+            else:
+                return rows
+
+            # A limit was hit: count what is left without keeping it
+            total = len(rows) + 1
+            exact = True
+            async for _ in result:
+                total += 1
+                if total - len(rows) > CYPHER_COUNT_LIMIT:
+                    exact = False
+                    break
+            await result.consume()
+            logging.warning(
+                f"[CYPHER_QUERY] result truncated to {len(rows)} of "
+                f"{'' if exact else 'at least '}{total} rows")
+            rows.append({
+                "truncated": True,
+                "returned_rows": len(rows),
+                "total_rows": total,
+                "total_rows_exact": exact,  # False: total_rows is a lower bound
+                "message": (
+                    "Result truncated. Add a LIMIT, aggregate, or return fewer/smaller "
+                    "properties to see the rest."),
+            })
+            return rows
 
-        async with ctx.lock:
+        shape = query_shape(rewritten_query)
+        async with ctx.lock.read():
             try:
-                return await session.execute_read(read_work)
+                verdict = CYPHER_PLAN_CACHE.get(shape)
+                if verdict is None:
+                    verdict = check_query_plan(await execute_graph_tx(session, "cypher", explain_work))
+                    CYPHER_PLAN_CACHE.put(shape, verdict)
+                is_cheap, cost_error = verdict
+                if not is_cheap:
+                    logging.warning(f"[CYPHER_QUERY] {cost_error}")
+                    raise RuntimeError(cost_error)
+                records = await execute_graph_tx(session, "cypher", read_work)
             except (ClientError, CypherSyntaxError, ServiceUnavailable) as e:
                 raise RuntimeError(f"Error executing Cypher query: {str(e)}")
 
+    if use_cache:
+        CYPHER_RESULT_CACHE.put(query, params, generation, records, variant=limits)
+    return records
+
+
+NODE_ALIAS_CACHE_SIZE = 4096
+
+# Drops the aliases that became live names again, repoints the aliases of a renamed
+# name and records the new ones (rows: alias, label, target; alias == target only drops)
+NODE_ALIAS_WRITE_QUERY = """
+UNWIND $rows AS row
+OPTIONAL MATCH (live:NodeAlias {alias: row.target, label: row.label})
+DELETE live
+WITH row WHERE row.alias <> row.target
+OPTIONAL MATCH (older:NodeAlias {label: row.label, target: row.alias})
+SET older.target = row.target
+WITH DISTINCT row
+MERGE (a:NodeAlias {alias: row.alias, label: row.label})
+SET a.target = row.target, a.updated_at = datetime()
+"""
+
+
+class NodeAliasTable:
+    """
+    Earlier names of renamed and merged nodes.
+
+    ctx.node_name_mapping only lives as long as one chat session or batch run; the
+    aliases are persisted in the graph as NodeAlias nodes (indexed by
+    node_alias_index.cypher), so a later session that still uses an old name is
+    resolved to the node's current name. An in-process LRU sits in front of the
+    lookups and also remembers names that are not aliases.
+    """
+
+    def __init__(self, maxsize: int = NODE_ALIAS_CACHE_SIZE):
+        self.maxsize = maxsize
+        # alias -> [(label, target), ...], [] if the name is no alias
+        self._cache: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.resolved = 0
+
+    def get(self, alias: str) -> Optional[List[Tuple[str, str]]]:
+        entries = self._cache.get(alias)
+        if entries is None:
+            self.misses += 1
+            return None
+        self._cache.move_to_end(alias)
+        self.hits += 1
+        return entries
+
+    def put(self, alias: str, entries: List[Tuple[str, str]]) -> None:
+        self._cache[alias] = entries
+        self._cache.move_to_end(alias)
+        while len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def record(self, rows: List[Dict[str, str]]) -> None:
+        """Applies rows written with NODE_ALIAS_WRITE_QUERY to the cached entries."""
+        for row in rows:
+            label, alias, target = row["label"], row["alias"], row["target"]
+            if target in self._cache:
+                self._cache[target] = [e for e in self._cache[target] if e[0] != label]
+            if alias == target:
+                continue
+            for key, entries in self._cache.items():
+                self._cache[key] = [(l, target if l == label and t == alias else t)
+                                    for l, t in entries]
+            entries = [e for e in self._cache.get(alias, []) if e[0] != label]
+            self.put(alias, entries + [(label, target)])
+
+    async def lookup(self, ctx: GraphOpsCtx, alias: str) -> List[Tuple[str, str]]:
+        entries = self.get(alias)
+        if entries is not None:
+            return entries
+
+        async def read_aliases(tx: AsyncTransaction):
+            result = await tx.run(
+                "MATCH (a:NodeAlias {alias: $alias}) RETURN a.label AS label, a.target AS target",
+                {"alias": alias})
+            return await result.data()
+
+        async with ctx.session() as session:
+            async with ctx.lock.read():
+                rows = await execute_graph_tx(session, "cypher", read_aliases)
+        entries = [(row["label"], row["target"]) for row in rows]
+        self.put(alias, entries)
+        return entries
+
+    async def resolve(self, ctx: GraphOpsCtx, alias: str,
+                      labels: Optional[List[str]] = None) -> Optional[str]:
+        """The current name for an alias of a node with one of the labels, None if unknown or ambiguous."""
+        targets = {target for label, target in await self.lookup(ctx, alias)
+                   if labels is None or label in labels}
+        if len(targets) != 1:
+            return None
+        self.resolved += 1
+        return targets.pop()
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "resolved": self.resolved,
+        }
+
+
+NODE_ALIASES = NodeAliasTable()
+
+
+async def _record_node_aliases(tx: AsyncTransaction, rows: List[Dict[str, str]]) -> None:
+    if rows:
+        await tx.run(NODE_ALIAS_WRITE_QUERY, {"rows": rows})
+
+
+async def resolve_node_name(ctx: GraphOpsCtx, name: str,
+                            labels: Optional[List[str]] = None) -> str:
+    """
+    The name a node is known by now: through ctx.node_name_mapping, else through
+    NODE_ALIASES unless a node with the name is known to exist (NAME_LABEL_INDEX or
+    the write buffer). Returns the name itself if it is no alias.
+    """
+    if name in ctx.node_name_mapping:
+        return ctx.node_name_mapping[name]
+    if name in NAME_LABEL_INDEX or (ctx.write_buffer is not None
+                                    and ctx.write_buffer.node_labels(name)):
+        return name
+    target = await NODE_ALIASES.resolve(ctx, name, labels)
+    if target is None:
+        return name
+    logging.info(f"[NODE_ALIAS] {name} -> {target}")
+    ctx.node_name_mapping[name] = target
+    return target
+
+
+# Node types that are deduplicated semantically on create (see core_smart_upsert)
+SMART_UPSERT_NODE_TYPES = [
+    "Convergence", "Capability", "Milestone", "Trend", "Idea", "Bet", "LTC", "LAC"
+]
+
+EMTECH_REFUSAL = "Do not create new EmTech type nodes. EmTechs are reference data, use existing ones."
+
 
 async def core_create_node(ctx: GraphOpsCtx,
                            node_type: str,
@@ -193,10 +1598,7 @@ async def core_create_node(ctx: GraphOpsCtx,
     )
     extra_props = parse_date_properties(properties) if properties else {}
 
-    if node_type in [
-            "Convergence", "Capability", "Milestone", "Trend", "Idea", "Bet", "LTC",
-            "LAC"
-    ]:
+    if node_type in SMART_UPSERT_NODE_TYPES:
         if groq_client is None or openai_embedding_client is None:
             raise ValueError(
                 "groq_client and openai_embedding_client are required for smart_upsert node types"
@@ -205,7 +1607,7 @@ async def core_create_node(ctx: GraphOpsCtx,
                                        groq_client, openai_embedding_client,
                                        extra_props)
     elif node_type == "EmTech":
-        return "Do not create new EmTech type nodes. EmTechs are reference data, use existing ones."
+        return EMTECH_REFUSAL
     else:
         return await core_merge_node(ctx, node_type, name, description, extra_props)
 
@@ -216,136 +1618,512 @@ class CompareResult(BaseModel):
     description: Optional[str] = None
 
 
+# SQLite file of the dedup verdict cache, relative to the working directory; None disables it
+DEDUP_VERDICT_CACHE_PATH = "dedup_verdicts.sqlite"
+
+
+class DedupVerdictCache:
+    """
+    Persistent cache of LLM dedup verdicts (CompareResult) keyed by a hash of the
+    existing node's name and description and the incoming node's name and description.
+
+    Sources repeat stories, so batch runs keep comparing the same pairs; a cached
+    verdict is reused instead of asking the LLM again. A verdict is only valid for the
+    description it was given, so the entries of a node are evicted when its stored
+    description changes: explicitly via evict_node after an update, and lazily when the
+    node is looked up with a description that differs from the cached one.
+    """
+
+    def __init__(self, path: Optional[str] = DEDUP_VERDICT_CACHE_PATH):
+        self.path = path
+        self._conn = None
+        self.reset_stats()
+
+    def _connect(self):
+        if self._conn is None and self.path:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS verdicts (
+                    key TEXT PRIMARY KEY,
+                    old_name TEXT NOT NULL,
+                    old_description_hash TEXT NOT NULL,
+                    verdict TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )""")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS verdicts_old_name ON verdicts (old_name)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def _hash(*parts: str) -> str:
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    def get(self, old_name: str, old_description: str, name: str,
+            description: str) -> Optional[CompareResult]:
+        conn = self._connect()
+        if conn is None:
+            return None
+        key = self._hash(old_name, old_description, name, description)
+        row = conn.execute("SELECT verdict FROM verdicts WHERE key = ?", (key, )).fetchone()
+        if row is not None:
+            self.hits += 1
+            return CompareResult.model_validate_json(row[0])
+        self.misses += 1
+        # verdicts about an older description of this node can never be hit again
+        evicted = conn.execute(
+            "DELETE FROM verdicts WHERE old_name = ? AND old_description_hash != ?",
+            (old_name, self._hash(old_description))).rowcount
+        if evicted:
+            self.evictions += evicted
+            conn.commit()
+        return None
+
+    def put(self, old_name: str, old_description: str, name: str, description: str,
+            result: CompareResult) -> None:
+        conn = self._connect()
+        if conn is None:
+            return
+        conn.execute(
+            "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?)",
+            (self._hash(old_name, old_description, name, description), old_name,
+             self._hash(old_description), result.model_dump_json(), time.time()))
+        conn.commit()
+
+    def evict_node(self, old_name: str) -> None:
+        """Drops the verdicts about a node whose name or description was just changed."""
+        conn = self._connect()
+        if conn is None:
+            return
+        self.evictions += conn.execute("DELETE FROM verdicts WHERE old_name = ?",
+                                       (old_name, )).rowcount
+        conn.commit()
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.llm_calls_saved = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "llm_calls_saved": self.llm_calls_saved,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+DEDUP_VERDICT_CACHE = DedupVerdictCache()
+
+
+COMPARE_PROMPT = (
+    "Determine whether the following two nodes represent the same concept by carefully comparing their names and descriptions. "
+    "Reason step by step: First, analyze similarities in meaning. Second, decide if they are semantically identical. "
+    "If they are the same, provide an improved short name (combining the best aspects) and a merged description (concise, comprehensive, avoiding redundancy). "
+    "If different, just indicate they are different. "
+    "Always output only a JSON object with keys: different (boolean), and optionally name (string) and description (string) if not different."
+)
+
+
+async def _compare_nodes(groq_client, old_name: str, old_desc: str, name: str,
+                         description: str) -> Optional[CompareResult]:
+    """
+    Asks the LLM whether an existing node (A) and a new node (B) are the same concept.
+    Returns None if the response could not be parsed.
+    """
+    completion = await groq_client.chat.completions.create(
+        model="openai/gpt-oss-120b",
+        messages=[
+            {
+                "role": "system",
+                "content": COMPARE_PROMPT,
+            },
+            {
+                "role":
+                "user",
+                "content":
+                f"Node A name: {old_name}\nNode A description: {old_desc}\n\n"
+                f"Node B name: {name}\nNode B description: {description}"
+            },
+        ],
+        stream=False,
+        reasoning_effort="low",
+        # reasoning_format="hidden",
+        temperature=0.2,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "compare_result",
+                "description": "Result of comparing two nodes.",
+                "schema": CompareResult.model_json_schema(),
+            }
+        },
+    )
+
+    try:
+        return CompareResult.model_validate_json(
+            completion.choices[0].message.content)
+    except Exception as e:
+        logging.error(f"Failed to parse LLM response: {e}")
+        logging.error(
+            f"LLM response: {completion.choices[0].message.content}"
+        )
+        return None
+
+
+# How candidates of core_smart_upsert are judged: "batch" asks about all of them in
+# one LLM request, "pairwise" asks about one candidate at a time
+DEDUP_JUDGE_MODE = "batch"
+# A batch verdict below this confidence is re-checked pairwise if DEDUP_JUDGE_FALLBACK is set
+DEDUP_JUDGE_MIN_CONFIDENCE = 0.7
+DEDUP_JUDGE_FALLBACK = True
+
+
+class JudgeResult(BaseModel):
+    match: Optional[int] = None
+    confidence: float
+    name: Optional[str] = None
+    description: Optional[str] = None
+
+
+JUDGE_PROMPT = (
+    "A new node (B) is about to be added to a knowledge graph that already contains the numbered candidate nodes. "
+    "Determine whether one of the candidates represents the same concept as node B by carefully comparing names and descriptions. "
+    "Reason step by step: First, analyze similarities in meaning. Second, decide if one candidate is semantically identical to node B. "
+    "If one is, set match to its number and provide an improved short name (combining the best aspects) and a merged description (concise, comprehensive, avoiding redundancy). "
+    "If none is, set match to null. "
+    "Set confidence to a number between 0 and 1 expressing how certain you are of the verdict. "
+    "Always output only a JSON object with keys: match (integer or null), confidence (number), and optionally name (string) and description (string) if there is a match."
+)
+
+
+async def _judge_candidates(groq_client, candidates: List[Dict[str, Any]], name: str,
+                            description: str) -> Optional[JudgeResult]:
+    """
+    Asks the LLM in one request which of the candidates, if any, is the same concept as
+    the new node. Returns None if the response could not be parsed or names no valid candidate.
+    """
+    listing = "\n\n".join(
+        f"Candidate {i} name: {sim['name']}\nCandidate {i} description: {sim['description']}"
+        for i, sim in enumerate(candidates))
+    completion = await groq_client.chat.completions.create(
+        model="openai/gpt-oss-120b",
+        messages=[
+            {
+                "role": "system",
+                "content": JUDGE_PROMPT,
+            },
+            {
+                "role":
+                "user",
+                "content":
+                f"{listing}\n\n"
+                f"Node B name: {name}\nNode B description: {description}"
+            },
+        ],
+        stream=False,
+        reasoning_effort="low",
+        temperature=0.2,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "judge_result",
+                "description": "Which candidate node, if any, is the same as the new node.",
+                "schema": JudgeResult.model_json_schema(),
+            }
+        },
+    )
+
+    try:
+        result = JudgeResult.model_validate_json(
+            completion.choices[0].message.content)
+    except Exception as e:
+        logging.error(f"Failed to parse LLM response: {e}")
+        logging.error(
+            f"LLM response: {completion.choices[0].message.content}"
+        )
+        return None
+    if result.match is not None and not 0 <= result.match < len(candidates):
+        logging.error(f"LLM judge named candidate {result.match} of {len(candidates)}")
+        return None
+    return result
+
+
+async def _find_same_node(groq_client,
+                          candidates: List[Dict[str, Any]],
+                          name: str,
+                          description: str,
+                          judge_mode: str = None,
+                          fallback: bool = None) -> Optional[tuple]:
+    """
+    Finds the candidate (a dict with name and description, best first) that is the
+    same concept as the new node.
+
+    Returns:
+        (candidate, CompareResult) for the matching candidate, or None if there is none.
+    """
+    judge_mode = judge_mode or DEDUP_JUDGE_MODE
+    fallback = DEDUP_JUDGE_FALLBACK if fallback is None else fallback
+    cache = DEDUP_VERDICT_CACHE
+    batch = judge_mode == "batch" and len(candidates) > 1
+
+    cached = [cache.get(sim['name'], sim['description'], name, description)
+              for sim in candidates]
+    # the cache settles it if a candidate is known to match and every better one is known to differ
+    for position, (sim, verdict) in enumerate(zip(candidates, cached)):
+        if verdict is None:
+            break
+        if not verdict.different:
+            cache.llm_calls_saved += 1 if batch else position + 1
+            return sim, verdict
+    else:
+        cache.llm_calls_saved += 1 if batch else len(candidates)
+        return None
+
+    # only the candidates without a verdict that rank above the best known match are
+    # judged; the known match stands unless one of them is the same
+    unknown = []
+    known_same = None
+    for sim, verdict in zip(candidates, cached):
+        if verdict is None:
+            unknown.append(sim)
+        elif not verdict.different:
+            known_same = (sim, verdict)
+            break
+    if not batch:
+        cache.llm_calls_saved += len(candidates) - len(unknown)
+
+    # with a single candidate the pairwise prompt is one request as well
+    if batch and len(unknown) > 1:
+        verdict = await _judge_candidates(groq_client, unknown, name, description)
+        if verdict is not None and (verdict.confidence >= DEDUP_JUDGE_MIN_CONFIDENCE
+                                    or not fallback):
+            if verdict.match is None:
+                if verdict.confidence >= DEDUP_JUDGE_MIN_CONFIDENCE:
+                    for sim in unknown:
+                        cache.put(sim['name'], sim['description'], name, description,
+                                  CompareResult(different=True))
+                return known_same
+            result = CompareResult(different=False, name=verdict.name,
+                                   description=verdict.description)
+            sim = unknown[verdict.match]
+            cache.put(sim['name'], sim['description'], name, description, result)
+            return sim, result
+        if not fallback:
+            return known_same
+        logging.info(
+            f"[CREATE_NODE] Low-confidence judge verdict for {name} "
+            f"({verdict.confidence if verdict else 'unparsed'}), checking candidates pairwise")
+
+    for sim in unknown:
+        result = await _compare_nodes(groq_client, sim['name'], sim['description'],
+                                      name, description)
+        if result is not None:
+            cache.put(sim['name'], sim['description'], name, description, result)
+            if not result.different:
+                return sim, result
+    return known_same
+
+
+# Vector score at or above which a candidate is merged without asking the LLM
+DEDUP_AUTO_MERGE_SCORE = 0.97
+
+# How incoming smart upsert nodes were resolved: "exact" (same name), "normalized"
+# (same normalize_node_name key), "vector" (auto-merged on score), "llm" (judged the
+# same by the LLM) or "new"; everything but "llm" and "new" avoided the LLM
+DEDUP_TIER_METRICS: Counter = Counter()
+
+_NAME_SEPARATOR_RE = re.compile(r"[\s_-]+")
+
+
+def normalize_node_name(name: str) -> str:
+    """
+    Normalized name key used to recognize re-mentions of a node under a differently
+    written name: case-folded, with runs of whitespace, hyphens and underscores folded
+    to one space, e.g. "Humanoid Robots" and "humanoid-robots" both become
+    "humanoid robots". Other punctuation is kept ("C++", "C#" and "C" stay apart), and
+    plurals are left to the vector and LLM tiers.
+    """
+    return _NAME_SEPARATOR_RE.sub(" ", name.casefold()).strip()
+
+
+async def _match_names(tx: AsyncTransaction, node_type: str,
+                       rows: List[Dict[str, Any]]) -> Dict[int, tuple]:
+    """
+    Dedup tiers 1 and 2: looks up existing nodes by exact name and by name_key.
+    rows are dicts with idx, name and name_key.
+
+    Returns:
+        dict: idx -> (tier, existing node name) for the rows that matched.
+    """
+    query = f"""
+    UNWIND $rows AS row
+    OPTIONAL MATCH (exact:`{node_type}` {{name: row.name}})
+    OPTIONAL MATCH (similar:`{node_type}` {{name_key: row.name_key}})
+    WITH row, exact, collect(similar.name) AS normalized
+    RETURN row.idx AS idx, row.name_key AS name_key, exact.name AS exact, normalized
+    """
+    result = await tx.run(query, {"rows": rows})
+    matches = {}
+    for record in await result.data():
+        if record["exact"] is not None:
+            matches[record["idx"]] = ("exact", record["exact"])
+            continue
+        # keys written by an older normalize_node_name are checked against the name
+        normalized = [similar for similar in record["normalized"]
+                      if normalize_node_name(similar) == record["name_key"]]
+        if normalized:
+            matches[record["idx"]] = ("normalized", normalized[0])
+    return matches
+
+
+def _match_candidates(name_key: str, candidates: List[Dict[str, Any]]) -> Optional[tuple]:
+    """
+    Dedup tiers 2 and 3 on the vector candidates (best first): a candidate with the same
+    normalized name (nodes written before name_key existed), else a score high enough
+    to merge without the LLM.
+
+    Returns:
+        (tier, candidate) or None if the candidates are in the gray zone for the LLM.
+    """
+    for sim in candidates:
+        if normalize_node_name(sim["name"]) == name_key:
+            return "normalized", sim
+    if candidates and candidates[0]["score"] >= DEDUP_AUTO_MERGE_SCORE:
+        return "vector", candidates[0]
+    return None
+
+
 async def core_smart_upsert(ctx: GraphOpsCtx, node_type: str, name: str,
                             description: str, groq_client,
                             openai_embedding_client,
                             extra_props: Optional[Dict[str, Any]] = None) -> str:
     """
-    Performs a smart UPSERT for a node in Neo4j.
-    - Queries for similar nodes based on description embedding similarity >= 0.8 (top 100 candidates, filtered).
-    - Uses the Grok4 LLM with structured outputs to determine if any candidate
-      is semantically the same based on name and description.
-    - If the same, the LLM also returns an improved name and a merged
-      description which are then used to update the node.
-    - If no match is found, creates a new node.
-    - Returns the node's name.
+    Performs a smart UPSERT for a node in Neo4j, resolving duplicates in tiers and
+    stopping at the first tier that finds the node (see DEDUP_TIER_METRICS):
+    1. a node of the same type with the exact name,
+    2. a node with the same normalized name key (see normalize_node_name),
+    3. a similar node by description embedding (similarity >= 0.8, top 100 candidates,
+       filtered) scoring at least DEDUP_AUTO_MERGE_SCORE,
+    4. the LLM with structured outputs for the remaining candidates; all candidates are
+       judged in one request (see DEDUP_JUDGE_MODE), re-checked pairwise when the
+       verdict is low-confidence. The LLM also returns an improved name and a merged
+       description which are then used to update the node.
+    Nodes found by tiers 1-3 keep their name and description. If no match is found,
+    creates a new node. Returns the node's name.
     """
-    index_name = f"{node_type.lower()}_description_embeddings"
+    index_name = vector_index_name(node_type)
+    extra = extra_props or {}
+    extra_set = "".join(f", n.{k} = ${k}" for k in extra)
+    embedding_set = "".join(f", n.{k} = ${k}" for k in EMBEDDING_PROPERTIES)
+    embedding_create = "".join(f", {k}: ${k}" for k in EMBEDDING_PROPERTIES)
+    name_key = normalize_node_name(name)
 
     try:
-        # Generate embedding for the new description
-        emb_response = await openai_embedding_client.embeddings.create(
-            model=EMBEDDING_MODEL, input=description)
-        new_embedding = emb_response.data[0].embedding
-
-        # Query for similar nodes
-        similar_query = """
-        CALL db.index.vector.queryNodes($index_name, 100, $vector)
-        YIELD node, score
-        WHERE score >= 0.8
-        RETURN node.name AS name, node.description AS description, score
-        ORDER BY score DESC
-        LIMIT 10
-        """
-        params = {"index_name": index_name, "vector": new_embedding}
-
-        async with ctx.neo4jdriver.session() as session:
+        async with ctx.session() as session:
 
-            async def read_similar(tx: AsyncTransaction):
-                result = await tx.run(similar_query, params)
-                return await result.data()
+            async def read_by_name(tx: AsyncTransaction):
+                return await _match_names(tx, node_type, [{"idx": 0, "name": name, "name_key": name_key}])
 
-            async with ctx.lock:
-                similar_nodes = await session.execute_read(read_similar)
+            async with ctx.lock.read():
+                name_matches = await execute_graph_tx(session, "cypher", read_by_name)
 
-            found_same_name = None
+            tier, found_same_name = name_matches.get(0, (None, None))
             updated_name = name
             updated_description = description
-            for sim in similar_nodes:
-                old_name = sim['name']
-                old_desc = sim['description']
-
-                compare_prompt = (
-                    "Determine whether the following two nodes represent the same concept by carefully comparing their names and descriptions. "
-                    "Reason step by step: First, analyze similarities in meaning. Second, decide if they are semantically identical. "
-                    "If they are the same, provide an improved short name (combining the best aspects) and a merged description (concise, comprehensive, avoiding redundancy). "
-                    "If different, just indicate they are different. "
-                    "Always output only a JSON object with keys: different (boolean), and optionally name (string) and description (string) if not different."
-                )
+            new_embedding = None
+
+            if found_same_name is None:
+                # Generate embedding for the new description
+                new_embedding = (await embed_texts(openai_embedding_client, [description]))[0]
+
+                # Query for similar nodes
+                similar_query = """
+                CALL db.index.vector.queryNodes($index_name, 100, $vector)
+                YIELD node, score
+                WHERE score >= 0.8
+                RETURN node.name AS name, node.description AS description, score
+                ORDER BY score DESC
+                LIMIT 10
+                """
+                params = {"index_name": index_name, "vector": truncate_embedding(new_embedding)}
 
-                completion = await groq_client.chat.completions.create(
-                    model="openai/gpt-oss-120b",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": compare_prompt,
-                        },
-                        {
-                            "role":
-                            "user",
-                            "content":
-                            f"Node A name: {old_name}\nNode A description: {old_desc}\n\n"
-                            f"Node B name: {name}\nNode B description: {description}"
-                        },
-                    ],
-                    stream=False,
-                    reasoning_effort="low",
-                    # reasoning_format="hidden",
-                    temperature=0.2,
-                    response_format={
-                        "type": "json_schema",
-                        "json_schema": {
-                            "name": "compare_result",
-                            "description": "Result of comparing two nodes.",
-                            "schema": CompareResult.model_json_schema(),
-                        }
-                    },
-                )
+                async def read_similar(tx: AsyncTransaction):
+                    result = await tx.run(similar_query, params)
+                    return await result.data()
 
-                try:
-                    result = CompareResult.model_validate_json(
-                        completion.choices[0].message.content)
+                async with ctx.lock.read():
+                    similar_nodes = await execute_graph_tx(session, "vector", read_similar)
 
-                    if not result.different:
-                        found_same_name = old_name
-                        updated_name = result.name or old_name
+                resolved = _match_candidates(name_key, similar_nodes)
+                if resolved is not None:
+                    tier, sim = resolved
+                    found_same_name = sim['name']
+                else:
+                    same = await _find_same_node(groq_client, similar_nodes, name, description)
+                    if same is not None:
+                        sim, result = same
+                        tier = "llm"
+                        found_same_name = sim['name']
+                        updated_name = result.name or sim['name']
                         updated_description = result.description or description
-                        break
+            DEDUP_TIER_METRICS[tier or "new"] += 1
 
-                except Exception as e:
-                    logging.error(f"Failed to parse LLM response: {e}")
-                    logging.error(
-                        f"LLM response: {completion.choices[0].message.content}"
-                    )
+            if found_same_name and tier != "llm":
+                logging.info(
+                    f"[CREATE_NODE] Found node {found_same_name} for: {name} by {tier} match")
 
-            extra = extra_props or {}
-            extra_set = "".join(f", n.{k} = ${k}" for k in extra)
+                # The node stays as it is, apart from the extra props
+                update_query = f"""
+                MATCH (n:`{node_type}` {{name: $node_name}})
+                SET n.name_key = $name_key{extra_set}
+                RETURN n.name AS name
+                """
+                update_params = {
+                    "node_name": found_same_name,
+                    "name_key": normalize_node_name(found_same_name),
+                    **extra
+                }
 
-            if found_same_name:
+            elif found_same_name:
                 logging.info(
                     f"[CREATE_NODE] Found semantically equivalent node to: {name}; "
                     f"updating the node with name: {updated_name} "
                     f"and description: {updated_description}")
 
                 # Generate new embedding for the updated description
-                updated_emb_response = await openai_embedding_client.embeddings.create(
-                    model=EMBEDDING_MODEL, input=updated_description)
-                updated_embedding = updated_emb_response.data[0].embedding
+                updated_embedding = (await embed_texts(openai_embedding_client,
+                                                       [updated_description]))[0]
 
                 # Update the existing node with new name, description, embedding, and extra props
                 update_query = f"""
                 MATCH (n:`{node_type}` {{name: $node_name}})
-                SET n.name = $name, n.description = $description, n.embedding = $embedding{extra_set}
+                SET n.name = $name, n.name_key = $name_key, n.description = $description{embedding_set}{extra_set}
                 RETURN n.name AS name
                 """
                 update_params = {
                     "node_name": found_same_name,
                     "name": updated_name,
+                    "name_key": normalize_node_name(updated_name),
                     "description": updated_description,
-                    "embedding": updated_embedding,
+                    **embedding_props(updated_embedding),
                     **extra
                 }
 
+            if found_same_name:
+
+                alias_rows = [{"alias": alias, "label": node_type, "target": updated_name
+                               if tier == "llm" else found_same_name}
+                              for alias in dict.fromkeys([name, found_same_name])]
+
                 async def write_update(tx: AsyncTransaction):
                     result = await tx.run(update_query, update_params)
                     records = await result.data()
@@ -353,10 +2131,17 @@ async def core_smart_upsert(ctx: GraphOpsCtx, node_type: str, name: str,
                         raise RuntimeError(
                             f"Failed to update node with name: {found_same_name}"
                         )
+                    await _record_node_aliases(tx, alias_rows)
                     return records[0]['name']
 
-                async with ctx.lock:
-                    actual_name = await session.execute_write(write_update)
+                async with ctx.lock.write():
+                    actual_name = await execute_graph_tx(session, "write", write_update, write=True)
+                    bump_graph_generation()
+                    NAME_LABEL_INDEX.rename(found_same_name, actual_name, node_type)
+                    NODE_ALIASES.record(alias_rows)
+                    if tier == "llm":
+                        _mirror_embedding(node_type, found_same_name, actual_name, updated_embedding)
+                        DEDUP_VERDICT_CACHE.evict_node(found_same_name)
                     # Store the mapping from original name to actual name
                     ctx.node_name_mapping[name] = actual_name
                     return actual_name
@@ -370,24 +2155,33 @@ async def core_smart_upsert(ctx: GraphOpsCtx, node_type: str, name: str,
                 # Build create query including any extra props
                 extra_create = "".join(f", {k}: ${k}" for k in extra)
                 create_query = f"""
-                CREATE (n:`{node_type}` {{name: $name, description: $description, embedding: $embedding{extra_create}}})
+                CREATE (n:`{node_type}` {{name: $name, name_key: $name_key, description: $description{embedding_create}{extra_create}}})
                 RETURN n.name AS name
                 """
                 create_params = {
                     "name": name,
+                    "name_key": name_key,
                     "description": description,
-                    "embedding": new_embedding,
+                    **embedding_props(new_embedding),
                     **extra
                 }
 
+                # the name is no alias anymore
+                alias_rows = [{"alias": name, "label": node_type, "target": name}]
+
                 async def write_create(tx: AsyncTransaction):
                     result = await tx.run(create_query, create_params)
                     records = await result.data()
                     if not records:
                         raise RuntimeError("Failed to create new node")
+                    await _record_node_aliases(tx, alias_rows)
                     return records[0]['name']
-                async with ctx.lock:
-                    actual_name = await session.execute_write(write_create)
+                async with ctx.lock.write():
+                    actual_name = await execute_graph_tx(session, "write", write_create, write=True)
+                    bump_graph_generation()
+                    NAME_LABEL_INDEX.put(actual_name, node_type)
+                    NODE_ALIASES.record(alias_rows)
+                    _mirror_embedding(node_type, None, actual_name, new_embedding)
                     # Store the mapping from original name to actual name (in case of future updates)
                     ctx.node_name_mapping[name] = actual_name
                     return actual_name
@@ -403,6 +2197,7 @@ async def core_merge_node(ctx: GraphOpsCtx, node_type: str, name: str,
     Performs a simple MERGE operation to create or match a node in Neo4j with the given type, name, and description.
     If a node with the same name and type exists, it updates the description; otherwise, it creates a new node.
     Returns the name of the matched or created node as a string.
+    In batch mode (ctx.write_buffer set) the merge is only buffered.
 
     Args:
         node_type (str): The type/label of the node (e.g., 'EmTech', 'Capability', 'Party').
@@ -428,7 +2223,14 @@ async def core_merge_node(ctx: GraphOpsCtx, node_type: str, name: str,
 
     params = {"name": name, "description": description, **extra}
 
-    async with ctx.neo4jdriver.session() as session:
+    if ctx.write_buffer is not None:
+        ctx.write_buffer.add_node(node_type, name, {"description": description, **extra})
+        logging.info(f"[CREATE_NODE] buffered merge: type: {node_type}\nname: {name}")
+        ctx.node_name_mapping[name] = name
+        await _schedule_flush(ctx)
+        return name
+
+    async with ctx.session() as session:
 
         async def write_work(tx: AsyncTransaction):
             result = await tx.run(query, params)
@@ -437,9 +2239,11 @@ async def core_merge_node(ctx: GraphOpsCtx, node_type: str, name: str,
                 raise RuntimeError("Failed to merge node")
             return records[0]["node_name"]
 
-        async with ctx.lock:
+        async with ctx.lock.write():
             try:
-                node_name = await session.execute_write(write_work)
+                node_name = await execute_graph_tx(session, "write", write_work, write=True)
+                bump_graph_generation()
+                NAME_LABEL_INDEX.put(node_name, node_type)
                 logging.info(
                     f"[CREATE_NODE] merged: type: {node_type}\nname: {name}\n description: {description}"
                 )
@@ -451,6 +2255,385 @@ async def core_merge_node(ctx: GraphOpsCtx, node_type: str, name: str,
                 raise RuntimeError(f"Failed to merge node: {str(e)}")
 
 
+# Concurrent LLM comparisons in core_smart_upsert_many
+SMART_UPSERT_COMPARE_CONCURRENCY = 8
+
+def _cosine_similarity(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = sum(x * x for x in a) ** 0.5
+    norm_b = sum(y * y for y in b) ** 0.5
+    if not norm_a or not norm_b:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def _similar_pairs(vectors: List[List[float]], threshold: float) -> List[Tuple[int, int]]:
+    """similar_pairs of vector_mirror, or a pairwise comparison in Python without numpy."""
+    if ANN_AVAILABLE:
+        return similar_pairs(vectors, threshold)
+    return [(i, j) for j in range(len(vectors)) for i in range(j)
+            if _cosine_similarity(vectors[i], vectors[j]) >= threshold]
+
+
+async def core_smart_upsert_many(ctx: GraphOpsCtx,
+                                 items: List[Dict[str, Any]],
+                                 groq_client=None,
+                                 openai_embedding_client=None) -> Dict[str, str]:
+    """
+    Creates or updates a batch of nodes with the same semantics as core_create_node,
+    in a fixed number of round trips instead of several per node:
+    - all names are looked up (dedup tiers 1 and 2) in one read transaction,
+    - all remaining descriptions are embedded in one OpenAI request,
+    - the candidates of every item are looked up in one UNWIND vector query,
+    - the LLM comparisons of different items run concurrently,
+    - merged descriptions are re-embedded in one request,
+    - all creates, updates and merges are written in one transaction (in batch mode
+      the merges of plain node types are buffered in ctx.write_buffer instead).
+    Items of the batch are also deduplicated against each other: an item with the
+    same type and name as an earlier one, or judged the same concept as an earlier
+    one, is folded into it.
+
+    Args:
+        items (list): Dicts with node_type, name, description and optional properties.
+        groq_client: Client for the comparison LLM (required for smart upsert node types).
+        openai_embedding_client: Client for embeddings (required for smart upsert node types).
+
+    Returns:
+        dict: Maps the name of every item to the name of the node it was written to
+        (or to an explanation if the item was refused).
+
+    Raises:
+        RuntimeError: If the batch could not be written; nothing is written then.
+    """
+    entries = []
+    for item in items:
+        properties = item.get("properties")
+        entries.append({
+            "node_type": item["node_type"],
+            "name": item["name"],
+            "description": item["description"],
+            "extra": parse_date_properties(properties) if properties else {},
+        })
+    logging.info(f"[CREATE_NODES] {len(entries)} items")
+
+    mapping: Dict[str, str] = {}
+    # index of the entry an entry is folded into; roots map to themselves
+    folded_into: Dict[int, int] = {}
+    first_by_key: Dict[tuple, int] = {}
+    smart, plain = [], []
+    for i, entry in enumerate(entries):
+        key = (entry["node_type"], entry["name"])
+        if entry["node_type"] == "EmTech":
+            mapping[entry["name"]] = EMTECH_REFUSAL
+        elif key in first_by_key:
+            folded_into[i] = first_by_key[key]
+        else:
+            first_by_key[key] = i
+            folded_into[i] = i
+            if entry["node_type"] in SMART_UPSERT_NODE_TYPES:
+                smart.append(i)
+            else:
+                plain.append(i)
+
+    def root(i: int) -> int:
+        while folded_into[i] != i:
+            i = folded_into[i]
+        return i
+
+    # existing node name each smart entry updates, if any
+    update_of: Dict[int, str] = {}
+
+    if smart:
+        if groq_client is None or openai_embedding_client is None:
+            raise ValueError(
+                "groq_client and openai_embedding_client are required for smart_upsert node types"
+            )
+        # dedup tiers 1 and 2 by name, before anything is embedded
+        rows_by_type: Dict[str, List[Dict[str, Any]]] = {}
+        for i in smart:
+            entries[i]["name_key"] = normalize_node_name(entries[i]["name"])
+            rows_by_type.setdefault(entries[i]["node_type"], []).append(
+                {"idx": i, "name": entries[i]["name"], "name_key": entries[i]["name_key"]})
+
+        async with ctx.session() as session:
+
+            async def read_by_name(tx: AsyncTransaction):
+                name_matches = {}
+                for node_type, rows in rows_by_type.items():
+                    name_matches.update(await _match_names(tx, node_type, rows))
+                return name_matches
+
+            async with ctx.lock.read():
+                name_matches = await execute_graph_tx(session, "cypher", read_by_name)
+
+        matched_by_existing: Dict[tuple, int] = {}
+
+        def use_existing(i: int, tier: str, existing_name: str) -> bool:
+            DEDUP_TIER_METRICS[tier] += 1
+            key = (entries[i]["node_type"], existing_name)
+            if key in matched_by_existing:
+                # an earlier item of the batch already updates this node
+                folded_into[i] = matched_by_existing[key]
+                return False
+            matched_by_existing[key] = i
+            update_of[i] = existing_name
+            entries[i]["tier"] = tier
+            logging.info(
+                f"[CREATE_NODES] Found node {existing_name} for: {entries[i]['name']} by {tier} match")
+            return True
+
+        for i, (tier, existing_name) in name_matches.items():
+            use_existing(i, tier, existing_name)
+        probed = [i for i in smart if i not in name_matches]
+
+        if probed:
+            embeddings = await embed_texts(openai_embedding_client,
+                                           [entries[i]["description"] for i in probed])
+            for i, embedding in zip(probed, embeddings):
+                entries[i]["embedding"] = embedding
+
+            similar_query = """
+            UNWIND $probes AS probe
+            CALL db.index.vector.queryNodes(probe.index_name, 100, probe.vector)
+            YIELD node, score
+            WITH probe, node, score
+            WHERE score >= 0.8
+            ORDER BY score DESC
+            WITH probe, collect({name: node.name, description: node.description, score: score})[..10] AS similar
+            RETURN probe.idx AS idx, similar
+            """
+            probes = [{
+                "idx": i,
+                "index_name": vector_index_name(entries[i]["node_type"]),
+                "vector": truncate_embedding(entries[i]["embedding"]),
+            } for i in probed]
+
+            async with ctx.session() as session:
+
+                async def read_similar(tx: AsyncTransaction):
+                    result = await tx.run(similar_query, {"probes": probes})
+                    return await result.data()
+
+                async with ctx.lock.read():
+                    records = await execute_graph_tx(session, "vector", read_similar)
+            similar_by_idx = {record["idx"]: record["similar"] for record in records}
+        else:
+            similar_by_idx = {}
+
+        semaphore = asyncio.Semaphore(SMART_UPSERT_COMPARE_CONCURRENCY)
+
+        async def compare(old_name, old_desc, entry) -> Optional[CompareResult]:
+            async with semaphore:
+                return await _compare_nodes(groq_client, old_name, old_desc,
+                                            entry["name"], entry["description"])
+
+        async def match_existing(i: int):
+            candidates = similar_by_idx.get(i, [])
+            if not candidates:
+                return None
+            resolved = _match_candidates(entries[i]["name_key"], candidates)
+            if resolved is not None:
+                return resolved
+            async with semaphore:
+                same = await _find_same_node(groq_client, candidates,
+                                             entries[i]["name"], entries[i]["description"])
+            return None if same is None else ("llm", same)
+
+        matches = await asyncio.gather(*(match_existing(i) for i in probed))
+        unmatched = []
+        for i, match in zip(probed, matches):
+            if match is None:
+                unmatched.append(i)
+                continue
+            tier, found = match
+            if tier != "llm":
+                use_existing(i, tier, found["name"])
+                continue
+            sim, result = found
+            if use_existing(i, tier, sim["name"]):
+                entries[i]["name_out"] = result.name or sim["name"]
+                entries[i]["description_out"] = result.description or entries[i]["description"]
+
+        # items that create new nodes are compared with the earlier ones of the same type
+        by_type: Dict[str, List[int]] = {}
+        for i in unmatched:
+            by_type.setdefault(entries[i]["node_type"], []).append(i)
+        pairs = sorted(((group[a], group[b]) for group in by_type.values()
+                        for a, b in _similar_pairs([entries[i]["embedding"] for i in group], 0.8)),
+                       key=lambda pair: (pair[1], pair[0]))
+        verdicts = await asyncio.gather(*(compare(entries[i]["name"], entries[i]["description"],
+                                                  entries[j]) for i, j in pairs))
+        for (i, j), result in zip(pairs, verdicts):
+            if folded_into[j] != j or result is None or result.different:
+                continue
+            target = root(i)
+            folded_into[j] = target
+            DEDUP_TIER_METRICS["llm"] += 1
+            logging.info(
+                f"[CREATE_NODES] {entries[j]['name']} is the same as {entries[target]['name']} "
+                "in this batch")
+            entries[target]["name_out"] = result.name or entries[target].get("name_out", entries[target]["name"])
+            entries[target]["description_out"] = result.description or entries[target].get(
+                "description_out", entries[target]["description"])
+
+        DEDUP_TIER_METRICS["new"] += sum(1 for i in unmatched if folded_into[i] == i)
+
+        changed = [i for i in smart if folded_into[i] == i and "description_out" in entries[i]]
+        if changed:
+            embeddings = await embed_texts(openai_embedding_client,
+                                           [entries[i]["description_out"] for i in changed])
+            for i, embedding in zip(changed, embeddings):
+                entries[i]["embedding"] = embedding
+
+    # one UNWIND statement per node type and kind of write
+    statements: Dict[tuple, List[Dict[str, Any]]] = {}
+    # in batch mode plain merges go through ctx.write_buffer like core_merge_node, so a
+    # buffered merge of the same node cannot overwrite them at flush time; they are
+    # buffered once the other writes succeeded
+    buffered: Dict[int, Dict[str, Any]] = {}
+    for i in smart + plain:
+        if folded_into[i] != i:
+            continue
+        entry = entries[i]
+        if i in update_of and entry["tier"] != "llm":
+            # found by name or auto-merged: the node stays as it is, apart from the extra props
+            props = {"name_key": normalize_node_name(update_of[i]), **entry["extra"]}
+            kind = "update"
+        else:
+            props = {
+                "name": entry.get("name_out", entry["name"]),
+                "description": entry.get("description_out", entry["description"]),
+                **entry["extra"],
+            }
+            if i in smart:
+                props["name_key"] = normalize_node_name(props["name"])
+                props.update(embedding_props(entry["embedding"]))
+            kind = "update" if i in update_of else "create" if i in smart else "merge"
+        if kind == "merge" and ctx.write_buffer is not None:
+            buffered[i] = {key: value for key, value in props.items() if key != "name"}
+            continue
+        row = {"idx": i, "props": props, "node_name": update_of.get(i, entry["name"])}
+        statements.setdefault((kind, entry["node_type"]), []).append(row)
+
+    write_queries = {
+        "create": "UNWIND $rows AS row CREATE (n:`{label}`) SET n = row.props "
+                  "RETURN row.idx AS idx, n.name AS name",
+        "update": "UNWIND $rows AS row MATCH (n:`{label}` {{name: row.node_name}}) SET n += row.props "
+                  "RETURN row.idx AS idx, n.name AS name",
+        "merge": "UNWIND $rows AS row MERGE (n:`{label}` {{name: row.node_name}}) SET n += row.props "
+                 "RETURN row.idx AS idx, n.name AS name",
+    }
+
+    written: Dict[int, str] = {}
+    alias_rows: List[Dict[str, str]] = []
+    if statements:
+        async def write_batch(tx: AsyncTransaction):
+            names = {}
+            for (kind, label), rows in statements.items():
+                result = await tx.run(write_queries[kind].format(label=label), {"rows": rows})
+                records = await result.data()
+                names.update({record["idx"]: record["name"] for record in records})
+                missing = [row["node_name"] for row in rows if row["idx"] not in names]
+                if missing:
+                    raise RuntimeError(f"Failed to {kind} nodes with name: {', '.join(missing)}")
+            # names the smart nodes were asked for or had before point to their name now
+            aliases = {}
+            for i in smart:
+                target = root(i)
+                for alias in (entries[i]["name"], update_of.get(target)):
+                    if alias is not None:
+                        aliases[(alias, entries[i]["node_type"])] = names[target]
+            alias_rows[:] = [{"alias": alias, "label": label, "target": target}
+                             for (alias, label), target in aliases.items()]
+            await _record_node_aliases(tx, alias_rows)
+            return names
+
+        async with ctx.session() as session:
+            async with ctx.lock.write():
+                try:
+                    written = await execute_graph_tx(session, "write", write_batch, write=True)
+                    bump_graph_generation()
+                    for i, old_name in update_of.items():
+                        if entries[i]["tier"] == "llm":
+                            DEDUP_VERDICT_CACHE.evict_node(old_name)
+                    for i, node_name in written.items():
+                        NAME_LABEL_INDEX.rename(update_of.get(i, node_name), node_name,
+                                                entries[i]["node_type"])
+                        if i in smart and (i not in update_of or entries[i]["tier"] == "llm"):
+                            _mirror_embedding(entries[i]["node_type"], update_of.get(i), node_name,
+                                              entries[i]["embedding"])
+                    NODE_ALIASES.record(alias_rows)
+                except Exception as e:
+                    logging.error(f"Error in smart_upsert_many: {str(e)}")
+                    raise RuntimeError(f"Failed to create nodes: {str(e)}")
+
+    if buffered:
+        for i, props in buffered.items():
+            ctx.write_buffer.add_node(entries[i]["node_type"], entries[i]["name"], props)
+            written[i] = entries[i]["name"]
+        logging.info(f"[CREATE_NODES] buffered {len(buffered)} merges")
+        await _schedule_flush(ctx)
+
+    for i, entry in enumerate(entries):
+        if i in folded_into:
+            mapping[entry["name"]] = written[root(i)]
+            # Store the mapping from original name to actual name
+            ctx.node_name_mapping[entry["name"]] = mapping[entry["name"]]
+    logging.info(f"[CREATE_NODES] {mapping}")
+    return mapping
+
+
+_SCHEMA_EDGE_RE = re.compile(r"\(:(\w+)\)-\[:(\w+)\]->\((?::(\w+))?\)")
+
+
+def parse_schema_edges(schema: str) -> Tuple[List[str], Dict[str, Tuple[List[str], List[str]]]]:
+    """
+    Reads the node labels and, per relationship type, the labels its source and target
+    nodes can have from schema.md. A target written as "()" (e.g. RELATES_TO) can be
+    any label.
+
+    Returns:
+        (node labels, {relationship type: (source labels, target labels)})
+    """
+    node_section = schema.split("## node types:", 1)[-1].split("\n## ", 1)[0]
+    labels = re.findall(r"^### (\w+)\s*$", node_section, re.MULTILINE)
+    edges: Dict[str, Tuple[List[str], List[str]]] = {}
+    for source, rel_type, target in _SCHEMA_EDGE_RE.findall(schema):
+        sources, targets = edges.setdefault(rel_type, ([], []))
+        if source not in sources:
+            sources.append(source)
+        for label in ([target] if target else labels):
+            if label not in targets:
+                targets.append(label)
+    return labels, edges
+
+
+with open("knowledge_graph/schema.md", "r") as f:
+    NODE_LABELS, EDGE_ENDPOINT_LABELS = parse_schema_edges(f.read())
+
+
+def _endpoint_lookup(var: str, name_expr: str, labels: Optional[List[str]]) -> str:
+    """
+    Cypher resolving a node by name (the value of name_expr) through the per-label name
+    index of each candidate label (a label-less MATCH on name scans every node) into `var`.
+    With labels None the node is looked up without a label, the fallback for nodes with
+    a label outside the schema.
+    """
+    if labels is None:
+        return f"OPTIONAL MATCH ({var}0 {{name: {name_expr}}})\nWITH *, {var}0 AS {var}"
+    lookups = "\n".join(f"OPTIONAL MATCH ({var}{i}:`{label}` {{name: {name_expr}}})"
+                        for i, label in enumerate(labels))
+    return f"{lookups}\nWITH *, coalesce({', '.join(f'{var}{i}' for i in range(len(labels)))}) AS {var}"
+
+
+class _MissingEndpoints(LookupError):
+    """An edge endpoint was not found; found holds (source found, target found)."""
+
+    def __init__(self, message: str, found: Tuple[bool, bool]):
+        super().__init__(message)
+        self.found = found
+
+
 async def core_create_edge(
     ctx: GraphOpsCtx,
     source_name: str,
@@ -462,11 +2645,23 @@ async def core_create_edge(
     Creates a directed edge (relationship) between two existing nodes in Neo4j.
     Takes source node name, target node name, relationship type, and optional properties.
     Returns the created relationship as a dict.
+
+    In batch mode (ctx.write_buffer set) the edge is only buffered, after checking
+    that both endpoints exist or are buffered themselves (see _buffer_edge).
+
+    Both endpoints are resolved and the edge merged in one query. An endpoint is looked
+    up through the name index of its label if NAME_LABEL_INDEX knows it, otherwise of
+    every label schema.md allows for the relationship type (all labels for a type not
+    in the schema). A missing endpoint is reported from the same query's result, and the
+    query is retried with a wider lookup for it: the schema labels after a stale
+    NAME_LABEL_INDEX hint, then no label at all, for nodes with an off-schema label.
+    Old names of renamed or merged nodes are resolved through NODE_ALIASES.
     """
 
-    # Check if we have mapped names for the source and target
-    actual_source_name = ctx.node_name_mapping.get(source_name, source_name)
-    actual_target_name = ctx.node_name_mapping.get(target_name, target_name)
+    schema_labels = EDGE_ENDPOINT_LABELS.get(relationship_type, (NODE_LABELS, NODE_LABELS))
+    # Check if we have mapped names (this session's or persisted aliases) for the source and target
+    actual_source_name = await resolve_node_name(ctx, source_name, schema_labels[0])
+    actual_target_name = await resolve_node_name(ctx, target_name, schema_labels[1])
 
     logging.info(
         f"[CREATE_EDGE]\nSOURCE: {source_name} -> {actual_source_name}\n->\nTARGET:{target_name} -> {actual_target_name}\nWITH TYPE:{relationship_type} AND PROPERTIES: {properties}"
@@ -478,104 +2673,520 @@ async def core_create_edge(
     prop_keys = ", ".join(f"{key}: ${key}" for key in props_dict)
     prop_str = f"{{{prop_keys}}}" if prop_keys else ""
 
-    # First, verify both nodes exist using the actual names
-    check_nodes_query = """
-    MATCH (source) WHERE source.name = $source_name 
-    MATCH (target) WHERE target.name = $target_name 
-    RETURN source.name as source_name, target.name as target_name
+    # A name known to NAME_LABEL_INDEX is resolved through its own label's index only
+    hinted_labels = (NAME_LABEL_INDEX.get(actual_source_name),
+                     NAME_LABEL_INDEX.get(actual_target_name))
+    params = {
+        "source_name": actual_source_name,
+        "target_name": actual_target_name,
+        **props_dict
+    }
+
+    def missing_endpoints(record: Dict[str, Any], source_labels: Optional[List[str]],
+                          target_labels: Optional[List[str]]) -> List[str]:
+        missing_nodes = []
+        if not record["source_found"]:
+            missing_nodes.append(
+                f"source node '{actual_source_name}' (original: '{source_name}', "
+                f"expected label: {' or '.join(source_labels or schema_labels[0])})"
+            )
+        if not record["target_found"]:
+            missing_nodes.append(
+                f"target node '{actual_target_name}' (original: '{target_name}', "
+                f"expected label: {' or '.join(target_labels or schema_labels[1])})"
+            )
+        return missing_nodes
+
+    if ctx.write_buffer is not None:
+        return await _buffer_edge(ctx, source_name, target_name, relationship_type,
+                                  props_dict, hinted_labels, schema_labels, params,
+                                  missing_endpoints)
+
+    def edge_query(source_labels: List[str], target_labels: List[str]) -> str:
+        # The aggregating subquery returns a row even when an endpoint is missing
+        return f"""
+    {_endpoint_lookup("source", "$source_name", source_labels)}
+    {_endpoint_lookup("target", "$target_name", target_labels)}
+    CALL {{
+        WITH source, target
+        WITH source, target WHERE source IS NOT NULL AND target IS NOT NULL
+        MERGE (source)-[r:{relationship_type} {prop_str}]->(target)
+        RETURN collect(r) AS edges
+    }}
+    RETURN source IS NOT NULL AS source_found, target IS NOT NULL AS target_found, edges[0] AS r
     """
 
-    async with ctx.neo4jdriver.session() as session:
+    async def write_work(tx: AsyncTransaction, query: str, source_labels: Optional[List[str]],
+                         target_labels: Optional[List[str]]):
+        result = await tx.run(query, params)
+        record_list = await result.data()
+        record = record_list[0] if record_list else None
+        if not record:
+            raise RuntimeError(
+                "Failed to create edge - no relationship returned from query"
+            )
+        missing_nodes = missing_endpoints(record, source_labels, target_labels)
+        if missing_nodes:
+            raise _MissingEndpoints(
+                f"Cannot create edge: {', '.join(missing_nodes)} not found in database",
+                (record["source_found"], record["target_found"]))
+        return {"r": record["r"]}
+
+    # lookups per endpoint, narrowest first: the NAME_LABEL_INDEX hint (stale if another
+    # process renamed or deleted the node), the schema labels, then no label
+    stages = [[labels for labels in (hinted, schema) if labels] + [None]
+              for hinted, schema in zip(hinted_labels, schema_labels)]
+    positions = [0, 0]
+    names = (actual_source_name, actual_target_name)
+
+    async with ctx.session() as session:
+        while True:
+            source_labels, target_labels = stages[0][positions[0]], stages[1][positions[1]]
+            query = edge_query(source_labels, target_labels)
+            logging.info(f"[CREATE_EDGE] Executing query: {query}")
+            logging.info(f"[CREATE_EDGE] With params: {params}")
+            try:
+                async with ctx.lock.write():
+                    edge = await execute_graph_tx(session, "write", write_work, query,
+                                                  source_labels, target_labels, write=True)
+                    bump_graph_generation()
+                    logging.info(
+                        f"Successfully created edge: {actual_source_name} -> {actual_target_name} with type: {relationship_type} and properties: {properties}"
+                    )
+                    return edge
+            except _MissingEndpoints as e:
+                widened = False
+                for i, found in enumerate(e.found):
+                    if found or positions[i] + 1 >= len(stages[i]):
+                        continue
+                    if positions[i] == 0 and hinted_labels[i]:
+                        NAME_LABEL_INDEX.discard(names[i])
+                    positions[i] += 1
+                    widened = True
+                if widened:
+                    logging.info(f"[CREATE_EDGE] {e}; retrying with a wider lookup")
+                    continue
+                raise RuntimeError(str(e))
+            except Exception as e:
+                logging.error(f"Error in create_edge: {str(e)}")
+                logging.error(f"Query was: {query}")
+                logging.error(f"Params were: {params}")
+                raise RuntimeError(f"Failed to create edge: {str(e)}")
 
-        async def check_nodes(tx: AsyncTransaction):
-            result = await tx.run(
-                check_nodes_query, {
-                    "source_name": actual_source_name,
-                    "target_name": actual_target_name
-                })
-            records = await result.data()
-            return records
 
-        try:
-            async with ctx.lock:
-                node_check = await session.execute_read(check_nodes)
-
-            if not node_check:
-                missing_nodes = []
-                # Check which specific nodes are missing
-                check_source_query = "MATCH (n) WHERE n.name = $source_name RETURN n.name as name"
-                check_target_query = "MATCH (n) WHERE n.name = $target_name RETURN n.name as name"
-
-                async def check_source(tx: AsyncTransaction):
-                    result = await tx.run(check_source_query,
-                                          {"source_name": actual_source_name})
-                    return await result.data()
+async def _buffer_edge(ctx: GraphOpsCtx, source_name: str, target_name: str,
+                       relationship_type: str, props_dict: Dict[str, Any],
+                       hinted_labels: Tuple[List[str], List[str]],
+                       schema_labels: Tuple[List[str], List[str]],
+                       params: Dict[str, Any], missing_endpoints) -> dict:
+    """
+    create_edge in batch mode: records the edge in ctx.write_buffer. An endpoint that is
+    buffered or known to NAME_LABEL_INDEX counts as existing; the others are checked with
+    a read (under the schema labels, then without a label) so that a missing endpoint is
+    still reported to the caller right away.
+    """
+    buffer = ctx.write_buffer
+    found = {
+        "source_found": bool(buffer.node_labels(params["source_name"]) or hinted_labels[0]),
+        "target_found": bool(buffer.node_labels(params["target_name"]) or hinted_labels[1]),
+    }
 
-                async def check_target(tx: AsyncTransaction):
-                    result = await tx.run(check_target_query,
-                                          {"target_name": actual_target_name})
-                    return await result.data()
+    async def check_nodes(tx: AsyncTransaction, labels: Tuple[Optional[List[str]], ...]):
+        result = await tx.run(f"""
+        {_endpoint_lookup("source", "$source_name", labels[0])}
+        {_endpoint_lookup("target", "$target_name", labels[1])}
+        RETURN source IS NOT NULL AS source_found, target IS NOT NULL AS target_found
+        LIMIT 1
+        """, params)
+        return await result.single()
+
+    for labels in (schema_labels, (None, None)):
+        if all(found.values()):
+            break
+        async with ctx.session() as session:
+            async with ctx.lock.read():
+                record = await execute_graph_tx(session, "cypher", check_nodes, labels)
+        found = {key: found[key] or record[key] for key in found}
+    missing_nodes = missing_endpoints(found, *schema_labels)
+    if missing_nodes:
+        raise RuntimeError(
+            f"Cannot create edge: {', '.join(missing_nodes)} not found in database"
+        )
 
-                async with ctx.lock:
-                    source_exists = await session.execute_read(check_source)
-                    target_exists = await session.execute_read(check_target)
+    # names go through node_name_mapping again at flush time
+    buffer.add_edge(source_name, target_name, relationship_type, props_dict)
+    await _schedule_flush(ctx)
+    return {
+        "buffered": True,
+        "source": params["source_name"],
+        "relationship": relationship_type,
+        "target": params["target_name"],
+    }
 
-                if not source_exists:
-                    missing_nodes.append(
-                        f"source node '{actual_source_name}' (original: '{source_name}')"
-                    )
-                if not target_exists:
-                    missing_nodes.append(
-                        f"target node '{actual_target_name}' (original: '{target_name}')"
-                    )
 
-                raise RuntimeError(
-                    f"Cannot create edge: {', '.join(missing_nodes)} not found in database"
-                )
+async def _schedule_flush(ctx: GraphOpsCtx) -> None:
+    """Flushes ctx.write_buffer if it is full, else makes sure a delayed flush is scheduled."""
+    buffer = ctx.write_buffer
+    if len(buffer) >= buffer.max_ops:
+        await core_flush_writes(ctx)
+    elif buffer._timer is None:
+        buffer._timer = asyncio.create_task(_flush_later(ctx))
 
-        except RuntimeError:
-            raise  # Re-raise our custom error
-        except Exception as e:
-            logging.error(f"Error checking nodes existence: {str(e)}")
-            raise RuntimeError(f"Failed to verify nodes exist: {str(e)}")
-
-        # Now create the edge using the actual names
-        query = (
-            "MATCH (source) WHERE source.name = $source_name "
-            "MATCH (target) WHERE target.name = $target_name "
-            f"MERGE (source)-[r:{relationship_type} {prop_str}]->(target) "
-            "RETURN r")
-        params = {
-            "source_name": actual_source_name,
-            "target_name": actual_target_name,
-            **props_dict
+
+async def _flush_later(ctx: GraphOpsCtx) -> None:
+    await asyncio.sleep(ctx.write_buffer.max_delay)
+    ctx.write_buffer._timer = None
+    try:
+        await core_flush_writes(ctx)
+    except Exception as e:
+        logging.error(f"[FLUSH_WRITES] Delayed flush failed: {str(e)}")
+
+
+async def core_flush_writes(ctx: GraphOpsCtx) -> Dict[str, Any]:
+    """
+    Writes the operations buffered in ctx.write_buffer in one transaction: a MERGE per
+    label for the nodes, then a MERGE per relationship type (and set of edge property
+    keys) for the edges. Edge endpoint names are resolved through ctx.node_name_mapping
+    now, so renames by smart upserts since the edge was buffered are picked up. An edge
+    whose endpoint no longer exists is skipped and reported, the rest is written.
+
+    Returns:
+        dict: Numbers of nodes and edges written, and the edges that could not be.
+
+    Raises:
+        RuntimeError: If the transaction fails; the operations stay buffered then.
+    """
+    buffer = ctx.write_buffer
+    if buffer is None:
+        return {"nodes": 0, "edges": 0, "failed_edges": []}
+
+    async with buffer._flush_lock:
+        if buffer._timer is not None and buffer._timer is not asyncio.current_task():
+            buffer._timer.cancel()
+        buffer._timer = None
+        nodes, edges = buffer.nodes, buffer.edges
+        if not nodes and not edges:
+            return {"nodes": 0, "edges": 0, "failed_edges": []}
+        buffer.nodes, buffer.edges = {}, []
+
+        node_rows: Dict[str, List[Dict[str, Any]]] = {}
+        for (label, name), props in nodes.items():
+            node_rows.setdefault(label, []).append({"name": name, "props": props})
+        node_labels: Dict[str, List[str]] = {}
+        for label, name in nodes:
+            node_labels.setdefault(name, []).append(label)
+
+        edge_rows: Dict[tuple, List[Dict[str, Any]]] = {}
+        for idx, edge in enumerate(edges):
+            source = ctx.node_name_mapping.get(edge["source_name"], edge["source_name"])
+            target = ctx.node_name_mapping.get(edge["target_name"], edge["target_name"])
+            schema_labels = EDGE_ENDPOINT_LABELS.get(edge["relationship_type"],
+                                                     (NODE_LABELS, NODE_LABELS))
+            source_labels = node_labels.get(source) or NAME_LABEL_INDEX.get(source) or schema_labels[0]
+            target_labels = node_labels.get(target) or NAME_LABEL_INDEX.get(target) or schema_labels[1]
+            key = (edge["relationship_type"], tuple(sorted(edge["props"])),
+                   tuple(source_labels), tuple(target_labels))
+            edge_rows.setdefault(key, []).append({
+                "idx": idx,
+                "source_name": source,
+                "target_name": target,
+                "props": edge["props"],
+            })
+
+        async def write_batch(tx: AsyncTransaction):
+            for label, rows in node_rows.items():
+                await tx.run(
+                    f"UNWIND $rows AS row MERGE (n:`{label}` {{name: row.name}}) SET n += row.props",
+                    {"rows": rows})
+            failed = []
+            for (relationship_type, prop_keys, source_labels, target_labels), rows in edge_rows.items():
+                prop_str = ", ".join(f"{key}: row.props.{key}" for key in prop_keys)
+
+                def edge_query(source_labels, target_labels) -> str:
+                    return f"""
+                UNWIND $rows AS row
+                {_endpoint_lookup("source", "row.source_name", source_labels)}
+                {_endpoint_lookup("target", "row.target_name", target_labels)}
+                CALL {{
+                    WITH source, target, row
+                    WITH source, target, row WHERE source IS NOT NULL AND target IS NOT NULL
+                    MERGE (source)-[r:{relationship_type} {{{prop_str}}}]->(target)
+                    RETURN count(r) AS merged
+                }}
+                RETURN row.idx AS idx, source IS NOT NULL AND target IS NOT NULL AS written
+                """
+
+                result = await tx.run(edge_query(list(source_labels), list(target_labels)),
+                                      {"rows": rows})
+                missed = {record["idx"] for record in await result.data() if not record["written"]}
+                if missed:
+                    # endpoints with an off-schema label are found without a label
+                    result = await tx.run(edge_query(None, None),
+                                          {"rows": [row for row in rows if row["idx"] in missed]})
+                    failed.extend({record["idx"] for record in await result.data()
+                                   if not record["written"]})
+            return failed
+
+        async with ctx.session() as session:
+            async with ctx.lock.write():
+                try:
+                    failed = await execute_graph_tx(session, "write", write_batch, write=True)
+                except Exception as e:
+                    # keep the operations for the next flush, before anything buffered since
+                    for key, props in nodes.items():
+                        buffer.nodes[key] = {**props, **buffer.nodes.get(key, {})}
+                    buffer.edges[:0] = edges
+                    logging.error(f"Error in flush_writes: {str(e)}")
+                    raise RuntimeError(f"Failed to flush buffered writes: {str(e)}")
+                bump_graph_generation()
+
+        for label, name in nodes:
+            NAME_LABEL_INDEX.put(name, label)
+        failed_edges = [
+            f"({edges[idx]['source_name']})-[:{edges[idx]['relationship_type']}]->({edges[idx]['target_name']})"
+            for idx in failed
+        ]
+        buffer.flushes += 1
+        buffer.flushed_nodes += len(nodes)
+        buffer.flushed_edges += len(edges) - len(failed)
+        buffer.failed_edges.extend(failed_edges)
+        if failed_edges:
+            logging.error(f"[FLUSH_WRITES] Endpoints not found for: {', '.join(failed_edges)}")
+        logging.info(f"[FLUSH_WRITES] {len(nodes)} nodes, {len(edges) - len(failed)} edges")
+        return {
+            "nodes": len(nodes),
+            "edges": len(edges) - len(failed),
+            "failed_edges": failed_edges,
         }
 
-        logging.info(f"[CREATE_EDGE] Executing query: {query}")
-        logging.info(f"[CREATE_EDGE] With params: {params}")
 
-        async def write_work(tx: AsyncTransaction):
-            result = await tx.run(query, params)
-            record_list = await result.data()
-            record = record_list[0] if record_list else None
-            if not record:
-                raise RuntimeError(
-                    "Failed to create edge - no relationship returned from query"
-                )
-            return record
+# Snapshot VECTOR_MIRROR is loaded from at startup and saved to after every sync
+VECTOR_MIRROR_SNAPSHOT_PATH = "vector_mirror.npz"
+# Searches on a mirror synced longer ago than this (seconds) start a background resync,
+# which picks up the nodes other processes wrote
+VECTOR_MIRROR_MAX_AGE = 300.0
+# Embeddings fetched per query while syncing
+VECTOR_MIRROR_FETCH_BATCH = 500
+
+# Optional in-process mirror of the eight *_description_embeddings indexes; find_node
+# and the scans search it when it is enabled (see warm_vector_mirror) and read only
+# the properties of the top-k nodes from Neo4j
+VECTOR_MIRROR = VectorMirror()
+_VECTOR_MIRROR_LABELS = {vector_index_name(label, dims): label
+                         for label in SMART_UPSERT_NODE_TYPES
+                         for dims in (FULL_EMBEDDING_DIMENSIONS,) + MATRYOSHKA_DIMENSIONS}
+_vector_mirror_sync: Optional[asyncio.Task] = None
+
+
+async def sync_vector_mirror(neo4jdriver: AsyncDriver,
+                             snapshot_path: Optional[str] = VECTOR_MIRROR_SNAPSHOT_PATH) -> None:
+    """
+    Brings VECTOR_MIRROR up to date with the graph. Per label only the names and a hash
+    of the descriptions are read; embeddings are fetched for new nodes and nodes whose
+    description changed, and nodes that are gone are dropped.
+    """
+    start = time.perf_counter()
+    fetched = 0
+    prop = embedding_property()
+    async with neo4jdriver.session() as session:
+        for label in SMART_UPSERT_NODE_TYPES:
+
+            async def read_hashes(tx: AsyncTransaction):
+                result = await tx.run(
+                    f"MATCH (n:`{label}`) WHERE n.{prop} IS NOT NULL "
+                    "RETURN n.name AS name, apoc.util.md5([n.description]) AS hash")
+                return await result.data()
+
+            current = {row["name"]: row["hash"]
+                       for row in await execute_graph_tx(session, "cypher", read_hashes)}
+            index = VECTOR_MIRROR.indexes.get(label)
+            if index is not None and index.dims != EMBEDDING_DIMENSIONS:
+                # a snapshot of another size, from before a change of EMBEDDING_DIMENSIONS
+                del VECTOR_MIRROR.indexes[label]
+                index = None
+            if index is not None:
+                for name in index.keys():
+                    if name not in current:
+                        index.remove(name)
+            stale = [name for name, content_hash in current.items()
+                     if index is None or index.content_hash(name) != content_hash]
+
+            for chunk in range(0, len(stale), VECTOR_MIRROR_FETCH_BATCH):
+
+                async def read_embeddings(tx: AsyncTransaction, names: List[str]):
+                    result = await tx.run(
+                        f"UNWIND $names AS name MATCH (n:`{label}` {{name: name}}) "
+                        f"RETURN n.name AS name, n.{prop} AS embedding, "
+                        "apoc.util.md5([n.description]) AS hash", {"names": names})
+                    return await result.data()
 
+                rows = await execute_graph_tx(session, "cypher", read_embeddings,
+                                              stale[chunk:chunk + VECTOR_MIRROR_FETCH_BATCH])
+                for row in rows:
+                    if row["embedding"] is None:
+                        continue  # removed since the hashes were read
+                    index = VECTOR_MIRROR.index_for(label, len(row["embedding"]))
+                    index.upsert(row["name"], row["embedding"], row["hash"])
+                    fetched += 1
+            if index is None:
+                VECTOR_MIRROR.index_for(label, EMBEDDING_DIMENSIONS)
+            elif len(index) > 2 * index.trained_size:
+                # k-means off the event loop; searches use the old cells meanwhile
+                index.apply_fit(await asyncio.to_thread(index.fit))
+
+    VECTOR_MIRROR.synced_at = time.time()
+    if snapshot_path:
+        await asyncio.to_thread(VECTOR_MIRROR.save, snapshot_path, VECTOR_MIRROR.snapshot())
+    logging.info(f"[VECTOR_MIRROR] synced, {fetched} embeddings fetched, "
+                 f"{VECTOR_MIRROR.stats()['nodes']} in {time.perf_counter() - start:.2f}s")
+
+
+async def warm_vector_mirror(neo4jdriver: AsyncDriver,
+                             snapshot_path: Optional[str] = VECTOR_MIRROR_SNAPSHOT_PATH,
+                             quantization: Optional[str] = None) -> None:
+    """
+    Loads VECTOR_MIRROR from its snapshot, syncs it with the graph and enables it; once
+    per process. quantization ("float32", "int8" or "binary", see MIRROR_INDEX_CLASSES)
+    selects how the mirror stores the embeddings; the quantized forms only shortlist
+    candidates, which are re-ranked by their full-precision embeddings in Neo4j.
+    Raises RuntimeError without numpy (the vector-mirror extra).
+    """
+    if VECTOR_MIRROR.enabled:
+        return
+    if not ANN_AVAILABLE:
+        raise RuntimeError("The vector mirror needs numpy, which is not installed: "
+                           "install the vector-mirror extra or unset VECTOR_MIRROR_ENABLED")
+    if quantization:
+        if quantization not in MIRROR_INDEX_CLASSES:
+            raise ValueError(f"Unknown vector mirror quantization: {quantization}")
+        VECTOR_MIRROR.quantization = quantization
+    if snapshot_path and os.path.exists(snapshot_path):
         try:
-            async with ctx.lock:
-                edge = await session.execute_write(write_work)
-                logging.info(
-                    f"Successfully created edge: {actual_source_name} -> {actual_target_name} with type: {relationship_type} and properties: {properties}"
-                )
-                return edge
+            await asyncio.to_thread(VECTOR_MIRROR.load, snapshot_path)
         except Exception as e:
-            logging.error(f"Error in create_edge: {str(e)}")
-            logging.error(f"Query was: {query}")
-            logging.error(f"Params were: {params}")
-            raise RuntimeError(f"Failed to create edge: {str(e)}")
+            logging.warning(f"[VECTOR_MIRROR] Could not load {snapshot_path}: {str(e)}")
+    await sync_vector_mirror(neo4jdriver, snapshot_path)
+    VECTOR_MIRROR.enabled = True
+
+
+def _schedule_vector_mirror_sync(neo4jdriver: AsyncDriver) -> None:
+    global _vector_mirror_sync
+    if (not VECTOR_MIRROR.enabled or time.time() - VECTOR_MIRROR.synced_at < VECTOR_MIRROR_MAX_AGE
+            or (_vector_mirror_sync is not None and not _vector_mirror_sync.done())):
+        return
+
+    async def resync():
+        try:
+            await sync_vector_mirror(neo4jdriver)
+        except Exception as e:
+            VECTOR_MIRROR.synced_at = time.time()  # retried after VECTOR_MIRROR_MAX_AGE
+            logging.error(f"[VECTOR_MIRROR] Resync failed: {str(e)}")
+
+    _vector_mirror_sync = asyncio.create_task(resync())
+
+
+def _mirror_embedding(label: str, old_name: Optional[str], name: str,
+                      embedding: Optional[List[float]]) -> None:
+    """Applies a node write to VECTOR_MIRROR (a rename from old_name, then the new embedding)."""
+    index = VECTOR_MIRROR.indexes.get(label)
+    if not VECTOR_MIRROR.enabled or index is None or embedding is None:
+        return
+    embedding = truncate_embedding(embedding, index.dims)
+    if len(embedding) != index.dims:
+        return
+    if old_name is not None:
+        index.rename(old_name, name)
+    index.upsert(name, embedding)
+
+
+def _mirror_score(label: str) -> str:
+    """
+    Cypher score of a node VECTOR_MIRROR found: its mirror score, or, when the label's
+    index is quantized, the best full-precision cosine of the node to $embeddings
+    (the re-ranking pass, on the scale of the vector indexes).
+    """
+    if not VECTOR_MIRROR.reranked(label):
+        return "row.score"
+    return ("reduce(best = 0.0, score IN [embedding IN $embeddings | "
+            f"vector.similarity.cosine(node.{embedding_property()}, embedding)] | "
+            "CASE WHEN score > best THEN score ELSE best END)")
+
+
+def _mirror_hydrate_params(label: str, rows: List[Dict[str, Any]],
+                           embeddings: List[List[float]]) -> Dict[str, Any]:
+    """Parameters of a query using _mirror_score; the embeddings are only sent when re-ranking."""
+    if not VECTOR_MIRROR.reranked(label):
+        return {"rows": rows}
+    return {"rows": rows, "embeddings": embeddings}
+
+
+def _mirror_hydrate_query(label: str, projection: str, where: str = "") -> str:
+    """Reads the nodes VECTOR_MIRROR found ($rows of name and score) with their scores."""
+    return f"""
+    UNWIND $rows AS row
+    MATCH (node:`{label}` {{name: row.name}})
+    WITH node, {_mirror_score(label)} AS score
+    {where}
+    WITH node, score
+    ORDER BY score DESC
+    LIMIT $max_results
+    RETURN
+        {projection} AS node,
+        score,
+        labels(node)[0] AS node_type
+    """
+
+
+# Longest query text of find_node that is looked up as an old node name
+FIND_NODE_ALIAS_MAX_LENGTH = 120
+# Rank offset of the reciprocal rank fusion of find_node's full-text and vector results
+FIND_NODE_RRF_K = 60
+# Boost of the query text as a phrase in the node name, against its single terms
+FIND_NODE_NAME_BOOST = 4
+# Terms of the query text find_node passes to the full-text index (Lucene limits clauses)
+FIND_NODE_LEXICAL_MAX_TERMS = 64
+
+# How find_node calls went: "calls", "exact" (the query text named a node, so the
+# vector search was skipped), "embedding_unused" (exact, but the embedding request had
+# already been sent), "lexical_only" (results only the full-text search found)
+FIND_NODE_METRICS: Counter = Counter()
+
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+_LUCENE_OPERATOR_RE = re.compile(r"\b(AND|OR|NOT|TO)\b")
+
+
+def fulltext_index_name(label: str) -> str:
+    """Full-text index over the name and description of a node label (fulltext_index.cypher)."""
+    return f"{label.lower()}_name_description"
+
+
+def fulltext_query(text: str) -> str:
+    """
+    Lucene query for find_node: the text as a phrase in the name, boosted, or any of
+    its terms in the name or description. Lucene syntax in the text is escaped.
+    """
+    words = " ".join(text.split()[:FIND_NODE_LEXICAL_MAX_TERMS])
+    phrase = words.replace("\\", "\\\\").replace('"', '\\"')
+    terms = _LUCENE_OPERATOR_RE.sub(lambda m: m.group(1).lower(), _LUCENE_SPECIAL_RE.sub(r"\\\1", words))
+    return f'name:"{phrase}"^{FIND_NODE_NAME_BOOST} OR {terms}'
+
+
+def _reciprocal_rank_fusion(rankings: List[List[dict]], top_k: int) -> List[dict]:
+    """
+    Merges ranked find_node records by node name: a node scores the sum of
+    1 / (FIND_NODE_RRF_K + rank) over the rankings it is in, scaled so that first
+    place in all of them scores 1.0.
+    """
+    fused: Dict[str, float] = {}
+    records: Dict[str, dict] = {}
+    for ranking in rankings:
+        for rank, record in enumerate(ranking, start=1):
+            name = record["node"]["name"]
+            fused[name] = fused.get(name, 0.0) + 1.0 / (FIND_NODE_RRF_K + rank)
+            records.setdefault(name, record)
+    best = len(rankings) / (FIND_NODE_RRF_K + 1)
+    order = sorted(fused, key=fused.get, reverse=True)[:top_k]
+    return [{**records[name], "score": fused[name] / best} for name in order]
 
 
 async def core_find_node(ctx: GraphOpsCtx,
@@ -587,9 +3198,19 @@ async def core_find_node(ctx: GraphOpsCtx,
                          openai_embedding_client=None) -> list:
     """
     Finds nodes in knowledge graph that are similar to a given query text.
-    Uses vector similarity search based on node descriptions.
-    Returns a list of nodes with their names, descriptions, and similarity scores.
+    Combines a full-text search on node names and descriptions with a vector
+    similarity search based on node descriptions, merged by reciprocal rank fusion
+    (see _reciprocal_rank_fusion); the full-text search runs while the query text is
+    embedded. Returns a list of nodes with their names, descriptions, and fused scores:
+    ranks mapped to (0, 1], not cosine similarities.
     Allowed node_type values: Convergence, Capability, Milestone, Trend, Idea, LTC, LAC
+    If the query text is the name of a node (up to normalize_node_name), or an old name
+    of a renamed or merged node (see NODE_ALIASES), that node comes first, with score
+    1.0. For an exact name the vector search is skipped. The embedding is only skipped
+    when NAME_LABEL_INDEX already knows the name; otherwise it has been requested before
+    the full-text search answers, and skipping it saves latency but not the request.
+    When VECTOR_MIRROR is enabled the vector search runs in process and only the found
+    nodes are read from Neo4j (and re-ranked there when the mirror is quantized).
     """
 
     logging.info(
@@ -597,16 +3218,15 @@ async def core_find_node(ctx: GraphOpsCtx,
 
     if openai_embedding_client is None:
         raise ValueError("openai_embedding_client is required for find_node")
+    FIND_NODE_METRICS["calls"] += 1
 
-    # calculate embedding for the query text
-    emb_response = await openai_embedding_client.embeddings.create(
-        model=EMBEDDING_MODEL, input=query_text)
-    query_embedding = emb_response.data[0].embedding
+    async def alias_target() -> Optional[str]:
+        if (len(query_text) > FIND_NODE_ALIAS_MAX_LENGTH or "\n" in query_text
+                or query_text in NAME_LABEL_INDEX):
+            return None
+        return await NODE_ALIASES.resolve(ctx, query_text, [node_type])
 
-    cypher_query = """
-    CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
-    YIELD node, score
-    RETURN
+    node_projection = """
         CASE
             WHEN node:Milestone THEN node { .name, .description, .milestone_reached_date }
             WHEN node:PTC       THEN node { .name, .description, .release_date }
@@ -614,19 +3234,47 @@ async def core_find_node(ctx: GraphOpsCtx,
             WHEN node:Trend     THEN node { .name, .description, .observed_date }
             WHEN node:Idea      THEN node { .name, .description, .date, .last_updated_date }
             ELSE node { .name, .description }
-        END AS node,
+        END AS node"""
+
+    cypher_query = f"""
+    CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
+    YIELD node, score
+    RETURN{node_projection},
         score
     ORDER BY score DESC
     """
 
+    mirror_query = f"""
+    UNWIND $rows AS row
+    MATCH (node:`{node_type}` {{name: row.name}})
+    WITH node, {_mirror_score(node_type)} AS score
+    ORDER BY score DESC
+    LIMIT $top_k
+    RETURN{node_projection},
+        score
+    """
+
+    alias_query = f"""
+    MATCH (node:`{node_type}` {{name: $name}})
+    RETURN{node_projection},
+        1.0 AS score
+    """
+
+    lexical_query = f"""
+    CALL db.index.fulltext.queryNodes($index_name, $query, {{limit: $top_k}})
+    YIELD node, score
+    RETURN{node_projection},
+        score
+    """
+
     def filter_embedding(obj):
         """
-        Recursively removes the 'embedding' key and converts Neo4j Date/DateTime to strings.
+        Recursively removes the embedding keys and converts Neo4j Date/DateTime to strings.
         """
         if isinstance(obj, dict):
             return {
                 k: filter_embedding(v)
-                for k, v in obj.items() if k != 'embedding'
+                for k, v in obj.items() if k not in EMBEDDING_PROPERTIES
             }
         elif isinstance(obj, list):
             return [filter_embedding(item) for item in obj]
@@ -638,31 +3286,201 @@ async def core_find_node(ctx: GraphOpsCtx,
             )  # Convert Neo4j DateTime to ISO 8601 string (e.g., "2025-07-28T10:55:00+00:00")
         return obj
 
-    async with ctx.neo4jdriver.session() as session:
+    async def lexical_search() -> List[dict]:
+        if not query_text.strip():
+            return []
 
         async def read_work(tx: AsyncTransaction):
-            result = await tx.run(
-                cypher_query, {
-                    "index_name":
-                    f"{node_type.lower()}_description_embeddings",
+            result = await tx.run(lexical_query, {
+                "index_name": fulltext_index_name(node_type),
+                "query": fulltext_query(query_text),
+                "top_k": top_k,
+            })
+            return await result.data()
+
+        try:
+            async with ctx.session() as session:
+                async with ctx.lock.read():
+                    return await execute_graph_tx(session, "cypher", read_work)
+        except Exception as e:
+            logging.warning(f"[FIND_NODE] Full-text search of {node_type} failed: {str(e)}")
+            return []
+
+    async def vector_search(query_embedding: List[float]) -> List[dict]:
+        _schedule_vector_mirror_sync(ctx.neo4jdriver)
+        mirrored = None
+        if VECTOR_MIRROR.ready(node_type):
+            best = VECTOR_MIRROR.search(node_type, [query_embedding], top_k)
+            mirrored = [{"name": name, "score": score} for name, score in best.items()]
+            VECTOR_MIRROR.hydrated += len(mirrored)
+
+        async def read_work(tx: AsyncTransaction):
+            if mirrored is not None:
+                result = await tx.run(mirror_query, {
                     "top_k": top_k,
-                    "embedding": query_embedding
+                    **_mirror_hydrate_params(node_type, mirrored, [query_embedding])
                 })
-            records = await result.data()
-            if not records:
-                return []
-            filtered_records = [filter_embedding(record) for record in records]
-            return filtered_records
+            else:
+                result = await tx.run(
+                    cypher_query, {
+                        "index_name": vector_index_name(node_type),
+                        "top_k": top_k,
+                        "embedding": query_embedding
+                    })
+            return await result.data()
 
-        async with ctx.lock:
-            try:
-                results = await session.execute_read(read_work)
-                logging.info(
-                    f"Found {len(results)} nodes similar to {query_text}")
-                return results
-            except Exception as e:
-                logging.error(f"Error in find_node: {str(e)}")
-                raise RuntimeError(f"Failed to find nodes: {str(e)}")
+        async with ctx.session() as session:
+            async with ctx.lock.read():
+                return await execute_graph_tx(
+                    session, "vector" if mirrored is None else "cypher", read_work)
+
+    async def read_alias(name: str) -> List[dict]:
+
+        async def read_work(tx: AsyncTransaction):
+            result = await tx.run(alias_query, {"name": name})
+            return await result.data()
+
+        async with ctx.session() as session:
+            async with ctx.lock.read():
+                return await execute_graph_tx(session, "cypher", read_work)
+
+    # embed the query text unless it is known to name a node of the type; the full-text
+    # search and the alias lookup run meanwhile
+    name_key = normalize_node_name(query_text)
+    embedding_task = None
+    if node_type not in NAME_LABEL_INDEX.get(query_text):
+        embedding_task = asyncio.create_task(
+            embed_search_texts(openai_embedding_client, [query_text]))
+    try:
+        lexical_records, alias_of = await asyncio.gather(lexical_search(), alias_target())
+        exact = [record for record in lexical_records
+                 if normalize_node_name(record["node"]["name"]) == name_key]
+        if exact:
+            FIND_NODE_METRICS["exact"] += 1
+            if embedding_task is not None:
+                FIND_NODE_METRICS["embedding_unused"] += 1
+            rankings = [lexical_records]
+            pinned = [{**record, "score": 1.0} for record in exact]
+        else:
+            if embedding_task is None:
+                embedding_task = asyncio.create_task(
+                    embed_search_texts(openai_embedding_client, [query_text]))
+            query_embedding = (await embedding_task)[0]
+            if alias_of is not None:
+                vector_records, pinned = await asyncio.gather(
+                    vector_search(query_embedding), read_alias(alias_of))
+            else:
+                vector_records, pinned = await vector_search(query_embedding), []
+            rankings = [records for records in (lexical_records, vector_records) if records]
+            vector_names = {record["node"]["name"] for record in vector_records}
+            FIND_NODE_METRICS["lexical_only"] += sum(
+                1 for record in lexical_records if record["node"]["name"] not in vector_names)
+
+        pinned_names = {record["node"]["name"] for record in pinned}
+        records = (pinned + [record for record in _reciprocal_rank_fusion(rankings, top_k)
+                             if record["node"]["name"] not in pinned_names])[:top_k]
+        results = [filter_embedding(record) for record in records]
+        logging.info(
+            f"Found {len(results)} nodes similar to {query_text}")
+        return results
+    except Exception as e:
+        logging.error(f"Error in find_node: {str(e)}")
+        raise RuntimeError(f"Failed to find nodes: {str(e)}")
+    finally:
+        if embedding_task is not None and not embedding_task.done():
+            embedding_task.cancel()
+
+
+def _filter_scan_values(obj):
+    """Remove None values and embedding keys, convert Neo4j dates."""
+    if isinstance(obj, dict):
+        return {
+            k: _filter_scan_values(v)
+            for k, v in obj.items()
+            if k not in EMBEDDING_PROPERTIES and v is not None
+        }
+    elif isinstance(obj, list):
+        return [_filter_scan_values(item) for item in obj]
+    elif isinstance(obj, Date):
+        return obj.iso_format()
+    elif isinstance(obj, DateTime):
+        return obj.iso_format()
+    return obj
+
+
+async def _scan_index(session: AsyncSession, tag: str, index_name: str, projection: str,
+                      embeddings: List[List[float]], top_k: int, max_results: int,
+                      where: str = "", params: Optional[Dict[str, Any]] = None) -> List[dict]:
+    """
+    Searches one vector index with all probe embeddings in a single query. Nodes found
+    by several probes are returned once, with their best score; where can filter the
+    nodes (as "node") before that. A failing index is logged and yields no results.
+    An index VECTOR_MIRROR has is searched in process, and only the found nodes read.
+    """
+    label = _VECTOR_MIRROR_LABELS.get(index_name)
+    if label is not None and VECTOR_MIRROR.ready(label):
+        best = VECTOR_MIRROR.search(label, embeddings, top_k)
+        rows = [{"name": name, "score": score} for name, score in best.items()]
+        VECTOR_MIRROR.hydrated += len(rows)
+
+        async def read_mirrored(tx: AsyncTransaction):
+            result = await tx.run(_mirror_hydrate_query(label, projection, where), {
+                "max_results": max_results,
+                **_mirror_hydrate_params(label, rows, embeddings),
+                **(params or {}),
+            })
+            return await result.data()
+
+        try:
+            records = await execute_graph_tx(session, "cypher", read_mirrored)
+        except Exception as e:
+            logging.warning(f"[{tag}] Error reading the {label} nodes found in the mirror: {str(e)}")
+            return []
+        return [_filter_scan_values(record) for record in records]
+
+    query = f"""
+    UNWIND $embeddings AS embedding
+    CALL db.index.vector.queryNodes($index_name, $top_k, embedding)
+    YIELD node, score
+    {where}
+    WITH node, max(score) AS score
+    ORDER BY score DESC
+    LIMIT $max_results
+    RETURN
+        {projection} AS node,
+        score,
+        labels(node)[0] AS node_type
+    """
+
+    async def read_work(tx: AsyncTransaction):
+        result = await tx.run(query, {
+            "index_name": index_name,
+            "embeddings": embeddings,
+            "top_k": top_k,
+            "max_results": max_results,
+            **(params or {}),
+        })
+        return await result.data()
+
+    try:
+        records = await execute_graph_tx(session, "vector", read_work)
+    except Exception as e:
+        logging.warning(f"[{tag}] Error querying {index_name} with {len(embeddings)} probes: {str(e)}")
+        return []
+    return [_filter_scan_values(record) for record in records]
+
+
+def _best_by_name(record_lists) -> Dict[str, dict]:
+    """One pass over scan results: node name -> the record with the best score."""
+    best_results: Dict[str, dict] = {}
+    for records in record_lists:
+        for record in records:
+            node_name = record.get("node", {}).get("name")
+            if node_name:
+                score = record.get("score", 0)
+                if node_name not in best_results or score > best_results[node_name].get("score", 0):
+                    best_results[node_name] = record
+    return best_results
 
 
 async def core_scan_ideas(ctx: GraphOpsCtx,
@@ -674,7 +3492,8 @@ async def core_scan_ideas(ctx: GraphOpsCtx,
     Scans the Idea (and Bet) pools using multiple diverse query probes.
     Each probe runs a vector similarity search; results are unioned,
     deduplicated by node name (keeping the best score), and returned
-    sorted by descending similarity score.
+    sorted by descending similarity score. All probes go to an index in
+    one query (see _scan_index).
 
     Args:
         ctx: GraphOpsCtx with Neo4j driver and lock.
@@ -697,81 +3516,27 @@ async def core_scan_ideas(ctx: GraphOpsCtx,
         logging.info(f"[SCAN_IDEAS] Probe {i+1}: {probe}")
 
     # Compute all embeddings in one batch call
-    emb_response = await openai_embedding_client.embeddings.create(
-        model=EMBEDDING_MODEL, input=query_probes)
-    probe_embeddings = [item.embedding for item in emb_response.data]
-
-    # Search both Idea and Bet indices
-    index_names = ["idea_description_embeddings", "bet_description_embeddings"]
-
-    queries = {
-        "idea_description_embeddings": """
-        CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
-        YIELD node, score
-        RETURN
-            node { .name, .description, .argument, .assumptions, .counterargument, .date, .last_updated_date } AS node,
-            score,
-            labels(node)[0] AS node_type
-        ORDER BY score DESC
-        """,
-        "bet_description_embeddings": """
-        CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
-        YIELD node, score
-        RETURN
-            node { .name, .description, .placed_date, .result } AS node,
-            score,
-            labels(node)[0] AS node_type
-        ORDER BY score DESC
-        """
+    probe_embeddings = await embed_search_texts(openai_embedding_client, query_probes)
+
+    _schedule_vector_mirror_sync(ctx.neo4jdriver)
+
+    # Search both Idea and Bet indices, all probes in one query per index
+    projections = {
+        vector_index_name("Idea"):
+            "node { .name, .description, .argument, .assumptions, .counterargument, .date, .last_updated_date }",
+        vector_index_name("Bet"):
+            "node { .name, .description, .placed_date, .result }",
     }
 
-    def filter_values(obj):
-        """Remove None values and embedding keys, convert Neo4j dates."""
-        if isinstance(obj, dict):
-            return {
-                k: filter_values(v)
-                for k, v in obj.items()
-                if k != 'embedding' and v is not None
+    async with ctx.session() as session:
+        async with ctx.lock.read():
+            records_by_index = {
+                index_name: await _scan_index(session, "SCAN_IDEAS", index_name, projection,
+                                              probe_embeddings, top_k_per_probe, max_results)
+                for index_name, projection in projections.items()
             }
-        elif isinstance(obj, list):
-            return [filter_values(item) for item in obj]
-        elif isinstance(obj, Date):
-            return obj.iso_format()
-        elif isinstance(obj, DateTime):
-            return obj.iso_format()
-        return obj
 
-    # Collect all results keyed by node name -> best record
-    best_results: Dict[str, dict] = {}
-
-    async with ctx.neo4jdriver.session() as session:
-        async with ctx.lock:
-            for idx, embedding in enumerate(probe_embeddings):
-                for index_name in index_names:
-                    try:
-                        async def read_work(tx: AsyncTransaction,
-                                            _index=index_name,
-                                            _emb=embedding):
-                            result = await tx.run(
-                                queries[_index], {
-                                    "index_name": _index,
-                                    "top_k": top_k_per_probe,
-                                    "embedding": _emb
-                                })
-                            return await result.data()
-
-                        records = await session.execute_read(read_work)
-                        for record in records:
-                            filtered = filter_values(record)
-                            node_name = filtered.get("node", {}).get("name")
-                            if node_name:
-                                score = filtered.get("score", 0)
-                                if node_name not in best_results or score > best_results[node_name].get("score", 0):
-                                    best_results[node_name] = filtered
-
-                    except Exception as e:
-                        logging.warning(f"[SCAN_IDEAS] Error querying {index_name} with probe {idx+1}: {str(e)}")
-                        continue
+    best_results = _best_by_name(records_by_index.values())
 
     # Sort by score descending and cap at max_results
     sorted_results = sorted(best_results.values(), key=lambda r: r.get("score", 0), reverse=True)
@@ -791,7 +3556,8 @@ async def core_scan_trends(ctx: GraphOpsCtx,
     Scans the Trend pool using multiple diverse query probes.
     Each probe runs a vector similarity search; results are unioned,
     deduplicated by node name (keeping the best score), and returned
-    sorted by descending similarity score.
+    sorted by descending similarity score. All probes go to the index in
+    one query (see _scan_index).
 
     Optionally filters to only Trends connected to a specific EmTech
     (via PREDICTS->Capability<-ENABLES-EmTech or
@@ -819,95 +3585,29 @@ async def core_scan_trends(ctx: GraphOpsCtx,
         logging.info(f"[SCAN_TRENDS] Probe {i+1}: {probe}")
 
     # Compute all embeddings in one batch call
-    emb_response = await openai_embedding_client.embeddings.create(
-        model=EMBEDDING_MODEL, input=query_probes)
-    probe_embeddings = [item.embedding for item in emb_response.data]
-
-    index_names = ["trend_description_embeddings"]
-
-    cypher_query = """
-    CALL db.index.vector.queryNodes($index_name, $top_k, $embedding)
-    YIELD node, score
-    RETURN
-        node { .name, .description } AS node,
-        score,
-        labels(node)[0] AS node_type
-    ORDER BY score DESC
-    """
+    probe_embeddings = await embed_search_texts(openai_embedding_client, query_probes)
 
-    def filter_values(obj):
-        """Remove None values and embedding keys, convert Neo4j dates."""
-        if isinstance(obj, dict):
-            return {
-                k: filter_values(v)
-                for k, v in obj.items()
-                if k != 'embedding' and v is not None
-            }
-        elif isinstance(obj, list):
-            return [filter_values(item) for item in obj]
-        elif isinstance(obj, Date):
-            return obj.iso_format()
-        elif isinstance(obj, DateTime):
-            return obj.iso_format()
-        return obj
+    _schedule_vector_mirror_sync(ctx.neo4jdriver)
 
-    # Collect all results keyed by node name -> best record
-    best_results: Dict[str, dict] = {}
+    # Optionally keep only Trends connected to the EmTech, in the same query
+    where = ""
+    params = {}
+    if emtech_filter:
+        where = """
+        WHERE EXISTS { (node)-[:PREDICTS]->(:Capability)<-[:ENABLES]-(:EmTech {name: $emtech}) }
+            OR EXISTS { (node)-[:LOOKS_AT]->(:Milestone)<-[:HAS_MILESTONE]-(:Capability)<-[:ENABLES]-(:EmTech {name: $emtech}) }
+        """
+        params["emtech"] = emtech_filter
 
-    async with ctx.neo4jdriver.session() as session:
-        async with ctx.lock:
-            for idx, embedding in enumerate(probe_embeddings):
-                for index_name in index_names:
-                    try:
-                        async def read_work(tx: AsyncTransaction,
-                                            _index=index_name,
-                                            _emb=embedding):
-                            result = await tx.run(
-                                cypher_query, {
-                                    "index_name": _index,
-                                    "top_k": top_k_per_probe,
-                                    "embedding": _emb
-                                })
-                            return await result.data()
-
-                        records = await session.execute_read(read_work)
-                        for record in records:
-                            filtered = filter_values(record)
-                            node_name = filtered.get("node", {}).get("name")
-                            if node_name:
-                                score = filtered.get("score", 0)
-                                if node_name not in best_results or score > best_results[node_name].get("score", 0):
-                                    best_results[node_name] = filtered
-
-                    except Exception as e:
-                        logging.warning(f"[SCAN_TRENDS] Error querying {index_name} with probe {idx+1}: {str(e)}")
-                        continue
+    async with ctx.session() as session:
+        async with ctx.lock.read():
+            records = await _scan_index(session, "SCAN_TRENDS", vector_index_name("Trend"),
+                                        "node { .name, .description }", probe_embeddings,
+                                        top_k_per_probe, max_results, where, params)
 
-            # If emtech_filter is set, filter to only Trends connected to that EmTech
-            if emtech_filter and best_results:
-                trend_names = list(best_results.keys())
-                filter_query = """
-                UNWIND $trend_names AS tname
-                MATCH (t:Trend {name: tname})
-                WHERE
-                    EXISTS { (t)-[:PREDICTS]->(:Capability)<-[:ENABLES]-(:EmTech {name: $emtech}) }
-                    OR EXISTS { (t)-[:LOOKS_AT]->(:Milestone)<-[:HAS_MILESTONE]-(:Capability)<-[:ENABLES]-(:EmTech {name: $emtech}) }
-                RETURN t.name AS name
-                """
-                try:
-                    async def read_filter(tx: AsyncTransaction):
-                        result = await tx.run(filter_query, {
-                            "trend_names": trend_names,
-                            "emtech": emtech_filter
-                        })
-                        return await result.data()
-
-                    filtered_records = await session.execute_read(read_filter)
-                    connected_names = {r["name"] for r in filtered_records}
-                    best_results = {k: v for k, v in best_results.items() if k in connected_names}
-                    logging.info(f"[SCAN_TRENDS] EmTech filter '{emtech_filter}' kept {len(connected_names)} of {len(trend_names)} trends")
-                except Exception as e:
-                    logging.warning(f"[SCAN_TRENDS] Error applying emtech filter: {str(e)}")
+    best_results = _best_by_name([records])
+    if emtech_filter:
+        logging.info(f"[SCAN_TRENDS] EmTech filter '{emtech_filter}' kept {len(best_results)} trends")
 
     # Sort by score descending and cap at max_results
     sorted_results = sorted(best_results.values(), key=lambda r: r.get("score", 0), reverse=True)
@@ -958,7 +3658,17 @@ async def core_dfs(ctx: GraphOpsCtx,
 
     logging.info(f"[DFS]:\nNODE_NAME: {node_name}\nDEPTH: {depth}\nMAX_NODES: {max_nodes}\nINCLUDE_DESCRIPTIONS: {include_descriptions}")
 
-    count_query = f"""
+    # read your own buffered writes
+    if ctx.write_buffer is not None:
+        await core_flush_writes(ctx)
+
+    # an old name of a renamed or merged node
+    node_name = await resolve_node_name(ctx, node_name)
+    # a hint for a wrong node_type, only used if no node of that type has the name
+    other_labels = [label for label in NAME_LABEL_INDEX.get(node_name) if label != node_type]
+    hinted_type = other_labels[0] if len(other_labels) == 1 else None
+
+    count_query = """
     MATCH (startNode:{node_type} {{name: $node_name}})
     WITH startNode
     CALL apoc.path.subgraphNodes(startNode, {{
@@ -969,9 +3679,9 @@ async def core_dfs(ctx: GraphOpsCtx,
     RETURN count(node) as node_count
     """
 
-    async with ctx.neo4jdriver.session() as session:
+    async with ctx.session() as session:
         async def count_nodes(tx: AsyncTransaction, d: int):
-            result = await tx.run(count_query, {
+            result = await tx.run(count_query.format(node_type=node_type), {
                 "node_name": node_name,
                 "depth": d
             })
@@ -980,12 +3690,17 @@ async def core_dfs(ctx: GraphOpsCtx,
 
         current_depth = depth
         
-        async with ctx.lock:
+        async with ctx.lock.read():
              # Loop to find the right depth
             while current_depth >= 1:
                 try: 
-                    count = await session.execute_read(count_nodes, current_depth)
+                    count = await execute_graph_tx(session, "dfs", count_nodes, current_depth)
                     logging.info(f"[DFS] Check Depth {current_depth}: found {count} nodes.")
+                    if count == 0 and hinted_type is not None:
+                        # the start node itself counts, so there is no such node
+                        logging.info(f"[DFS] No {node_type} named {node_name}, trying {hinted_type}")
+                        node_type, hinted_type = hinted_type, None
+                        continue
                     if count <= max_nodes:
                         break
                     
@@ -1059,10 +3774,10 @@ async def core_dfs(ctx: GraphOpsCtx,
             record = await result.single()
             return record["edges"] if record else []
 
-        async with ctx.lock:
+        async with ctx.lock.read():
             try:
-                nodes = await session.execute_read(read_nodes)
-                edges = await session.execute_read(read_edges)
+                nodes = await execute_graph_tx(session, "dfs", read_nodes)
+                edges = await execute_graph_tx(session, "dfs", read_edges)
                 return [{"nodes": nodes, "edges": edges, "metadata": {"depth": current_depth, "max_nodes": max_nodes}}]
             except Exception as e:
                 logging.error(f"Error in dfs: {str(e)}")
@@ -17,6 +17,8 @@ TOOLS_DEFINITIONS = {
         Include WHERE for filters, ORDER BY, SKIP, LIMIT for pagination.
         Returns query results as JSON-like structures (nodes, relationships, paths, values), e.g., [{"node": {"id": "123", "labels": ["EmTech"], "properties": {"name": "AI"}}}, ...].
         Generate queries that strictly match this subset to ensure execution; invalid queries will error.
+        Expensive queries are rejected before they run: cartesian products of disconnected patterns, variable-length patterns without an upper bound (use [*1..3], not [*]), and scans of all nodes without a label. Follow the error's hint to rewrite them.
+        Large results are capped: if the last row is {"truncated": true, ...} it reports returned_rows and total_rows; narrow the query or add LIMIT/aggregation to see more.
 
         IMPORTANT GUIDELINES:
         - Always bind variables (e.g., via MATCH or UNWIND) before referencing them in WHERE, RETURN, or functions.
@@ -95,6 +97,51 @@ TOOLS_DEFINITIONS = {
             "required": ["node_type", "name", "description"],
             "additionalProperties": False,
         }),
+    "create_nodes":
+    tool(
+        name="create_nodes",
+        description="""
+        Creates or updates several nodes in the Neo4j knowledge graph in one call, with the same duplicate checks as create_node.
+        Items of the batch are also checked against each other, so the same concept given twice ends up as one node.
+        Returns an object mapping the name of every item to the node's name (which may be different from the provided name).
+        Prefer this tool over repeated create_node calls when adding several nodes at once.
+        """,
+        parameters={
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "description": "The nodes to create or update.",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "node_type": {
+                                "type": "string",
+                                "description": "The type of node (e.g., 'Capability', 'Party').",
+                            },
+                            "name": {
+                                "type": "string",
+                                "description": "A short, unique name for the node.",
+                            },
+                            "description": {
+                                "type": "string",
+                                "description": "A detailed description of the node for similarity checks and updates.",
+                            },
+                            "properties": {
+                                "type": "object",
+                                "description":
+                                "Optional extra properties for the node, with the same date fields as create_node.",
+                                "additionalProperties": True,
+                            },
+                        },
+                        "required": ["node_type", "name", "description"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["items"],
+            "additionalProperties": False,
+        }),
     "create_edge":
     tool(
         name="create_edge",
@@ -139,8 +186,11 @@ TOOLS_DEFINITIONS = {
         name="find_node",
         description="""
         Finds nodes in knowledge graph that are similar to a given query text.
-        Uses vector similarity search based on node descriptions.
-        Returns a list of nodes with their names, descriptions, and similarity scores.
+        Combines full-text search on node names and descriptions with vector similarity
+        search based on node descriptions, so exact names (e.g. product names) are found too.
+        Returns a list of nodes with their names, descriptions, and scores (1.0 for an exact name).
+        Scores are rank-based, from 0 to 1, not similarities: use them to order results,
+        not to judge whether a node matches.
         """,
         parameters={
             "type": "object",
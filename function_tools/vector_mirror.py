@@ -0,0 +1,441 @@
+"""
+In-process approximate nearest neighbour search over node embeddings.
+
+VectorMirrorIndex holds the embeddings of one node label as a float32 matrix and
+answers top-k cosine queries, exactly below IVF_MIN_NODES vectors and through an
+IVF (inverted file over k-means cells) above that. Int8MirrorIndex and
+BinaryMirrorIndex keep quantized codes instead, 4x and 32x smaller, for a coarse
+first pass whose candidates the callers re-rank with the full-precision vectors
+in Neo4j. VectorMirror keeps one index per label and saves and loads them as a
+snapshot. Syncing with Neo4j lives in core_graph_ops (see VECTOR_MIRROR there).
+
+numpy is an optional dependency (the vector-mirror extra): without it ANN_AVAILABLE
+is False, every search goes to the Neo4j vector indexes, and enabling the mirror
+raises.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, the mirror is disabled without it
+    np = None
+
+ANN_AVAILABLE = np is not None
+
+# Below this many vectors a label is searched exactly
+IVF_MIN_NODES = 4096
+# Cells searched per query once the IVF is trained
+IVF_NPROBE = 16
+# Vectors the k-means of the IVF is trained on, per cell
+IVF_TRAIN_SAMPLES_PER_CELL = 32
+IVF_TRAIN_ITERATIONS = 10
+# Candidates a quantized index returns per result asked for, to be re-ranked
+QUANTIZED_RERANK_FACTOR = 4
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def similar_pairs(vectors: List[List[float]], threshold: float) -> List[Tuple[int, int]]:
+    """
+    Every pair (i, j) with i < j of the given vectors whose cosine similarity is at
+    least threshold, ordered by j, then by i. One matrix product instead of a Python
+    loop per pair.
+    """
+    matrix = _normalize(np.asarray(vectors, dtype=np.float32))
+    close = np.triu(matrix @ matrix.T >= threshold, k=1)
+    return [(int(i), int(j)) for j, i in np.argwhere(close.T)]
+
+
+# Set bits per byte value, for numpy versions without bitwise_count
+_POPCOUNT_TABLE = None if np is None else np.array([bin(i).count("1") for i in range(256)],
+                                                   dtype=np.uint8)
+
+
+def _popcount(codes):
+    if hasattr(np, "bitwise_count"):  # numpy >= 2.0
+        return np.bitwise_count(codes)
+    return _POPCOUNT_TABLE[codes]
+
+
+class VectorMirrorIndex:
+    """
+    Embeddings of the nodes of one label, by node name.
+
+    Rows of removed nodes are only marked dead and reused by later inserts. Scores
+    are on the scale of Neo4j's cosine vector indexes, (1 + cosine) / 2, so the
+    thresholds used with db.index.vector.queryNodes apply unchanged.
+
+    Subclasses store the vectors in another form by overriding _allocate, _encode,
+    _decode and _scores; quantization names the form in snapshots.
+    """
+
+    quantization = "float32"
+    # whether the scores are approximate and callers re-rank the results
+    reranked = False
+
+    def __init__(self, dims: int):
+        self.dims = dims
+        self.names: List[Optional[str]] = []
+        # content hash per row, from the graph; None for rows written by this process
+        self.hashes: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._vectors = self._allocate(0)
+        self._alive = np.zeros(0, dtype=bool)
+        self.centroids = None
+        self._cells = np.zeros(0, dtype=np.int32)
+        self.trained_size = 0
+        # rows upserted while a fit runs, reassigned to their cells by apply_fit
+        self._moved: Optional[set] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rows
+
+    def keys(self) -> List[str]:
+        return list(self._rows)
+
+    def content_hash(self, name: str) -> Optional[str]:
+        row = self._rows.get(name)
+        return None if row is None else self.hashes[row]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the stored vectors."""
+        return self._vectors.nbytes
+
+    def _allocate(self, capacity: int):
+        return np.zeros((capacity, self.dims), dtype=np.float32)
+
+    def _encode(self, row: int, vector) -> None:
+        self._vectors[row] = vector
+
+    def _decode(self, rows):
+        """The stored vectors of rows as normalized float32, for the IVF."""
+        return self._vectors[rows]
+
+    def _scores(self, rows, query):
+        """Cosine similarity (or its estimate) of the rows to a normalized query."""
+        return self._vectors[rows] @ query
+
+    def _grow(self, rows: int) -> None:
+        capacity = max(rows, 2 * len(self._alive), 64)
+        vectors = self._allocate(capacity)
+        vectors[:len(self._vectors)] = self._vectors
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self._alive)] = self._alive
+        cells = np.zeros(capacity, dtype=np.int32)
+        cells[:len(self._cells)] = self._cells
+        self._vectors, self._alive, self._cells = vectors, alive, cells
+
+    def upsert(self, name: str, vector: List[float], content_hash: Optional[str] = None) -> None:
+        vector = _normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        if vector.shape[0] != self.dims:
+            raise ValueError(f"Expected a {self.dims}-dimension embedding, got {vector.shape[0]}")
+        row = self._rows.get(name)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+                self.names[row], self.hashes[row] = name, content_hash
+            else:
+                row = len(self.names)
+                if row >= len(self._alive):
+                    self._grow(row + 1)
+                self.names.append(name)
+                self.hashes.append(content_hash)
+            self._rows[name] = row
+        else:
+            self.hashes[row] = content_hash
+        self._encode(row, vector)
+        self._alive[row] = True
+        if self.centroids is not None:
+            self._cells[row] = int(np.argmax(self.centroids @ vector))
+        if self._moved is not None:
+            self._moved.add(row)
+
+    def remove(self, name: str) -> None:
+        row = self._rows.pop(name, None)
+        if row is None:
+            return
+        self._alive[row] = False
+        self.names[row] = None
+        self.hashes[row] = None
+        self._free.append(row)
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        if old_name == new_name or old_name not in self._rows:
+            return
+        self.remove(new_name)
+        row = self._rows.pop(old_name)
+        self._rows[new_name] = row
+        self.names[row] = new_name
+
+    def train(self) -> None:
+        """(Re)builds the IVF cells with k-means; small indexes stay exact."""
+        self.apply_fit(self.fit())
+
+    def fit(self) -> tuple:
+        """
+        The k-means of train(), computed without changing the index, so that it can run
+        in a worker thread while the index is searched and updated on the event loop.
+        Returns what apply_fit installs.
+        """
+        self._moved = set()
+        size = len(self)
+        if size < IVF_MIN_NODES:
+            return None, None, size
+        start = time.perf_counter()
+        rows = np.flatnonzero(self._alive[:len(self.names)])
+        cells = int(np.sqrt(size))
+        rng = np.random.default_rng(0)
+        sample = self._decode(rng.choice(rows, min(size, cells * IVF_TRAIN_SAMPLES_PER_CELL),
+                                         replace=False))
+        centroids = sample[rng.choice(len(sample), cells, replace=False)]
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cell in range(cells):
+                members = sample[assignment == cell]
+                if len(members):
+                    centroids[cell] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+        centroids = centroids.astype(np.float32)
+        assignment = np.zeros(len(self._cells), dtype=np.int32)
+        for chunk in range(0, len(rows), 8192):
+            part = rows[chunk:chunk + 8192]
+            assignment[part] = np.argmax(self._decode(part) @ centroids.T, axis=1)
+        logging.info(f"[VECTOR_MIRROR] trained {cells} cells over {size} vectors "
+                     f"in {time.perf_counter() - start:.2f}s")
+        return centroids, assignment, size
+
+    def apply_fit(self, fitted: tuple) -> None:
+        """Installs the result of fit, assigning the rows upserted since it started."""
+        centroids, assignment, size = fitted
+        moved, self._moved = self._moved or set(), None
+        if centroids is not None:
+            if len(assignment) < len(self._cells):  # the index grew meanwhile
+                assignment = np.concatenate(
+                    [assignment, np.zeros(len(self._cells) - len(assignment), dtype=np.int32)])
+            rows = np.array(sorted(row for row in moved if self._alive[row]), dtype=np.int64)
+            if len(rows):
+                assignment[rows] = np.argmax(self._decode(rows) @ centroids.T, axis=1)
+            self._cells = assignment
+        self.centroids = centroids
+        self.trained_size = size
+
+    def candidates(self, query) -> "np.ndarray":
+        """Rows to score for a normalized query: all live rows, or those of the nearest cells."""
+        alive = self._alive[:len(self.names)]
+        if self.centroids is None:
+            return np.flatnonzero(alive)
+        nearest = np.argsort(self.centroids @ query)[-IVF_NPROBE:]
+        return np.flatnonzero(alive & np.isin(self._cells[:len(self.names)], nearest))
+
+    def search(self, vector: List[float], k: int) -> List[Tuple[str, float]]:
+        """The k nearest names with their Neo4j-scale cosine scores, best first."""
+        if not self._rows:
+            return []
+        query = _normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        rows = self.candidates(query)
+        scores = self._scores(rows, query)
+        if len(rows) > k:
+            top = np.argpartition(scores, -k)[-k:]
+            rows, scores = rows[top], scores[top]
+        order = np.argsort(scores)[::-1]
+        return [(self.names[rows[i]], float((1.0 + scores[i]) / 2.0)) for i in order]
+
+    def arrays(self) -> Dict[str, "np.ndarray"]:
+        rows = np.flatnonzero(self._alive[:len(self.names)])
+        return {
+            "names": np.array([self.names[row] for row in rows], dtype=str),
+            "hashes": np.array([self.hashes[row] or "" for row in rows], dtype=str),
+            "vectors": self._vectors[rows],
+            "dims": np.array(self.dims),
+            "quantization": np.array(self.quantization),
+        }
+
+    @classmethod
+    def from_arrays(cls, names, hashes, vectors, dims=None, **extra) -> "VectorMirrorIndex":
+        index = cls(int(dims) if dims is not None else vectors.shape[1])
+        index._grow(len(names))
+        index._vectors[:len(names)] = vectors
+        index._alive[:len(names)] = True
+        index.names = [str(name) for name in names]
+        index.hashes = [str(content_hash) or None for content_hash in hashes]
+        index._rows = {name: row for row, name in enumerate(index.names)}
+        return index
+
+
+class Int8MirrorIndex(VectorMirrorIndex):
+    """
+    int8 codes of the embeddings, each scaled to its largest component, plus that
+    scale: 4x smaller than float32, with dot products close enough to rank candidates.
+    """
+
+    quantization = "int8"
+    reranked = True
+
+    def __init__(self, dims: int):
+        self._scales = np.zeros(0, dtype=np.float32)
+        super().__init__(dims)
+
+    @property
+    def nbytes(self) -> int:
+        return self._vectors.nbytes + self._scales.nbytes
+
+    def _allocate(self, capacity: int):
+        return np.zeros((capacity, self.dims), dtype=np.int8)
+
+    def _grow(self, rows: int) -> None:
+        super()._grow(rows)
+        scales = np.zeros(len(self._vectors), dtype=np.float32)
+        scales[:len(self._scales)] = self._scales
+        self._scales = scales
+
+    def _encode(self, row: int, vector) -> None:
+        peak = float(np.abs(vector).max()) or 1.0
+        self._vectors[row] = np.round(vector * (127.0 / peak)).astype(np.int8)
+        self._scales[row] = peak / 127.0
+
+    def _decode(self, rows):
+        return _normalize(self._vectors[rows].astype(np.float32))
+
+    def _scores(self, rows, query):
+        scores = np.empty(len(rows), dtype=np.float32)
+        for chunk in range(0, len(rows), 8192):
+            part = rows[chunk:chunk + 8192]
+            scores[chunk:chunk + 8192] = (self._vectors[part].astype(np.float32) @ query) * self._scales[part]
+        return scores
+
+    def arrays(self) -> Dict[str, "np.ndarray"]:
+        arrays = super().arrays()
+        arrays["scales"] = self._scales[np.flatnonzero(self._alive[:len(self.names)])]
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, names, hashes, vectors, dims=None, scales=None, **extra) -> "Int8MirrorIndex":
+        index = super().from_arrays(names, hashes, vectors, dims)
+        index._scales[:len(names)] = scales
+        return index
+
+
+class BinaryMirrorIndex(VectorMirrorIndex):
+    """
+    Sign bits of the embeddings, packed 8 per byte: 32x smaller than float32. The
+    cosine is estimated from the Hamming distance h of the codes as cos(pi * h / dims).
+    """
+
+    quantization = "binary"
+    reranked = True
+
+    def _allocate(self, capacity: int):
+        return np.zeros((capacity, (self.dims + 7) // 8), dtype=np.uint8)
+
+    def _encode(self, row: int, vector) -> None:
+        self._vectors[row] = np.packbits(vector > 0)
+
+    def _decode(self, rows):
+        bits = np.unpackbits(self._vectors[rows], axis=1, count=self.dims)
+        return _normalize(bits.astype(np.float32) * 2.0 - 1.0)
+
+    def _scores(self, rows, query):
+        code = np.packbits(query > 0)
+        distances = _popcount(self._vectors[rows] ^ code).sum(axis=1, dtype=np.int32)
+        return np.cos(np.pi * distances / self.dims).astype(np.float32)
+
+
+# Index class per VectorMirror.quantization
+MIRROR_INDEX_CLASSES = {
+    cls.quantization: cls for cls in (VectorMirrorIndex, Int8MirrorIndex, BinaryMirrorIndex)
+}
+
+
+class VectorMirror:
+    """
+    One VectorMirrorIndex per node label, plus hit counters. A label without an index
+    (not loaded, or disabled) is searched in Neo4j by the callers. quantization picks
+    the index class (see MIRROR_INDEX_CLASSES); quantized indexes return
+    QUANTIZED_RERANK_FACTOR times the candidates asked for, which the callers re-rank.
+    """
+
+    def __init__(self, quantization: str = "float32"):
+        self.quantization = quantization
+        self.enabled = False
+        self.indexes: Dict[str, VectorMirrorIndex] = {}
+        self.synced_at = 0.0
+        self.local_searches = 0
+        self.hydrated = 0
+
+    def ready(self, label: str) -> bool:
+        return self.enabled and label in self.indexes
+
+    def reranked(self, label: str) -> bool:
+        """Whether the results of the label's index are candidates to re-rank."""
+        index = self.indexes.get(label)
+        return index is not None and index.reranked
+
+    def index_for(self, label: str, dims: int) -> VectorMirrorIndex:
+        index = self.indexes.get(label)
+        cls = MIRROR_INDEX_CLASSES[self.quantization]
+        if index is None or index.dims != dims or type(index) is not cls:
+            index = self.indexes[label] = cls(dims)
+        return index
+
+    def search(self, label: str, vectors: List[List[float]], k: int) -> Dict[str, float]:
+        """Best score per name over all query vectors (the probes of a scan)."""
+        self.local_searches += 1
+        index = self.indexes[label]
+        if index.reranked:
+            k *= QUANTIZED_RERANK_FACTOR
+        best: Dict[str, float] = {}
+        for vector in vectors:
+            for name, score in index.search(vector, k):
+                if score > best.get(name, 0.0):
+                    best[name] = score
+        return best
+
+    def snapshot(self) -> Dict[str, "np.ndarray"]:
+        """Copies of the indexes' arrays, for save; the writing can then run in a thread."""
+        arrays = {"synced_at": np.array(self.synced_at)}
+        for label, index in self.indexes.items():
+            for key, value in index.arrays().items():
+                arrays[f"{label}.{key}"] = value
+        return arrays
+
+    def save(self, path: str, arrays: Optional[Dict[str, "np.ndarray"]] = None) -> None:
+        np.savez(path, **(arrays if arrays is not None else self.snapshot()))
+
+    def load(self, path: str) -> None:
+        with np.load(path) as snapshot:
+            arrays: Dict[str, Dict[str, "np.ndarray"]] = {}
+            for key in snapshot.files:
+                if "." in key:
+                    label, name = key.split(".", 1)
+                    arrays.setdefault(label, {})[name] = snapshot[key]
+            self.indexes = {}
+            for label, kwargs in arrays.items():
+                # indexes saved with another quantization are fetched again by the next sync
+                if str(kwargs.pop("quantization", "float32")) == self.quantization:
+                    cls = MIRROR_INDEX_CLASSES[self.quantization]
+                    self.indexes[label] = cls.from_arrays(**kwargs)
+            self.synced_at = float(snapshot["synced_at"])
+        for index in self.indexes.values():
+            index.train()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "enabled": self.enabled,
+            "quantization": self.quantization,
+            "nodes": {label: len(index) for label, index in self.indexes.items()},
+            "bytes": sum(index.nbytes for index in self.indexes.values()),
+            "local_searches": self.local_searches,
+            "hydrated": self.hydrated,
+        }
@@ -0,0 +1,8 @@
+CREATE FULLTEXT INDEX convergence_name_description IF NOT EXISTS FOR (n:Convergence) ON EACH [n.name, n.description];
+CREATE FULLTEXT INDEX capability_name_description IF NOT EXISTS FOR (n:Capability) ON EACH [n.name, n.description];
+CREATE FULLTEXT INDEX milestone_name_description IF NOT EXISTS FOR (n:Milestone) ON EACH [n.name, n.description];
+CREATE FULLTEXT INDEX trend_name_description IF NOT EXISTS FOR (n:Trend) ON EACH [n.name, n.description];
+CREATE FULLTEXT INDEX idea_name_description IF NOT EXISTS FOR (n:Idea) ON EACH [n.name, n.description];
+CREATE FULLTEXT INDEX bet_name_description IF NOT EXISTS FOR (n:Bet) ON EACH [n.name, n.description];
+CREATE FULLTEXT INDEX ltc_name_description IF NOT EXISTS FOR (n:LTC) ON EACH [n.name, n.description];
+CREATE FULLTEXT INDEX lac_name_description IF NOT EXISTS FOR (n:LAC) ON EACH [n.name, n.description];
@@ -0,0 +1,8 @@
+CREATE INDEX convergence_name_key IF NOT EXISTS FOR (n:Convergence) ON (n.name_key);
+CREATE INDEX capability_name_key IF NOT EXISTS FOR (n:Capability) ON (n.name_key);
+CREATE INDEX milestone_name_key IF NOT EXISTS FOR (n:Milestone) ON (n.name_key);
+CREATE INDEX trend_name_key IF NOT EXISTS FOR (n:Trend) ON (n.name_key);
+CREATE INDEX idea_name_key IF NOT EXISTS FOR (n:Idea) ON (n.name_key);
+CREATE INDEX bet_name_key IF NOT EXISTS FOR (n:Bet) ON (n.name_key);
+CREATE INDEX ltc_name_key IF NOT EXISTS FOR (n:LTC) ON (n.name_key);
+CREATE INDEX lac_name_key IF NOT EXISTS FOR (n:LAC) ON (n.name_key);
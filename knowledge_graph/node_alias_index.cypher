@@ -0,0 +1,3 @@
+CREATE CONSTRAINT unique_node_alias IF NOT EXISTS FOR (a:NodeAlias) REQUIRE (a.alias, a.label) IS UNIQUE;
+CREATE INDEX node_alias_alias IF NOT EXISTS FOR (a:NodeAlias) ON (a.alias);
+CREATE INDEX node_alias_target IF NOT EXISTS FOR (a:NodeAlias) ON (a.target);
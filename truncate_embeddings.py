@@ -0,0 +1,131 @@
+"""
+Offline migration of the stored node embeddings to a Matryoshka size.
+
+text-embedding-3-large embeddings keep most of their quality when cut to their
+first dimensions and renormalized. For every node of the embedded labels this
+writes the first --dims values of n.embedding, renormalized, to n.embedding_<dims>
+and creates the parallel vector indexes <label>_description_embeddings_<dims> on
+them. n.embedding and the full-size indexes are left as they are, so going back is
+a matter of EMBEDDING_DIMENSIONS.
+
+The vectors are truncated server side, in batches of --batch nodes, and only nodes
+without the property are touched: the script can be interrupted and run again, and
+a second run picks up the nodes written since (node writes reset the truncations
+they do not compute, see embedding_props).
+
+Afterwards set EMBEDDING_DIMENSIONS in function_tools/core_graph_ops.py to --dims;
+find_node, the scans and the dedup probes then search the new indexes, and node
+writes fill both properties. benchmarks/matryoshka_recall.py helps choose the size.
+
+Run from the project root:
+    python truncate_embeddings.py --dims 1024 [--batch 500] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from neo4j import AsyncGraphDatabase
+
+from config import NEO4J_URI, NEO4J_USERNAME, NEO4J_PASSWORD
+from function_tools.core_graph_ops import (
+    MATRYOSHKA_DIMENSIONS,
+    SMART_UPSERT_NODE_TYPES,
+    embedding_property,
+    vector_index_name,
+)
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+# Truncates one batch of the label's embeddings; a zero vector is copied as it is
+TRUNCATE_QUERY = """
+MATCH (n:`{label}`)
+WHERE n.embedding IS NOT NULL AND n.`{prop}` IS NULL
+WITH n LIMIT $batch
+WITH n, n.embedding[0..$dims] AS head
+WITH n, head, sqrt(reduce(total = 0.0, x IN head | total + x * x)) AS norm
+SET n.`{prop}` = CASE WHEN norm > 0 THEN [x IN head | x / norm] ELSE head END
+RETURN count(n) AS updated
+"""
+
+PENDING_QUERY = """
+MATCH (n:`{label}`)
+WHERE n.embedding IS NOT NULL AND n.`{prop}` IS NULL
+RETURN count(n) AS pending
+"""
+
+CREATE_INDEX_QUERY = """
+CREATE VECTOR INDEX {index_name} IF NOT EXISTS
+FOR (n:`{label}`)
+ON n.`{prop}`
+OPTIONS {{
+  indexConfig: {{
+    `vector.dimensions`: {dims},
+    `vector.similarity_function`: 'cosine'
+  }}
+}}
+"""
+
+
+async def migrate_label(driver, label: str, dims: int, batch: int, dry_run: bool) -> int:
+    prop = embedding_property(dims)
+    async with driver.session() as session:
+        result = await session.run(PENDING_QUERY.format(label=label, prop=prop))
+        pending = (await result.single())["pending"]
+        if dry_run:
+            logging.info(f"[TRUNCATE] {label}: {pending} embeddings to truncate to {dims}")
+            return pending
+
+        updated = 0
+        while True:
+
+            async def write_batch(tx):
+                result = await tx.run(TRUNCATE_QUERY.format(label=label, prop=prop),
+                                      {"batch": batch, "dims": dims})
+                return (await result.single())["updated"]
+
+            count = await session.execute_write(write_batch)
+            if not count:
+                break
+            updated += count
+            logging.info(f"[TRUNCATE] {label}: {updated}/{pending}")
+
+        result = await session.run(CREATE_INDEX_QUERY.format(
+            index_name=vector_index_name(label, dims), label=label, prop=prop, dims=dims))
+        await result.consume()
+    logging.info(f"[TRUNCATE] {label}: {updated} embeddings truncated, "
+                 f"index {vector_index_name(label, dims)} created")
+    return updated
+
+
+async def main_async(args) -> None:
+    driver = AsyncGraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+    await driver.verify_connectivity()
+    start = time.perf_counter()
+    total = 0
+    try:
+        for label in SMART_UPSERT_NODE_TYPES:
+            total += await migrate_label(driver, label, args.dims, args.batch, args.dry_run)
+    finally:
+        await driver.close()
+    if args.dry_run:
+        logging.info(f"[TRUNCATE] dry run: {total} embeddings to truncate to {args.dims}")
+        return
+    logging.info(f"[TRUNCATE] {total} embeddings truncated to {args.dims} in "
+                 f"{time.perf_counter() - start:.1f}s; set EMBEDDING_DIMENSIONS = {args.dims} "
+                 "once the indexes are ONLINE (SHOW VECTOR INDEXES)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dims", type=int, required=True, choices=MATRYOSHKA_DIMENSIONS,
+                        help="size to truncate the embeddings to")
+    parser.add_argument("--batch", type=int, default=500, help="nodes per write transaction (default: 500)")
+    parser.add_argument("--dry-run", action="store_true", help="only count the embeddings to truncate")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()